@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 from decouple import config
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -45,11 +46,15 @@ INSTALLED_APPS = [
 ] + PROJECT_APPS
 
 MIDDLEWARE = [
+    # First, so its total covers the whole request; inactive unless QUERY_INSTRUMENTATION=True
+    'tracker.middleware.QueryInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # After authentication, since only staff can ask for a profile; inactive unless PROFILING_ENABLED=True
+    'tracker.middleware.RequestProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -87,17 +92,81 @@ WSGI_APPLICATION = 'SkillHub.wsgi.application'
 #     }
 # }
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.postgresql",
-        "NAME": config('DB_NAME'),
-        "USER": config('DB_USER'),
-        "PASSWORD": config('DB_PASSWORD'),
-        "HOST": config('DB_HOST', default='localhost'),
-        "PORT": config('DB_PORT', default='5432'),
+# DB_ENGINE=sqlite runs against a local SQLite file for development; search then uses FTS5 instead of tsvector
+DB_ENGINE = config('DB_ENGINE', default='postgresql')
+
+if DB_ENGINE == 'sqlite':
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": config('DB_NAME', default=str(BASE_DIR / 'db.sqlite3')),
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": config('DB_NAME'),
+            "USER": config('DB_USER'),
+            "PASSWORD": config('DB_PASSWORD'),
+            "HOST": config('DB_HOST', default='localhost'),
+            "PORT": config('DB_PORT', default='5432'),
+            # Connections are reused for DB_CONN_MAX_AGE seconds (0 closes them after every request,
+            # None keeps them forever) and checked before reuse, so a dropped connection is replaced
+            "CONN_MAX_AGE": config('DB_CONN_MAX_AGE', default=60, cast=lambda value: None if value == 'None' else int(value)),
+            "CONN_HEALTH_CHECKS": config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
+            "OPTIONS": {},
+        }
+    }
+
+    # DB_POOL=True uses psycopg's connection pool instead (needs `pip install "psycopg[pool]"`).
+    # Each process holds between DB_POOL_MIN_SIZE and DB_POOL_MAX_SIZE connections, and a request
+    # waits at most DB_POOL_TIMEOUT seconds for one; size it so that processes x max size stays
+    # below the server's max_connections. The pool replaces persistent connections.
+    if config('DB_POOL', default=False, cast=bool):
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+            'timeout': config('DB_POOL_TIMEOUT', default=30, cast=float),
+        }
+
+
+# Cache tier: CACHE_BACKEND=locmem (per process), file (shared by the processes of one host)
+# or redis (shared by all hosts, needs `pip install redis`). Keys are namespaced by
+# CACHE_KEY_PREFIX, and bumping CACHE_VERSION invalidates every entry at once.
+CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'skillhub'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', str(BASE_DIR / '.cache')),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379/1'),
+    'dummy': ('django.core.cache.backends.dummy.DummyCache', ''),
+}
+CACHE_BACKEND = config('CACHE_BACKEND', default='locmem')
+if CACHE_BACKEND not in CACHE_BACKENDS:
+    raise ImproperlyConfigured(f"CACHE_BACKEND must be one of {', '.join(CACHE_BACKENDS)}, not {CACHE_BACKEND!r}.")
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND][0],
+        'LOCATION': config('CACHE_LOCATION', default=CACHE_BACKENDS[CACHE_BACKEND][1]),
+        'KEY_PREFIX': config('CACHE_KEY_PREFIX', default='skillhub'),
+        'VERSION': config('CACHE_VERSION', default=1, cast=int),
+        'TIMEOUT': config('CACHE_TIMEOUT', default=300, cast=int),
     }
 }
 
+# Sessions are read from the cache and written through to the database, so they survive a cache flush
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# The logged-in user row is cached as well; saving or deleting the user evicts it
+AUTHENTICATION_BACKENDS = [
+    'tracker.auth_backends.CachedModelBackend',
+    # Sessions created before the cached backend store ModelBackend as their backend; it stays listed
+    # so they remain logged in (uncached) until they sign in again. Remove it once those sessions expire.
+    'django.contrib.auth.backends.ModelBackend',
+]
+AUTH_USER_CACHE_TIMEOUT = config('AUTH_USER_CACHE_TIMEOUT', default=300, cast=int)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -137,10 +206,98 @@ STATIC_URL = 'static/'
 STATICFILES_DIRS = (
     BASE_DIR / 'tracker/static',
 )
+STATIC_ROOT = config('STATIC_ROOT', default=str(BASE_DIR / 'staticfiles'))
+
+# collectstatic writes content-hashed names plus .gz/.br variants (brotli when `pip install brotli`)
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'tracker.storage.PrecompressedManifestStaticFilesStorage',
+    },
+}
+
+# Static files are served from STATIC_ROOT by tracker.views.file_views unless SERVE_STATIC=False
+# (the front proxy serves them). Hashed names are cached for a year, anything else STATIC_MAX_AGE.
+SERVE_STATIC = config('SERVE_STATIC', default=True, cast=bool)
+STATIC_MAX_AGE = config('STATIC_MAX_AGE', default=60 * 60, cast=int)
 
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+MEDIA_MAX_AGE = config('MEDIA_MAX_AGE', default=24 * 60 * 60, cast=int)
+
+# MEDIA_ACCEL=x-accel-redirect (nginx) or x-sendfile (Apache, lighttpd) lets the front proxy send
+# media files: Django only answers with a header pointing at MEDIA_ACCEL_PREFIX + path, which
+# the proxy maps to MEDIA_ROOT in an internal location.
+MEDIA_ACCEL = config('MEDIA_ACCEL', default='')
+if MEDIA_ACCEL not in ('', 'x-accel-redirect', 'x-sendfile'):
+    raise ImproperlyConfigured(f"MEDIA_ACCEL must be x-accel-redirect, x-sendfile or empty, not {MEDIA_ACCEL!r}.")
+MEDIA_ACCEL_PREFIX = config('MEDIA_ACCEL_PREFIX', default='/protected-media/')
+
+# Uploads are streamed to temporary files in chunks instead of being held in memory
+FILE_UPLOAD_HANDLERS = [
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+
+AVATAR_MAX_UPLOAD_SIZE = config('AVATAR_MAX_UPLOAD_SIZE', default=5 * 1024 * 1024, cast=int)
+AVATAR_MAX_DIMENSION = config('AVATAR_MAX_DIMENSION', default=4096, cast=int)
+AVATAR_PROCESSING_ASYNC = config('AVATAR_PROCESSING_ASYNC', default=True, cast=bool)
+AVATAR_WORKERS = config('AVATAR_WORKERS', default=2, cast=int)
+
+# Resource link checker (python manage.py check_resource_links)
+LINK_CHECK_CONCURRENCY = config('LINK_CHECK_CONCURRENCY', default=20, cast=int)
+LINK_CHECK_PER_HOST = config('LINK_CHECK_PER_HOST', default=2, cast=int)
+LINK_CHECK_TIMEOUT = config('LINK_CHECK_TIMEOUT', default=10, cast=float)
+LINK_CHECK_RETRIES = config('LINK_CHECK_RETRIES', default=2, cast=int)
+LINK_CHECK_BACKOFF = config('LINK_CHECK_BACKOFF', default=1.0, cast=float)
+LINK_CHECK_MAX_AGE = config('LINK_CHECK_MAX_AGE', default=24 * 60 * 60, cast=int)
+
+# Stats snapshots (python manage.py refresh_stats); the stats page flags data older than this
+STATS_MAX_AGE = config('STATS_MAX_AGE', default=60 * 60, cast=int)
+
+# Per-request SQL instrumentation (tracker.middleware.QueryInstrumentationMiddleware): adds a
+# Server-Timing header, warns when one query shape runs QUERY_DUPLICATE_THRESHOLD times or more
+# in a request and writes queries slower than QUERY_SLOW_MS to the tracker.queries.slow log
+QUERY_INSTRUMENTATION = config('QUERY_INSTRUMENTATION', default=False, cast=bool)
+QUERY_SLOW_MS = config('QUERY_SLOW_MS', default=100, cast=float)
+QUERY_DUPLICATE_THRESHOLD = config('QUERY_DUPLICATE_THRESHOLD', default=10, cast=int)
+QUERY_SLOW_LOG_FILE = config('QUERY_SLOW_LOG_FILE', default='')
+
+# On-demand request profiling (tracker.middleware.RequestProfilingMiddleware): staff add ?__profile=1
+# (or the X-Profile: 1 header) to a request; "collapsed" samples stacks every PROFILING_SAMPLE_INTERVAL
+# seconds, "pstats" runs cProfile. The newest PROFILING_MAX_RECORDS profiles younger than
+# PROFILING_MAX_AGE seconds are kept in PROFILING_DIR and listed in the admin.
+PROFILING_ENABLED = config('PROFILING_ENABLED', default=False, cast=bool)
+PROFILING_DIR = config('PROFILING_DIR', default=str(BASE_DIR / 'profiles'))
+PROFILING_DEFAULT_FORMAT = config('PROFILING_DEFAULT_FORMAT', default='collapsed')
+PROFILING_SAMPLE_INTERVAL = config('PROFILING_SAMPLE_INTERVAL', default=0.005, cast=float)
+PROFILING_MAX_RECORDS = config('PROFILING_MAX_RECORDS', default=100, cast=int)
+PROFILING_MAX_AGE = config('PROFILING_MAX_AGE', default=7 * 24 * 60 * 60, cast=int)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'plain': {'format': '%(asctime)s %(levelname)s %(name)s %(message)s'},
+        # Slow-query records are JSON objects, one per line
+        'json_lines': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'plain'},
+    },
+    'loggers': {
+        'tracker.queries': {'handlers': ['console'], 'level': 'WARNING', 'propagate': False},
+    },
+}
+if QUERY_SLOW_LOG_FILE:
+    LOGGING['handlers']['slow_query_file'] = {
+        'class': 'logging.handlers.WatchedFileHandler',
+        'filename': QUERY_SLOW_LOG_FILE,
+        'formatter': 'json_lines',
+    }
+    LOGGING['loggers']['tracker.queries.slow'] = {'handlers': ['slow_query_file'], 'level': 'WARNING', 'propagate': False}
 
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'dashboard'
@@ -14,12 +14,23 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+import re
+
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
-from django.conf.urls.static import static
+
+from tracker.views import file_views
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('tracker.urls')),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    path('api/v1/', include('tracker.api_urls')),
+    # Conditional GET, Range and optional X-Accel-Redirect/X-Sendfile hand-off, also with DEBUG off
+    re_path(rf'^{re.escape(settings.MEDIA_URL.lstrip("/"))}(?P<path>.+)$', file_views.serve_media, name='media'),
+]
+
+if settings.SERVE_STATIC:
+    urlpatterns.append(
+        re_path(rf'^{re.escape(settings.STATIC_URL.lstrip("/"))}(?P<path>.+)$', file_views.serve_static, name='static'),
+    )
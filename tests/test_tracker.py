@@ -1,11 +1,54 @@
+import asyncio
 import datetime
+import gzip
+import json
+import os
+import pstats
+import re
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO, StringIO
+from unittest import skipUnless
+from urllib.parse import urlsplit
 
-from django.db import IntegrityError
-from django.test import TestCase
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.db import IntegrityError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
 
+from tracker import api_urls, urls as tracker_urls
+from tracker.avatars import AVATAR_SIZES
 from tracker.forms import RegisterForm, SkillForm, GoalForm
-from tracker.models import Skill, LearningGoal
+from tracker.middleware import QueryRecorder
+from tracker.profiling import prune_profiles
+from tracker.models import (Skill, LearningGoal, ProgressUpdate, ProgressDaily, Resource, Profile,
+                            CategoryStat, DifficultyStat, LeaderboardEntry, RequestProfile)
+from tracker.pagination import encode_cursor
+from tracker.permissions import sync_group_permissions
+from tracker.query_plans import SEED_PREFIX
+from tracker.services.analytics import rebuild_progress_daily
+from tracker.services.connections import pool_stats
+from tracker.services.dashboard import dashboard_cache_key, dashboard_cache_stats, skill_versions
+from tracker.services.exporter import stream_export
+from tracker.services.link_checker import LinkChecker, check_resource_links
+from tracker.services.profile import PROFILE_UPDATES_PER_GOAL
+from tracker.services.provisioning import provision_users
+from tracker.services.search import search
+from tracker.services.stats import refresh_stats, refresh_stats_if_stale
 from tracker.signals import User
 
 UserModel = get_user_model()
@@ -190,4 +233,1664 @@ class TestGoalForm(TestCase):
         # The target_date widget should be a date input
         form = GoalForm()
         widget = form.fields['target_date'].widget
-        self.assertEqual(widget.input_type, 'date')
\ No newline at end of file
+        self.assertEqual(widget.input_type, 'date')
+
+class TestSkillProgressStats(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = UserModel.objects.create_user(
+            username="StatsUser",
+            email="stats@test.com",
+            password="12Test34"
+        )
+
+    def create_skill(self, name, goal_progress):
+        skill = Skill.objects.create(
+            name=name,
+            description="Skill used for progress statistics",
+            category="Stats",
+            difficulty="Easy",
+            owner=self.user
+        )
+        for index, progress in enumerate(goal_progress):
+            LearningGoal.objects.create(
+                skill=skill,
+                name=f"Goal {index}",
+                description="Goal description",
+                target_date=datetime.date.today(),
+                progress=progress,
+            )
+        return skill
+
+    def test_with_progress_stats_annotations(self):
+        self.create_skill("Complete", [100, 100])
+        self.create_skill("Partial", [100, 20])
+        self.create_skill("Empty", [])
+
+        skills = {skill.name: skill for skill in Skill.objects.with_progress_stats()}
+
+        self.assertEqual(skills["Complete"].goal_count, 2)
+        self.assertEqual(skills["Complete"].completed_goal_count, 2)
+        self.assertTrue(skills["Complete"].is_complete)
+
+        self.assertEqual(skills["Partial"].avg_progress, 60)
+        self.assertFalse(skills["Partial"].is_complete)
+
+        # A skill without goals is never complete
+        self.assertEqual(skills["Empty"].goal_count, 0)
+        self.assertFalse(skills["Empty"].is_complete)
+
+    def test_complete_and_incomplete_filters(self):
+        self.create_skill("Complete", [100])
+        self.create_skill("Partial", [50])
+
+        self.assertEqual([s.name for s in Skill.objects.complete()], ["Complete"])
+        self.assertEqual([s.name for s in Skill.objects.incomplete()], ["Partial"])
+
+    def test_is_complete_without_annotation(self):
+        complete = self.create_skill("Complete", [100])
+        partial = self.create_skill("Partial", [100, 10])
+
+        self.assertTrue(complete.is_complete)
+        self.assertFalse(partial.is_complete)
+
+    def test_dashboard_query_count_does_not_grow_with_skills(self):
+        self.client.force_login(self.user)
+        self.create_skill("First", [100])
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as baseline:
+            self.client.get(reverse('dashboard'))
+
+        for index in range(5):
+            self.create_skill(f"Skill {index}", [100, 30])
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as grown:
+            response = self.client.get(reverse('dashboard'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(baseline), len(grown))
+
+    def test_skill_list_status_filter(self):
+        self.client.force_login(self.user)
+        self.create_skill("Complete", [100])
+        self.create_skill("Partial", [50])
+
+        response = self.client.get(reverse('skill-list'), {'status': 'complete'})
+        self.assertEqual([s.name for s in response.context['skills']], ["Complete"])
+
+
+class TestGoalProgressAccounting(TestCase):
+    def setUp(self):
+        self.user = UserModel.objects.create_user(
+            username="ProgressUser",
+            email="progress@test.com",
+            password="12Test34"
+        )
+        self.skill = Skill.objects.create(
+            name="Progress Skill",
+            description="Skill used for progress accounting",
+            category="Progress",
+            difficulty="Easy",
+            owner=self.user
+        )
+        self.goal = LearningGoal.objects.create(
+            skill=self.skill,
+            name="Progress Goal",
+            description="Goal description",
+            target_date=datetime.date.today(),
+        )
+
+    def post_progress(self, progress):
+        return self.client.post(
+            f"{reverse('progress-form')}?goal_id={self.goal.id}",
+            {'progress': progress, 'update_text': "Studied"},
+        )
+
+    def test_progress_is_incremented_and_capped(self):
+        self.client.force_login(self.user)
+
+        self.post_progress(60)
+        self.goal.refresh_from_db()
+        self.assertEqual(self.goal.progress, 60)
+
+        self.post_progress(60)
+        self.goal.refresh_from_db()
+        self.assertEqual(self.goal.progress, 100)
+        self.assertEqual(ProgressUpdate.objects.filter(goal=self.goal).count(), 2)
+
+    def test_progress_write_does_not_aggregate_history(self):
+        self.client.force_login(self.user)
+        self.post_progress(10)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.post_progress(10)
+
+        self.assertFalse(any('SUM(' in query['sql'].upper() for query in queries))
+
+    def test_reconcile_progress_command_fixes_drift(self):
+        ProgressUpdate.objects.create(goal=self.goal, progress=30, update_text="First")
+        ProgressUpdate.objects.create(goal=self.goal, progress=20, update_text="Second")
+        in_sync = LearningGoal.objects.create(
+            skill=self.skill,
+            name="In Sync Goal",
+            description="Goal description",
+            target_date=datetime.date.today(),
+        )
+
+        # Simulate a direct edit, as done through GoalUpdateView or the admin
+        LearningGoal.objects.filter(pk=self.goal.pk).update(progress=90)
+        self.assertEqual(list(LearningGoal.objects.drifted()), [self.goal])
+
+        out = StringIO()
+        call_command('reconcile_progress', stdout=out)
+
+        self.goal.refresh_from_db()
+        in_sync.refresh_from_db()
+        self.assertEqual(self.goal.progress, 50)
+        self.assertEqual(in_sync.progress, 0)
+        self.assertIn("1 goal(s)", out.getvalue())
+        self.assertFalse(LearningGoal.objects.drifted().exists())
+
+
+class TestDashboardCache(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = UserModel.objects.create_user(
+            username="CacheUser",
+            email="cache@test.com",
+            password="12Test34"
+        )
+        self.skill = Skill.objects.create(
+            name="Cached Skill",
+            description="Skill used for dashboard caching",
+            category="Cache",
+            difficulty="Easy",
+            owner=self.user
+        )
+        self.goal = LearningGoal.objects.create(
+            skill=self.skill,
+            name="Cached Goal",
+            description="Goal description",
+            target_date=datetime.date.today(),
+        )
+        self.client.force_login(self.user)
+
+    def test_repeat_dashboard_view_is_served_from_cache(self):
+        with CaptureQueriesContext(connection) as cold:
+            self.client.get(reverse('dashboard'))
+        with CaptureQueriesContext(connection) as warm:
+            response = self.client.get(reverse('dashboard'))
+
+        # Only the session and user lookups remain on a cache hit
+        self.assertLess(len(warm), len(cold))
+        self.assertFalse(any('tracker_' in query['sql'] for query in warm))
+        self.assertEqual(response.context['skill_count'], 1)
+        self.assertEqual(response.context['goal_count'], 1)
+        self.assertEqual(dashboard_cache_stats(), {'hits': 1, 'misses': 1})
+
+    def test_progress_update_invalidates_owner_dashboard(self):
+        self.client.get(reverse('dashboard'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                f"{reverse('progress-form')}?goal_id={self.goal.id}",
+                {'progress': 100, 'update_text': "Finished"},
+            )
+
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.context['progress_count'], 1)
+        self.assertTrue(response.context['skills'][0].is_complete)
+
+    def test_changes_by_other_users_keep_cache(self):
+        other = UserModel.objects.create_user(
+            username="OtherCacheUser",
+            email="other-cache@test.com",
+            password="12Test34"
+        )
+        self.client.get(reverse('dashboard'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Skill.objects.create(
+                name="Other Skill",
+                description="Belongs to someone else",
+                category="Cache",
+                difficulty="Easy",
+                owner=other
+            )
+
+        self.assertIsNotNone(cache.get(dashboard_cache_key(self.user.pk)))
+
+    def test_skill_delete_invalidates_dashboard(self):
+        self.client.get(reverse('dashboard'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.skill.delete()
+
+        self.assertIsNone(cache.get(dashboard_cache_key(self.user.pk)))
+
+    def test_unchanged_skill_cards_are_served_from_the_fragment_cache(self):
+        other_skill = Skill.objects.create(name="Second Skill", category="Cache", difficulty="Easy", owner=self.user)
+        self.client.get(reverse('dashboard'))
+        versions = skill_versions([self.skill.pk, other_skill.pk])
+
+        # Renamed without signals and with the summary dropped: the cached card still shows the old name
+        Skill.objects.filter(pk=self.skill.pk).update(name="Renamed Skill")
+        cache.delete(dashboard_cache_key(self.user.pk))
+        self.assertNotContains(self.client.get(reverse('dashboard')), "Renamed Skill")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                f"{reverse('progress-form')}?goal_id={self.goal.id}",
+                {'progress': 40, 'update_text': "Halfway"},
+            )
+
+        # Only the card of the skill that changed is rendered again
+        new_versions = skill_versions([self.skill.pk, other_skill.pk])
+        self.assertNotEqual(new_versions[self.skill.pk], versions[self.skill.pk])
+        self.assertEqual(new_versions[other_skill.pk], versions[other_skill.pk])
+        response = self.client.get(reverse('dashboard'))
+        self.assertContains(response, "Renamed Skill")
+        self.assertContains(response, 'aria-valuenow="40"')
+
+
+class TestProfilePage(TestCase):
+    def setUp(self):
+        self.user = UserModel.objects.create_user(
+            username="ProfileUser",
+            email="profile@test.com",
+            password="12Test34"
+        )
+        self.client.force_login(self.user)
+
+    def create_skill_with_history(self, name, updates):
+        skill = Skill.objects.create(
+            name=name,
+            description="Skill used for the profile page",
+            category="Profile",
+            difficulty="Easy",
+            owner=self.user
+        )
+        goal = LearningGoal.objects.create(
+            skill=skill,
+            name=f"{name} Goal",
+            description="Goal description",
+            target_date=datetime.date.today(),
+        )
+        Resource.objects.create(title=f"{name} docs", link="https://example.com", skill=skill, approved=True)
+        Resource.objects.create(title=f"{name} draft", link="https://example.com", skill=skill, approved=False)
+        ProgressUpdate.objects.bulk_create(
+            ProgressUpdate(goal=goal, progress=1, update_text=f"Update {index}") for index in range(updates)
+        )
+        return goal
+
+    def test_profile_query_count_is_constant(self):
+        self.create_skill_with_history("First", updates=2)
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as baseline:
+            self.client.get(reverse('profile'))
+
+        for index in range(4):
+            self.create_skill_with_history(f"Skill {index}", updates=20)
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as grown:
+            response = self.client.get(reverse('profile'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(baseline), len(grown))
+
+    def test_profile_caps_updates_and_lists_approved_resources(self):
+        goal = self.create_skill_with_history("Capped", updates=PROFILE_UPDATES_PER_GOAL + 3)
+
+        response = self.client.get(reverse('profile'))
+        profile_goal = response.context['goals'][0]
+        skill = response.context['skills_with_resources'][0]
+
+        self.assertEqual(profile_goal.pk, goal.pk)
+        self.assertEqual(len(profile_goal.recent_updates), PROFILE_UPDATES_PER_GOAL)
+        self.assertTrue(profile_goal.has_more_updates)
+        self.assertEqual([resource.title for resource in skill.approved_resources], ["Capped docs"])
+        self.assertContains(response, reverse('goal-updates', args=[goal.pk]))
+
+    def test_goal_history_pages_through_every_update(self):
+        goal = self.create_skill_with_history("History", updates=45)
+        url = reverse('goal-updates', args=[goal.pk])
+
+        seen = []
+        response = self.client.get(url)
+        while True:
+            page = response.context['page']
+            seen.extend(update.pk for update in page)
+            if not page.has_next:
+                break
+            response = self.client.get(url, {'after': page.next_cursor})
+
+        self.assertEqual(len(seen), 45)
+        self.assertEqual(len(set(seen)), 45)
+
+        # Walking back from the last page returns the previous rows in the same order
+        previous = self.client.get(url, {'before': page.previous_cursor}).context['page']
+        self.assertEqual([update.pk for update in previous], seen[20:40])
+
+    def test_goal_history_is_limited_to_owner(self):
+        goal = self.create_skill_with_history("Private", updates=1)
+        other = UserModel.objects.create_user(
+            username="OtherProfileUser",
+            email="other-profile@test.com",
+            password="12Test34"
+        )
+        self.client.force_login(other)
+
+        response = self.client.get(reverse('goal-updates', args=[goal.pk]))
+        self.assertEqual(response.status_code, 404)
+
+
+class TestSkillListPagination(TestCase):
+    def setUp(self):
+        self.user = UserModel.objects.create_user(
+            username="ListUser",
+            email="list@test.com",
+            password="12Test34"
+        )
+        self.client.force_login(self.user)
+        Skill.objects.bulk_create(
+            Skill(
+                name=f"Skill {index:02d}",
+                description="Skill used for list pagination",
+                category="Backend" if index % 2 else "Frontend",
+                difficulty="Hard" if index % 3 else "Easy",
+                owner=self.user,
+            )
+            for index in range(30)
+        )
+
+    def collect_pages(self, params):
+        names = []
+        response = self.client.get(reverse('skill-list'), params)
+        while True:
+            names.extend(skill.name for skill in response.context['skills'])
+            page = response.context['page_obj']
+            if not page.has_next:
+                return names
+            response = self.client.get(reverse('skill-list'), {**params, 'after': page.next_cursor})
+
+    def test_pages_cover_every_skill_once(self):
+        names = self.collect_pages({'sort': 'name'})
+        self.assertEqual(names, sorted(f"Skill {index:02d}" for index in range(30)))
+
+    def test_filters_apply_across_pages(self):
+        names = self.collect_pages({'category': "Backend", 'difficulty': "Hard"})
+        expected = {f"Skill {index:02d}" for index in range(30) if index % 2 and index % 3}
+        self.assertEqual(set(names), expected)
+        self.assertEqual(len(names), len(expected))
+
+    def test_deep_pages_do_not_use_offset(self):
+        first = self.client.get(reverse('skill-list'))
+        cursor = first.context['page_obj'].next_cursor
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(reverse('skill-list'), {'after': cursor})
+
+        self.assertEqual(len(second.context['skills']), 12)
+        self.assertFalse(any('OFFSET' in query['sql'] for query in queries))
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        tampered = [encode_cursor(values) for values in ([1, 2], [None, None], [{}, []], ["2025-13-45", "x"])]
+        for cursor in ["not-a-cursor", *tampered]:
+            for direction in ('after', 'before'):
+                with self.subTest(cursor=cursor, direction=direction):
+                    response = self.client.get(reverse('skill-list'), {direction: cursor})
+                    self.assertEqual(response.status_code, 200)
+                    self.assertFalse(response.context['page_obj'].has_previous)
+
+
+@skipUnless(connection.vendor == 'postgresql', "Query plans are checked on PostgreSQL only")
+class TestHotQueryPlans(TestCase):
+    def test_hot_queries_do_not_use_sequential_scans(self):
+        out = StringIO()
+        call_command(
+            'check_query_plans',
+            users=200,
+            skills_per_user=10,
+            goals_per_skill=5,
+            updates_per_goal=5,
+            stdout=out,
+        )
+        self.assertIn("use indexes", out.getvalue())
+        # The seeded dataset is rolled back by the command itself
+        self.assertFalse(UserModel.objects.filter(username__startswith=SEED_PREFIX).exists())
+
+
+# Query budget per tracker route; the same budget must hold for a tiny and a large account
+ROUTE_BUDGETS = {
+    'home': (lambda data: reverse('home'), 2),
+    'about': (lambda data: reverse('about'), 2),
+    'login': (lambda data: reverse('login'), 2),
+    'register': (lambda data: reverse('register'), 2),
+    'dashboard': (lambda data: reverse('dashboard'), 5),
+    'skill-list': (lambda data: reverse('skill-list'), 5),
+    'skill-add': (lambda data: reverse('skill-add'), 2),
+    'skill-detail': (lambda data: reverse('skill-detail', args=[data['skill'].pk]), 3),
+    'skill-update': (lambda data: reverse('skill-update', args=[data['skill'].pk]), 3),
+    'progress-form': (lambda data: f"{reverse('progress-form')}?goal_id={data['goal'].pk}", 2),
+    'skill-delete': (lambda data: reverse('skill-delete', args=[data['skill'].pk]), 3),
+    'profile': (lambda data: reverse('profile'), 7),
+    'goal-updates': (lambda data: reverse('goal-updates', args=[data['goal'].pk]), 4),
+    'goal-add': (lambda data: reverse('goal-add', args=[data['skill'].pk]), 3),
+    'goal-edit': (lambda data: reverse('goal-edit', args=[data['goal'].pk]), 3),
+    'resource-add': (lambda data: reverse('resource-add'), 3),
+    'edit-profile': (lambda data: reverse('edit-profile'), 3),
+    'goal-delete': (lambda data: reverse('goal-delete', args=[data['goal'].pk]), 4),
+    'import': (lambda data: reverse('import'), 2),
+    'export': (lambda data: reverse('export'), 7),
+    'search': (lambda data: f"{reverse('search')}?q=skill", 3),
+    'stats': (lambda data: reverse('stats'), 6),
+    'moderation-queue': (lambda data: reverse('moderation-queue', args=['resources']), 5),
+    'logout': (lambda data: reverse('logout'), 4),
+    'api_v1:summary': (lambda data: reverse('api_v1:summary'), 5),
+    'api_v1:skills': (lambda data: reverse('api_v1:skills') + '?fields=id,name,goal_count', 3),
+    'api_v1:skill-detail': (lambda data: reverse('api_v1:skill-detail', args=[data['skill'].pk]), 3),
+    'api_v1:goals': (lambda data: reverse('api_v1:goals'), 3),
+    'api_v1:goal-progress': (lambda data: reverse('api_v1:goal-progress', args=[data['goal'].pk]), 4),
+    'api_v1:analytics-daily': (lambda data: reverse('api_v1:analytics-daily'), 3),
+    'api_v1:analytics-weekly': (lambda data: reverse('api_v1:analytics-weekly'), 3),
+    'api_v1:analytics-streak': (lambda data: reverse('api_v1:analytics-streak'), 3),
+}
+
+PERF_REPORT_PATH = os.environ.get('TRACKER_PERF_REPORT', settings.BASE_DIR / 'perf_report.json')
+
+
+def seed_account(username, skills, goals_per_skill, updates_per_goal, resources_per_skill):
+    # Superusers, so the staff-only routes are measured as well
+    user = UserModel.objects.create_superuser(
+        username=username,
+        email=f"{username}@test.com",
+        password="12Test34"
+    )
+    created_skills = Skill.objects.bulk_create(
+        Skill(
+            name=f"Skill {index}",
+            description="Seeded for route budgets",
+            category=f"Category {index % 4}",
+            difficulty="Medium",
+            owner=user,
+        )
+        for index in range(skills)
+    )
+    goals = LearningGoal.objects.bulk_create(
+        LearningGoal(
+            skill=skill,
+            name=f"Goal {index}",
+            description="Seeded goal",
+            target_date=datetime.date.today(),
+            progress=index * 30,
+        )
+        for skill in created_skills
+        for index in range(goals_per_skill)
+    )
+    ProgressUpdate.objects.bulk_create(
+        ProgressUpdate(goal=goal, progress=1, update_text="Seeded update")
+        for goal in goals
+        for _ in range(updates_per_goal)
+    )
+    Resource.objects.bulk_create(
+        Resource(title=f"Resource {index}", link="https://example.com", skill=skill, approved=bool(index % 2))
+        for skill in created_skills
+        for index in range(resources_per_skill)
+    )
+    return {'user': user, 'skill': created_skills[0], 'goal': goals[0]}
+
+
+class TestRouteQueryBudgets(TestCase):
+    timings = {}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.accounts = {
+            'small': seed_account("BudgetSmall", skills=1, goals_per_skill=1, updates_per_goal=1, resources_per_skill=1),
+            'large': seed_account("BudgetLarge", skills=40, goals_per_skill=4, updates_per_goal=25, resources_per_skill=3),
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        with open(PERF_REPORT_PATH, 'w') as report:
+            json.dump(cls.timings, report, indent=2, sort_keys=True)
+
+    def measure(self, route, size):
+        data = self.accounts[size]
+        url_for, _ = ROUTE_BUDGETS[route]
+        url = url_for(data)
+
+        cache.clear()
+        self.client.force_login(data['user'])
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = self.client.get(url)
+            if response.streaming:
+                b''.join(response.streaming_content)
+            elapsed = time.perf_counter() - started
+
+        self.assertIn(response.status_code, (200, 302), f"{route} returned {response.status_code}")
+        self.timings.setdefault(route, {})[size] = {
+            'queries': len(queries),
+            'milliseconds': round(elapsed * 1000, 2),
+        }
+        return len(queries)
+
+    def test_every_route_has_a_budget(self):
+        names = {pattern.name for pattern in tracker_urls.urlpatterns}
+        names |= {f"{api_urls.app_name}:{pattern.name}" for pattern in api_urls.urlpatterns}
+        self.assertEqual(names - set(ROUTE_BUDGETS), set())
+
+    def test_query_counts_are_within_budget_and_independent_of_data_size(self):
+        for route, (_, budget) in ROUTE_BUDGETS.items():
+            with self.subTest(route=route):
+                small = self.measure(route, 'small')
+                large = self.measure(route, 'large')
+                self.assertEqual(small, large, f"{route} query count grows with data size")
+                self.assertLessEqual(large, budget, f"{route} exceeds its query budget")
+
+
+class TestTrackerImport(TestCase):
+    def setUp(self):
+        self.user = UserModel.objects.create_user(
+            username="ImportUser",
+            email="import@test.com",
+            password="12Test34"
+        )
+
+    def write_file(self, suffix, content):
+        handle = tempfile.NamedTemporaryFile('w', suffix=suffix, delete=False, encoding='utf-8')
+        with handle:
+            handle.write(content)
+        self.addCleanup(os.remove, handle.name)
+        return handle.name
+
+    def test_import_command_streams_jsonl_in_chunks(self):
+        lines = [
+            {'type': 'skill', 'ref': 'py', 'name': "Python", 'description': "Language",
+             'category': "Programming", 'difficulty': "Medium"},
+            {'type': 'goal', 'ref': 'py-basics', 'skill': 'py', 'name': "Basics",
+             'description': "Syntax", 'target_date': "2030-01-01"},
+        ]
+        lines += [
+            {'type': 'progress', 'goal': 'py-basics', 'progress': 15, 'update_text': f"Day {day}",
+             'date': f"2024-01-{day:02d}T10:00:00"}
+            for day in range(1, 11)
+        ]
+        lines.append({'type': 'progress', 'goal': 'missing', 'progress': 5, 'update_text': "Orphan"})
+        path = self.write_file('.jsonl', '\n'.join(json.dumps(line) for line in lines) + '\nnot json\n')
+
+        out, err = StringIO(), StringIO()
+        call_command('import_tracker', path, user=self.user.username, chunk_size=3, stdout=out, stderr=err)
+
+        goal = LearningGoal.objects.get(skill__owner=self.user, name="Basics")
+        self.assertEqual(goal.progress, 100)
+        self.assertEqual(goal.progressupdate_set.count(), 10)
+        self.assertEqual(goal.progressupdate_set.earliest('date').date.date(), datetime.date(2024, 1, 1))
+        self.assertIn("10 progress update(s)", out.getvalue())
+        self.assertIn("rows/s", out.getvalue())
+        self.assertIn("skipped 2 row(s)", out.getvalue())
+        self.assertIn("Unknown goal ref 'missing'", err.getvalue())
+
+    def test_import_view_accepts_csv_upload(self):
+        self.client.force_login(self.user)
+        content = (
+            "type,ref,parent,name,description,category,difficulty,target_date,progress,update_text,date\n"
+            "skill,js,,JavaScript,Language,Programming,Easy,,,,\n"
+            "goal,js-dom,js,DOM,Browser APIs,,,2030-06-01,,,\n"
+            "progress,,js-dom,,,,,,40,Read the docs,2024-02-01T09:00:00\n"
+        )
+        upload = SimpleUploadedFile('tracker.csv', content.encode(), content_type='text/csv')
+
+        response = self.client.post(reverse('import'), {'file': upload, 'format': 'csv'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['result'].rows, 3)
+        self.assertEqual(LearningGoal.objects.get(skill__owner=self.user).progress, 40)
+
+    def test_import_view_rejects_non_utf8_upload(self):
+        self.client.force_login(self.user)
+        content = (
+            "type,ref,parent,name,description,category,difficulty,target_date,progress,update_text,date\n"
+            "skill,fr,,Français,Langue,Languages,Easy,,,,\n"
+        )
+        upload = SimpleUploadedFile('tracker.csv', content.encode('latin-1'), content_type='text/csv')
+
+        response = self.client.post(reverse('import'), {'file': upload, 'format': 'csv'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('must be UTF-8 encoded', response.context['form'].errors['file'][0])
+        self.assertFalse(Skill.objects.filter(owner=self.user).exists())
+
+
+class TestTrackerExport(TestCase):
+    def setUp(self):
+        self.user = UserModel.objects.create_user(
+            username="ExportUser",
+            email="export@test.com",
+            password="12Test34"
+        )
+        skill = Skill.objects.create(
+            name="Export Skill",
+            description="Skill used for exports",
+            category="Export",
+            difficulty="Easy",
+            owner=self.user
+        )
+        goal = LearningGoal.objects.create(
+            skill=skill,
+            name="Export Goal",
+            description="Goal description",
+            target_date=datetime.date.today(),
+        )
+        ProgressUpdate.objects.bulk_create(
+            ProgressUpdate(goal=goal, progress=1, update_text=f"Update {index}") for index in range(50)
+        )
+        Resource.objects.create(title="Docs", link="https://example.com", skill=skill)
+
+    def test_export_streams_zip_archive(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse('export'))
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        self.assertIn('skillhub-export-ExportUser.zip', response['Content-Disposition'])
+
+        archive = zipfile.ZipFile(BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(
+            set(archive.namelist()),
+            {'profile.json', 'skills.jsonl', 'goals.jsonl', 'progress_updates.jsonl', 'resources.jsonl'},
+        )
+        updates = archive.read('progress_updates.jsonl').decode().splitlines()
+        self.assertEqual(len(updates), 50)
+        self.assertEqual(json.loads(updates[0])['update_text'], "Update 0")
+        self.assertEqual(json.loads(archive.read('profile.json'))['username'], "ExportUser")
+
+    def test_export_yields_multiple_chunks(self):
+        chunks = [chunk for chunk in stream_export(self.user, chunk_size=10) if chunk]
+        self.assertGreater(len(chunks), 1)
+
+
+class TestTrackerApi(TestCase):
+    def setUp(self):
+        self.user = UserModel.objects.create_user(
+            username="ApiUser",
+            email="api@test.com",
+            password="12Test34"
+        )
+        self.skills = [
+            Skill.objects.create(
+                name=f"Api Skill {index}",
+                description="Skill used for the API",
+                category="Backend" if index % 2 else "Frontend",
+                difficulty="Easy",
+                owner=self.user
+            )
+            for index in range(5)
+        ]
+        self.goal = LearningGoal.objects.create(
+            skill=self.skills[0],
+            name="Api Goal",
+            description="Goal description",
+            target_date=datetime.date.today(),
+            progress=100,
+        )
+        ProgressUpdate.objects.bulk_create(
+            ProgressUpdate(goal=self.goal, progress=10, update_text=f"Update {index}") for index in range(7)
+        )
+        self.client.force_login(self.user)
+
+    def test_requires_authentication(self):
+        self.client.logout()
+        response = self.client.get(reverse('api_v1:skills'))
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json(), {'error': "Authentication required."})
+
+    def test_skill_list_field_selection_and_pagination(self):
+        response = self.client.get(reverse('api_v1:skills'), {'fields': 'id,name,goal_count', 'limit': 3})
+        body = response.json()
+
+        self.assertEqual(len(body['results']), 3)
+        self.assertEqual(set(body['results'][0]), {'id', 'name', 'goal_count'})
+        self.assertIsNone(body['previous'])
+
+        second = self.client.get(reverse('api_v1:skills'), {'fields': 'id', 'limit': 3, 'after': body['next']}).json()
+        ids = [row['id'] for row in body['results'] + second['results']]
+        self.assertEqual(sorted(ids), sorted(skill.pk for skill in self.skills))
+        self.assertIsNone(second['next'])
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(reverse('api_v1:skills'), {'fields': 'id,password'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("password", response.json()['error'])
+
+    def test_skill_detail_and_goal_completion(self):
+        detail = self.client.get(reverse('api_v1:skill-detail', args=[self.skills[0].pk])).json()
+        self.assertTrue(detail['is_complete'])
+
+        goals = self.client.get(reverse('api_v1:goals'), {'skill': self.skills[0].pk}).json()
+        self.assertEqual(goals['results'][0]['name'], "Api Goal")
+        self.assertTrue(goals['results'][0]['is_complete'])
+
+    def test_goal_progress_history_and_summary(self):
+        history = self.client.get(reverse('api_v1:goal-progress', args=[self.goal.pk]), {'limit': 5}).json()
+        self.assertEqual(len(history['results']), 5)
+        self.assertIsNotNone(history['next'])
+
+        summary = self.client.get(reverse('api_v1:summary')).json()
+        self.assertEqual(summary['skill_count'], 5)
+        self.assertEqual(summary['complete_skill_count'], 1)
+        self.assertEqual(summary['progress_count'], 7)
+
+    def test_other_users_data_is_not_found(self):
+        other = UserModel.objects.create_user(
+            username="OtherApiUser",
+            email="other-api@test.com",
+            password="12Test34"
+        )
+        self.client.force_login(other)
+
+        self.assertEqual(self.client.get(reverse('api_v1:skill-detail', args=[self.skills[0].pk])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('api_v1:goal-progress', args=[self.goal.pk])).status_code, 404)
+
+
+@override_settings(AVATAR_PROCESSING_ASYNC=False)
+class TestAvatarPipeline(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_settings = override_settings(MEDIA_ROOT=media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+        self.user = UserModel.objects.create_user(
+            username="AvatarUser",
+            email="avatar@test.com",
+            password="12Test34"
+        )
+        self.client.force_login(self.user)
+
+    def image_upload(self, size=(800, 600), name='avatar.png'):
+        output = BytesIO()
+        Image.new('RGB', size, (30, 120, 200)).save(output, 'PNG')
+        return SimpleUploadedFile(name, output.getvalue(), content_type='image/png')
+
+    def post_avatar(self, upload):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse('edit-profile'), {
+                'bio': "A bio that is long enough",
+                'avatar': upload,
+            })
+
+    def test_upload_generates_resized_variants(self):
+        response = self.post_avatar(self.image_upload())
+        self.assertRedirects(response, reverse('profile'))
+
+        profile = Profile.objects.get(user=self.user)
+        self.assertEqual(set(profile.avatar_variants), set(AVATAR_SIZES))
+        with profile.avatar.storage.open(profile.avatar_variants['md']['webp']) as variant:
+            self.assertEqual(Image.open(variant).size, (150, 150))
+
+        Profile.objects.filter(pk=profile.pk).update(is_approved=True)
+        page = self.client.get(reverse('profile'))
+        self.assertContains(page, 'type="image/webp"')
+        self.assertContains(page, profile.avatar_variants['lg']['jpeg'])
+
+    @override_settings(AVATAR_MAX_UPLOAD_SIZE=1024)
+    def test_oversized_upload_is_rejected(self):
+        response = self.post_avatar(self.image_upload())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("smaller than", str(response.context['form'].errors['avatar']))
+        self.assertFalse(Profile.objects.get(user=self.user).avatar)
+
+    @override_settings(AVATAR_MAX_DIMENSION=500)
+    def test_too_large_dimensions_are_rejected(self):
+        response = self.post_avatar(self.image_upload(size=(600, 100)))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("500px", str(response.context['form'].errors['avatar']))
+
+    def test_identical_uploads_share_one_file(self):
+        other = UserModel.objects.create_user(username="AvatarTwin", email="twin@test.com", password="12Test34")
+        self.post_avatar(self.image_upload(name='first.png'))
+        self.client.force_login(other)
+        self.post_avatar(self.image_upload(name='second.png'))
+
+        names = set(Profile.objects.values_list('avatar', flat=True))
+        self.assertEqual(len(names), 1)
+        # Only the content-addressed file is written, not one copy per upload
+        stored = Profile._meta.get_field('avatar').storage.path(names.pop())
+        self.assertEqual(os.listdir(os.path.dirname(stored)), [os.path.basename(stored)])
+
+    def test_replaced_avatar_is_released_once_unreferenced(self):
+        self.post_avatar(self.image_upload())
+        profile = Profile.objects.get(user=self.user)
+        old_name = profile.avatar.name
+        old_variant = profile.avatar_variants['sm']['webp']
+        storage = profile.avatar.storage
+
+        self.post_avatar(self.image_upload(size=(400, 400)))
+
+        self.assertNotEqual(Profile.objects.get(user=self.user).avatar.name, old_name)
+        self.assertFalse(storage.exists(old_name))
+        self.assertFalse(storage.exists(old_variant))
+
+    def test_dedupe_command_merges_legacy_copies(self):
+        storage = Profile._meta.get_field('avatar').storage
+        upload = self.image_upload()
+        content = upload.read()
+        # Files as Django used to store them, with random suffixes for repeated names
+        os.makedirs(storage.path('avatars'))
+        for legacy_name in ('avatars/photo.png', 'avatars/photo_26nz0qY.png'):
+            with open(storage.path(legacy_name), 'wb') as legacy:
+                legacy.write(content)
+        other = UserModel.objects.create_user(username="AvatarTwin", email="twin@test.com", password="12Test34")
+        Profile.objects.filter(user=self.user).update(avatar='avatars/photo.png')
+        Profile.objects.filter(user=other).update(avatar='avatars/photo_26nz0qY.png')
+
+        output = StringIO()
+        call_command('dedupe_avatars', stdout=output)
+
+        names = set(Profile.objects.values_list('avatar', flat=True))
+        self.assertEqual(len(names), 1)
+        name = names.pop()
+        self.assertRegex(name, r'^avatars/[0-9a-f]{2}/[0-9a-f]{64}\.png$')
+        self.assertTrue(storage.exists(name))
+        self.assertFalse(storage.exists('avatars/photo.png'))
+        self.assertFalse(storage.exists('avatars/photo_26nz0qY.png'))
+        self.assertIn("merging 1 duplicate(s)", output.getvalue())
+
+
+class StubLinkHandler(BaseHTTPRequestHandler):
+    # Local stand-in for the sites resources link to
+    hits = []
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def respond(self):
+        cls = type(self)
+        with cls.lock:
+            cls.hits.append((self.command, self.path))
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        try:
+            if self.path == '/slow':
+                time.sleep(1)
+            elif self.path.startswith('/busy'):
+                time.sleep(0.1)
+
+            if self.path == '/moved':
+                self.send_response(301)
+                self.send_header('Location', '/ok')
+            elif self.path == '/missing':
+                self.send_response(404)
+            elif self.path == '/get-only' and self.command == 'HEAD':
+                self.send_response(405)
+            elif self.path == '/flaky' and cls.hits.count((self.command, self.path)) == 1:
+                self.send_response(503)
+            else:
+                self.send_response(200)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    do_HEAD = do_GET = respond
+
+
+@override_settings(LINK_CHECK_BACKOFF=0, LINK_CHECK_TIMEOUT=0.5, LINK_CHECK_RETRIES=1)
+class TestResourceLinkChecker(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubLinkHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        StubLinkHandler.hits, StubLinkHandler.peak = [], 0
+        self.user = UserModel.objects.create_user(
+            username="LinkUser",
+            email="links@test.com",
+            password="12Test34"
+        )
+        self.skill = Skill.objects.create(name="Links", category="Web", difficulty="Easy", owner=self.user)
+
+    def add_resources(self, *paths):
+        return [
+            Resource.objects.create(title=path, link=f'{self.base_url}{path}', skill=self.skill)
+            for path in paths
+        ]
+
+    def test_results_are_saved_per_resource(self):
+        resources = self.add_resources('/ok', '/moved', '/missing', '/get-only', '/flaky', '/slow', '/ok')
+
+        call_command('check_resource_links', stdout=StringIO())
+
+        by_title = {}
+        for resource in Resource.objects.filter(pk__in=[resource.pk for resource in resources]):
+            by_title[resource.title] = resource
+            self.assertIsNotNone(resource.link_checked_at)
+        self.assertEqual(by_title['/ok'].link_status, Resource.LINK_OK)
+        self.assertEqual(by_title['/moved'].link_status, Resource.LINK_REDIRECTED)
+        self.assertEqual(by_title['/moved'].link_final_url, f'{self.base_url}/ok')
+        self.assertEqual(by_title['/missing'].link_status_code, 404)
+        self.assertEqual(by_title['/get-only'].link_status, Resource.LINK_OK)
+        # A 503 is retried once before it counts
+        self.assertEqual(by_title['/flaky'].link_status, Resource.LINK_OK)
+        self.assertEqual(by_title['/slow'].link_status, Resource.LINK_UNREACHABLE)
+        self.assertEqual(by_title['/slow'].link_error, "Timed out.")
+        # The same link on two resources is requested once
+        self.assertEqual(StubLinkHandler.hits.count(('HEAD', '/moved')), 1)
+
+    def test_recently_checked_links_are_skipped(self):
+        self.add_resources('/ok', '/missing')
+        check_resource_links()
+        requests_made = len(StubLinkHandler.hits)
+
+        self.assertEqual(check_resource_links(), {})
+        self.assertEqual(len(StubLinkHandler.hits), requests_made)
+
+        # A new resource with an already checked link is answered from the cache
+        self.add_resources('/ok')
+        results = check_resource_links()
+        self.assertEqual(results[f'{self.base_url}/ok'].status, Resource.LINK_OK)
+        self.assertEqual(len(StubLinkHandler.hits), requests_made)
+
+    def test_non_ascii_and_malformed_links_do_not_abort_the_run(self):
+        ok, unicode_link = self.add_resources('/ok', '/guide–ру?topic=ä b')
+        malformed = Resource.objects.create(title="bad port", link='http://127.0.0.1:99999/x', skill=self.skill)
+
+        check_resource_links()
+
+        self.assertIn(('HEAD', '/guide%E2%80%93%D1%80%D1%83?topic=%C3%A4%20b'), StubLinkHandler.hits)
+        self.assertEqual(Resource.objects.get(pk=unicode_link.pk).link_status, Resource.LINK_OK)
+        self.assertEqual(Resource.objects.get(pk=ok.pk).link_status, Resource.LINK_OK)
+        malformed.refresh_from_db()
+        self.assertEqual(malformed.link_status, Resource.LINK_UNREACHABLE)
+        self.assertTrue(malformed.link_error.startswith("Invalid URL"))
+
+    def test_connections_per_host_are_limited(self):
+        self.add_resources(*[f'/busy/{number}' for number in range(8)])
+
+        check_resource_links(checker=LinkChecker(concurrency=8, per_host=2))
+
+        self.assertEqual(len(StubLinkHandler.hits), 8)
+        self.assertLessEqual(StubLinkHandler.peak, 2)
+
+    def test_links_to_a_busy_host_do_not_hold_global_slots(self):
+        class RecordingChecker(LinkChecker):
+            # Answers without a network; records how many requests run at once, overall and per host
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.running = Counter()
+                self.host_peak = 0
+                self.first_wave = None
+
+            async def request_with_retries(self, url, method):
+                host = urlsplit(url).hostname
+                self.running[host] += 1
+                self.host_peak = max(self.host_peak, self.running[host])
+                await asyncio.sleep(0.01)
+                if self.first_wave is None:
+                    self.first_wave = sum(self.running.values())
+                self.running[host] -= 1
+                return 200, {}
+
+        urls = [f'http://busy.test/{number}' for number in range(12)]
+        urls += ['http://quiet-a.test/', 'http://quiet-b.test/']
+        checker = RecordingChecker(concurrency=4, per_host=2)
+
+        results = checker.run(urls)
+
+        self.assertEqual([result.status for result in results], [Resource.LINK_OK] * len(urls))
+        self.assertEqual(checker.host_peak, 2)
+        # Both quiet hosts run alongside the busy one from the start, filling all global slots
+        self.assertEqual(checker.first_wave, 4)
+
+    def test_admin_filters_by_link_health(self):
+        ok, missing = self.add_resources('/ok', '/missing')
+        unchecked = self.add_resources('/later')[0]
+        check_resource_links(Resource.objects.filter(pk__in=[ok.pk, missing.pk]))
+        admin_user = UserModel.objects.create_superuser(username="LinkAdmin", email="a@test.com", password="12Test34")
+        self.client.force_login(admin_user)
+
+        response = self.client.get(reverse('admin:tracker_resource_changelist'), {'link_health': 'broken'})
+        self.assertEqual([resource.pk for resource in response.context['cl'].result_list], [missing.pk])
+        response = self.client.get(reverse('admin:tracker_resource_changelist'), {'link_health': 'unchecked'})
+        self.assertEqual([resource.pk for resource in response.context['cl'].result_list], [unchecked.pk])
+
+
+class TestModerationQueue(TestCase):
+    def setUp(self):
+        self.author = UserModel.objects.create_user(
+            username="Author",
+            email="author@test.com",
+            password="12Test34"
+        )
+        self.moderator = UserModel.objects.create_superuser(
+            username="Moderator",
+            email="moderator@test.com",
+            password="12Test34"
+        )
+        skill = Skill.objects.create(name="Moderated", category="Web", difficulty="Easy", owner=self.author)
+        self.resources = Resource.objects.bulk_create(
+            Resource(title=f"Pending {index}", link="https://example.com", skill=skill, added_by=self.author)
+            for index in range(6)
+        )
+        # Profiles are created with their users; the staff accounts' own profiles are not under review here
+        Profile.objects.moderate(approve=True)
+        self.profiles = [
+            UserModel.objects.create_user(username=f"Pending{index}", password="12Test34").profile
+            for index in range(2)
+        ]
+
+    def test_queue_is_staff_only(self):
+        self.client.force_login(self.author)
+        response = self.client.get(reverse('moderation-queue', args=['resources']))
+        self.assertEqual(response.status_code, 403)
+
+    def test_queue_shows_pending_counts_and_pages(self):
+        self.client.force_login(self.moderator)
+        response = self.client.get(reverse('moderation-queue', args=['resources']), {'per_page': 4})
+
+        self.assertEqual(response.context['pending_counts'], {'resources': 6, 'profiles': 2})
+        self.assertEqual([item.pk for item in response.context['page']], [resource.pk for resource in self.resources[:4]])
+        self.assertTrue(response.context['page'].has_next)
+        self.assertEqual(self.client.get(reverse('moderation-queue', args=['unknown'])).status_code, 404)
+
+    def test_bulk_decisions_run_as_one_update(self):
+        self.client.force_login(self.moderator)
+        approve = [resource.pk for resource in self.resources[:4]]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('moderation-queue', args=['resources']), {'action': 'approve', 'ids': approve})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len([query for query in queries if query['sql'].startswith('UPDATE')]), 1)
+
+        self.client.post(reverse('moderation-queue', args=['resources']), {'action': 'reject', 'ids': [self.resources[4].pk]})
+        self.client.post(reverse('moderation-queue', args=['profiles']), {'action': 'approve', 'ids': [self.profiles[0].pk]})
+
+        self.assertEqual(Resource.objects.filter(approved=True).count(), 4)
+        self.assertEqual(list(Resource.objects.pending().values_list('pk', flat=True)), [self.resources[5].pk])
+        self.assertTrue(Profile.objects.get(pk=self.profiles[0].pk).is_approved)
+        self.assertEqual(Profile.objects.pending().count(), 1)
+
+    def test_editing_a_profile_sends_it_back_to_the_queue(self):
+        Profile.objects.filter(pk=self.profiles[0].pk).moderate(approve=True)
+        self.client.force_login(self.profiles[0].user)
+
+        self.client.post(reverse('edit-profile'), {'bio': "A bio that is long enough"})
+
+        profile = Profile.objects.get(pk=self.profiles[0].pk)
+        self.assertFalse(profile.is_approved)
+        self.assertIsNone(profile.moderated_at)
+
+
+class TestAdminGroupBootstrap(TestCase):
+    def staff_codenames(self):
+        return set(Group.objects.get(name='StaffAdmin').permissions.values_list('codename', flat=True))
+
+    def test_resync_without_changes_only_reads(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(sync_group_permissions(), (0, 0))
+
+        # Groups, permissions and memberships are each read once; nothing is written
+        self.assertEqual(len(queries), 3)
+
+    def test_only_differences_from_the_spec_are_written(self):
+        staff = Group.objects.get(name='StaffAdmin')
+        staff.permissions.add(Permission.objects.get(codename='delete_skill'))
+        staff.permissions.remove(Permission.objects.get(codename='view_learninggoal'))
+        Group.objects.filter(name='SuperAdmin').delete()
+
+        added, removed = sync_group_permissions(prune=True)
+
+        self.assertEqual(removed, 1)
+        self.assertEqual(added, Permission.objects.count() + 1)
+        self.assertEqual(self.staff_codenames(), {
+            f'{action}_{model}'
+            for model in ('skill', 'learninggoal', 'progressupdate')
+            for action in ('add', 'change', 'view')
+        } | {'view_categorystat', 'view_difficultystat', 'view_leaderboardentry'})
+        self.assertEqual(Group.objects.get(name='SuperAdmin').permissions.count(), Permission.objects.count())
+
+    def test_sync_keeps_permissions_granted_by_hand_unless_pruned(self):
+        staff = Group.objects.get(name='StaffAdmin')
+        staff.permissions.add(Permission.objects.get(codename='delete_skill'))
+
+        # post_migrate runs the same sync
+        call_command('migrate', verbosity=0)
+        self.assertIn('delete_skill', self.staff_codenames())
+
+        out = StringIO()
+        call_command('sync_admin_groups', '--prune', stdout=out)
+        self.assertNotIn('delete_skill', self.staff_codenames())
+        self.assertIn("removed 1", out.getvalue())
+
+
+class TestUserProvisioning(TestCase):
+    def write_file(self, suffix, content):
+        handle = tempfile.NamedTemporaryFile('w', suffix=suffix, delete=False, encoding='utf-8')
+        with handle:
+            handle.write(content)
+        self.addCleanup(os.remove, handle.name)
+        return handle.name
+
+    def test_bulk_state_matches_the_signal_handlers(self):
+        # Reference users created one by one, through the post_save handlers
+        UserModel.objects.create_user(username="SignalUser", password="12Test34")
+        UserModel.objects.create_user(username="SignalStaff", password="12Test34", is_staff=True)
+        UserModel.objects.create_superuser(username="SignalAdmin", password="12Test34")
+
+        records = [
+            {'username': "BulkUser", 'email': "bulk@TEST.com", 'password': "12Test34"},
+            {'username': "BulkStaff", 'password': "12Test34", 'is_staff': True},
+            {'username': "BulkAdmin", 'password': "12Test34", 'is_staff': True, 'is_superuser': True},
+            {'username': "SignalUser", 'password': "12Test34"},
+            {'username': "", 'password': "12Test34"},
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            result = provision_users(records, batch_size=10)
+
+        self.assertEqual((result.created, result.skipped), (3, 2))
+        # Group lookup, then per batch: existing usernames, users, profiles and memberships
+        self.assertLessEqual(len(queries), 7)
+        for prefix in ("Signal", "Bulk"):
+            state = {
+                user.username.removeprefix(prefix): (
+                    Profile.objects.filter(user=user).exists(),
+                    list(user.groups.values_list('name', flat=True)),
+                )
+                for user in UserModel.objects.filter(username__startswith=prefix)
+            }
+            self.assertEqual(state, {
+                'User': (True, []),
+                'Staff': (True, ['StaffAdmin']),
+                'Admin': (True, ['SuperAdmin']),
+            })
+        user = UserModel.objects.get(username="BulkUser")
+        self.assertTrue(user.check_password("12Test34"))
+        self.assertEqual(user.email, "bulk@test.com")
+
+    def test_command_hashes_passwords_in_worker_processes(self):
+        path = self.write_file('.csv', "username,email,password,is_staff\nCsvOne,one@test.com,12Test34,\nCsvTwo,,12Test34,yes\n")
+        output = StringIO()
+
+        call_command('provision_users', path, '--workers', '2', '--batch-size', '1', stdout=output)
+
+        self.assertIn("Created 2 user(s)", output.getvalue())
+        self.assertTrue(UserModel.objects.get(username="CsvOne").check_password("12Test34"))
+        self.assertEqual(list(UserModel.objects.get(username="CsvTwo").groups.values_list('name', flat=True)), ['StaffAdmin'])
+
+
+class TestSearch(TestCase):
+    def setUp(self):
+        self.user = UserModel.objects.create_user(
+            username="SearchUser",
+            email="search@test.com",
+            password="12Test34"
+        )
+        self.python = Skill.objects.create(
+            name="Python", description="Scripting and automation", category="Programming", difficulty="Medium",
+            owner=self.user,
+        )
+        self.cooking = Skill.objects.create(
+            name="Cooking", description="Pythonesque kitchen experiments", category="Life", difficulty="Easy",
+            owner=self.user,
+        )
+        self.goal = LearningGoal.objects.create(
+            skill=self.cooking, name="Bake bread", description="Sourdough with a python timer",
+            target_date=datetime.date.today(),
+        )
+        self.resource = Resource.objects.create(title="Python tutorial", link="https://example.com", skill=self.python)
+        other = UserModel.objects.create_user(username="OtherSearchUser", password="12Test34")
+        Skill.objects.create(name="Python", description="Not yours", category="Programming", difficulty="Easy", owner=other)
+
+    def test_prefix_matches_are_ranked_and_scoped_to_the_owner(self):
+        hits = search(self.user, "pyth")
+
+        found = [(hit.kind, hit.object_id) for hit in hits]
+        self.assertEqual(set(found), {
+            ('skill', self.python.pk), ('skill', self.cooking.pk), ('goal', self.goal.pk), ('resource', self.resource.pk),
+        })
+        # A match in the name outranks one in the description
+        self.assertLess(found.index(('skill', self.python.pk)), found.index(('skill', self.cooking.pk)))
+        self.assertEqual(search(self.user, "python tutorial")[0].object_id, self.resource.pk)
+        self.assertEqual(search(self.user, "  !!  "), [])
+
+    def test_index_follows_writes(self):
+        self.goal.name = "Knead dough"
+        self.goal.description = "No snakes involved"
+        self.goal.save()
+        # Updates that do not touch searchable columns keep the indexed text
+        LearningGoal.objects.filter(pk=self.goal.pk).add_progress(10)
+
+        self.assertEqual([hit.object_id for hit in search(self.user, "knead")], [self.goal.pk])
+        self.assertNotIn(self.goal.pk, [hit.object_id for hit in search(self.user, "python") if hit.kind == 'goal'])
+
+        self.resource.delete()
+        self.assertEqual([hit.kind for hit in search(self.user, "tutorial")], [])
+
+    def test_search_page_and_admin_use_the_index(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('search'), {'q': "bread"})
+        self.assertContains(response, reverse('goal-updates', args=[self.goal.pk]))
+
+        admin_user = UserModel.objects.create_superuser(username="SearchAdmin", email="a@test.com", password="12Test34")
+        self.client.force_login(admin_user)
+        response = self.client.get(reverse('admin:tracker_skill_changelist'), {'q': "automat"})
+        self.assertEqual(list(response.context['cl'].result_list), [self.python])
+
+
+class TestProgressAnalytics(TestCase):
+    def setUp(self):
+        self.user = UserModel.objects.create_user(
+            username="AnalyticsUser",
+            email="analytics@test.com",
+            password="12Test34"
+        )
+        self.skill = Skill.objects.create(name="Running", category="Sport", difficulty="Easy", owner=self.user)
+        self.goal = LearningGoal.objects.create(
+            skill=self.skill, name="5k", description="Run 5k", target_date=datetime.date.today(),
+        )
+        self.client.force_login(self.user)
+
+    def log(self, days_ago, progress=5):
+        moment = timezone.now() - datetime.timedelta(days=days_ago)
+        return ProgressUpdate.objects.create(goal=self.goal, progress=progress, update_text="Run", date=moment)
+
+    def rollup(self):
+        return sorted(ProgressDaily.objects.values_list('user_id', 'skill_id', 'goal_id', 'day', 'update_count', 'progress_total'))
+
+    def test_writes_keep_the_rollup_in_step_with_a_rebuild(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(2):
+                self.client.post(f"{reverse('progress-form')}?goal_id={self.goal.id}", {'progress': 10, 'update_text': "Run"})
+        old = self.log(days_ago=3)
+        self.log(days_ago=3, progress=7)
+        old.delete()
+
+        today = timezone.localdate()
+        self.assertEqual(self.rollup(), sorted([
+            (self.user.pk, self.skill.pk, self.goal.pk, today, 2, 20),
+            (self.user.pk, self.skill.pk, self.goal.pk, today - datetime.timedelta(days=3), 1, 7),
+        ]))
+        maintained = self.rollup()
+        rebuild_progress_daily()
+        self.assertEqual(self.rollup(), maintained)
+
+    def test_moving_an_update_recounts_the_goal_and_day_it_left(self):
+        other_goal = LearningGoal.objects.create(
+            skill=self.skill, name="10k", description="Run 10k", target_date=datetime.date.today(),
+        )
+        update = self.log(days_ago=3, progress=7)
+        self.log(days_ago=3, progress=2)
+
+        update.goal = other_goal
+        update.date = timezone.now() - datetime.timedelta(days=1)
+        update.save()
+
+        today = timezone.localdate()
+        self.assertEqual(self.rollup(), sorted([
+            (self.user.pk, self.skill.pk, self.goal.pk, today - datetime.timedelta(days=3), 1, 2),
+            (self.user.pk, self.skill.pk, other_goal.pk, today - datetime.timedelta(days=1), 1, 7),
+        ]))
+        maintained = self.rollup()
+        rebuild_progress_daily()
+        self.assertEqual(self.rollup(), maintained)
+
+    def test_streaks_and_series_endpoints(self):
+        for days_ago in (1, 2, 3, 6, 7, 8, 9, 20):
+            self.log(days_ago)
+        self.log(days_ago=1)
+
+        streak = self.client.get(reverse('api_v1:analytics-streak')).json()
+        self.assertEqual((streak['current'], streak['longest']), (3, 4))
+
+        daily = self.client.get(reverse('api_v1:analytics-daily'), {'days': 7}).json()['results']
+        self.assertEqual([row['updates'] for row in daily], [1, 1, 1, 2])
+        self.assertEqual(daily[-1]['progress'], 10)
+
+        weekly = self.client.get(reverse('api_v1:analytics-weekly'), {'weeks': 52, 'skill': self.skill.pk}).json()['results']
+        self.assertEqual(sum(row['updates'] for row in weekly), 9)
+        self.assertEqual(self.client.get(reverse('api_v1:analytics-weekly'), {'skill': 'x'}).status_code, 400)
+
+
+class TestStatsSnapshots(TestCase):
+    def setUp(self):
+        self.users = [
+            UserModel.objects.create_user(username=f"StatsUser{i}", email=f"stats{i}@test.com", password="12Test34")
+            for i in range(3)
+        ]
+        # (owner, category, difficulty, goal progress)
+        for owner, category, difficulty, progress in [
+            (0, "Music", "Easy", [100, 100]),
+            (1, "Music", "Hard", [100, 20]),
+            (1, "Sport", "Easy", [40]),
+            (2, "Music", "Easy", []),
+        ]:
+            skill = Skill.objects.create(
+                name=f"{category} {difficulty}", category=category, difficulty=difficulty, owner=self.users[owner],
+            )
+            for value in progress:
+                LearningGoal.objects.create(
+                    skill=skill, name="Goal", description="Goal", target_date=datetime.date.today(), progress=value,
+                )
+
+    def test_refresh_builds_the_snapshots(self):
+        self.assertEqual(refresh_stats(), {'categories': 2, 'difficulties': 2, 'leaderboard': 2})
+
+        self.assertEqual(
+            list(CategoryStat.objects.order_by('-skill_count').values_list(
+                'category', 'skill_count', 'learner_count', 'goal_count', 'completed_goal_count',
+            )),
+            [("Music", 3, 3, 4, 3), ("Sport", 1, 1, 1, 0)],
+        )
+        easy = DifficultyStat.objects.get(difficulty="Easy")
+        self.assertEqual((easy.skill_count, easy.goal_count, easy.completed_goal_count), (3, 3, 2))
+        self.assertEqual(easy.avg_progress, 80)
+        self.assertEqual(
+            list(LeaderboardEntry.objects.order_by('rank').values_list('user__username', 'completed_goal_count')),
+            [("StatsUser0", 2), ("StatsUser1", 1)],
+        )
+
+        # A second refresh replaces the snapshot instead of adding to it
+        refresh_stats()
+        self.assertEqual(CategoryStat.objects.count(), 2)
+
+    def test_an_empty_snapshot_is_fresh_after_a_refresh(self):
+        Skill.objects.all().delete()
+        self.assertIsNotNone(refresh_stats_if_stale())
+        self.assertFalse(DifficultyStat.objects.exists())
+        self.assertIsNone(refresh_stats_if_stale())
+
+    def test_stats_page_reads_the_snapshot_and_flags_stale_data(self):
+        self.client.force_login(self.users[0])
+        self.assertContains(self.client.get(reverse('stats')), "Not computed yet.")
+
+        refresh_stats(now=timezone.now() - datetime.timedelta(seconds=settings.STATS_MAX_AGE + 60))
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('stats'))
+        self.assertContains(response, "StatsUser0")
+        self.assertContains(response, "Out of date")
+        # Session, user, the marker row and the three snapshot tables
+        self.assertEqual(len(queries), 6)
+
+        out = StringIO()
+        call_command('refresh_stats', '--if-stale', stdout=out)
+        self.assertIn("Refreshed stats: 2 categories, 2 difficulty levels, 2 leaderboard entries.", out.getvalue())
+        call_command('refresh_stats', '--if-stale', stdout=out)
+        self.assertIn("fresh, nothing to do", out.getvalue())
+        self.assertNotContains(self.client.get(reverse('stats')), "Out of date")
+
+
+class TestCacheTier(TestCase):
+    def setUp(self):
+        self.user = UserModel.objects.create_user(username="CacheUser", email="cache@test.com", password="12Test34")
+        Skill.objects.create(name="Chess", category="Games", difficulty="Hard", owner=self.user)
+
+    def warm_queries(self, url):
+        # Queries of a repeated request, once the first one has filled the cache. A new client
+        # loads the middleware again, so the session engine of the current settings is used.
+        self.client = self.client_class()
+        self.client.force_login(self.user)
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        return len(queries)
+
+    def test_cached_sessions_and_user_save_reads_on_login_required_views(self):
+        for route in ('dashboard', 'skill-list', 'profile'):
+            with self.subTest(route=route):
+                cache.clear()
+                with self.settings(
+                    SESSION_ENGINE='django.contrib.sessions.backends.db',
+                    AUTHENTICATION_BACKENDS=['django.contrib.auth.backends.ModelBackend'],
+                ):
+                    uncached = self.warm_queries(reverse(route))
+                cached = self.warm_queries(reverse(route))
+                # The session row and the auth_user row
+                self.assertEqual(uncached - cached, 2)
+
+    def test_saving_the_user_evicts_the_cached_row(self):
+        self.client.force_login(self.user)
+        self.client.get(reverse('dashboard'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.first_name = "Renamed"
+            self.user.save()
+        self.assertContains(self.client.get(reverse('dashboard')), "Welcome, Renamed!")
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(reverse('dashboard')).status_code, 302)
+
+    def test_sessions_from_the_model_backend_stay_logged_in(self):
+        # Sessions created before the cache tier recorded ModelBackend as their backend
+        self.client.force_login(self.user, backend='django.contrib.auth.backends.ModelBackend')
+        self.assertContains(self.client.get(reverse('dashboard')), "Welcome, CacheUser!")
+
+
+@skipUnless(connection.vendor == 'postgresql', "Connection reuse is configured for PostgreSQL only")
+class TestDatabaseConnections(TestCase):
+    def test_stats_report_reuse_settings_and_server_connections(self):
+        out = StringIO()
+        call_command('db_pool_stats', '--json', stdout=out)
+        report = json.loads(out.getvalue())
+
+        self.assertEqual(report['settings']['conn_max_age'], settings.DATABASES['default']['CONN_MAX_AGE'])
+        self.assertTrue(report['settings']['conn_health_checks'] or report['pool'] is not None)
+        # At least this test's own connection is open
+        self.assertGreaterEqual(report['server']['total'], 1)
+        self.assertLessEqual(report['server']['total'], report['server']['max_connections'])
+
+    @skipUnless(settings.DATABASES['default']['OPTIONS'].get('pool'), "Set DB_POOL=True to test the connection pool")
+    def test_pool_stays_within_its_bounds(self):
+        pool_options = settings.DATABASES['default']['OPTIONS']['pool']
+        stats = pool_stats()
+        self.assertEqual((stats['pool_min'], stats['pool_max']), (pool_options['min_size'], pool_options['max_size']))
+        self.assertLessEqual(stats['pool_size'], pool_options['max_size'])
+
+
+class TestQueryInstrumentation(TestCase):
+    def setUp(self):
+        self.user = UserModel.objects.create_user(username="TimingUser", email="timing@test.com", password="12Test34")
+        Skill.objects.create(name="Go", category="Games", difficulty="Hard", owner=self.user)
+
+    def get_dashboard(self):
+        # The middleware is set up when a client loads the middleware chain
+        self.client = self.client_class()
+        self.client.force_login(self.user)
+        return self.client.get(reverse('dashboard'))
+
+    def test_disabled_by_default(self):
+        self.assertNotIn('Server-Timing', self.get_dashboard())
+
+    @override_settings(QUERY_INSTRUMENTATION=True, QUERY_SLOW_MS=0)
+    def test_server_timing_header_and_slow_query_log(self):
+        cache.clear()
+        with self.assertLogs('tracker.queries.slow') as logs:
+            response = self.get_dashboard()
+
+        self.assertRegex(
+            response['Server-Timing'],
+            r'^db;dur=[\d.]+;desc="(\d+) queries", render;dur=[\d.]+, total;dur=[\d.]+$',
+        )
+        count = int(re.search(r'"(\d+) queries"', response['Server-Timing']).group(1))
+        records = [json.loads(record.getMessage()) for record in logs.records]
+        self.assertEqual(len(records), count)
+        self.assertEqual({record['path'] for record in records}, {reverse('dashboard')})
+        # Statements are logged with placeholders, parameter values stay out of the log
+        self.assertTrue(any('%s' in record['sql'] for record in records))
+        self.assertFalse(any(self.client.session.session_key in record['sql'] for record in records))
+
+    @override_settings(QUERY_INSTRUMENTATION=True, QUERY_SLOW_MS=0)
+    def test_queries_of_a_streamed_body_are_logged_after_it_is_sent(self):
+        self.client = self.client_class()
+        self.client.force_login(self.user)
+        cache.clear()
+        with self.assertLogs('tracker.queries.slow') as logs:
+            response = self.client.get(reverse('export'))
+            # The header only counts the queries run before the body starts
+            header_count = int(re.search(r'"(\d+) queries"', response['Server-Timing']).group(1))
+            self.assertEqual(logs.records, [])
+            with zipfile.ZipFile(BytesIO(b''.join(response.streaming_content))) as archive:
+                self.assertIn('skills.jsonl', archive.namelist())
+
+        sql = [json.loads(record.getMessage())['sql'] for record in logs.records]
+        self.assertGreater(len(sql), header_count)
+        self.assertTrue(any('tracker_skill' in statement for statement in sql))
+
+    def test_duplicate_shapes_ignore_in_list_length(self):
+        recorder = QueryRecorder(slow_seconds=60)
+        with connection.execute_wrapper(recorder):
+            for ids in ([1], [1, 2], [1, 2, 3]):
+                list(Skill.objects.filter(pk__in=ids))
+            Skill.objects.count()
+
+        self.assertEqual(recorder.count, 4)
+        [(shape, count)] = recorder.duplicate_shapes(threshold=2)
+        self.assertEqual(count, 3)
+        self.assertIn('IN (...)', shape)
+
+
+class TestRequestProfiling(TestCase):
+    def setUp(self):
+        self.profile_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.profile_dir, ignore_errors=True)
+        overrides = self.settings(PROFILING_ENABLED=True, PROFILING_DIR=self.profile_dir, PROFILING_SAMPLE_INTERVAL=0.001)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+        self.staff = UserModel.objects.create_user(
+            username="ProfilerStaff", email="profiler@test.com", password="12Test34", is_staff=True,
+        )
+        self.member = UserModel.objects.create_user(username="ProfilerMember", email="member@test.com", password="12Test34")
+
+    def get(self, user, url, headers=None):
+        # A new client loads the middleware with the overridden settings
+        self.client = self.client_class()
+        self.client.force_login(user)
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.get(url, headers=headers)
+
+    def test_staff_request_is_profiled_without_touching_the_view(self):
+        response = self.get(self.staff, f"{reverse('dashboard')}?__profile=1")
+        record = RequestProfile.objects.get(pk=response['X-Profile-Id'])
+        self.assertEqual((record.view_name, record.status_code, record.format), ('dashboard', 200, 'collapsed'))
+        with record.file.open('rb') as handle:
+            lines = handle.read().decode().splitlines()
+        self.assertEqual(sum(int(line.rsplit(' ', 1)[1]) for line in lines), record.sample_count)
+
+        response = self.get(self.staff, reverse('profile'), headers={'X-Profile': 'pstats'})
+        record = RequestProfile.objects.get(pk=response['X-Profile-Id'])
+        stats = pstats.Stats(os.path.join(self.profile_dir, record.file.name))
+        self.assertTrue(any(function == 'get_context_data' for _, _, function in stats.stats))
+
+        self.client.force_login(UserModel.objects.create_superuser("ProfilerAdmin", "admin@test.com", "12Test34"))
+        download = self.client.get(reverse('admin:tracker_requestprofile_download', args=[record.pk]))
+        with record.file.open('rb') as handle:
+            self.assertEqual(b''.join(download.streaming_content), handle.read())
+
+    def test_only_staff_can_ask_for_a_profile(self):
+        response = self.get(self.member, f"{reverse('dashboard')}?__profile=1")
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertFalse(RequestProfile.objects.exists())
+
+    def test_retention_removes_old_rows_and_files(self):
+        for _ in range(3):
+            self.get(self.staff, f"{reverse('skill-list')}?__profile=1")
+        paths = [record.file.path for record in RequestProfile.objects.order_by('created_at', 'id')]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(prune_profiles(max_records=2), 1)
+        self.assertEqual(RequestProfile.objects.count(), 2)
+        self.assertEqual([os.path.exists(path) for path in paths], [False, True, True])
+
+
+class TestStaticAndMediaDelivery(TestCase):
+    def setUp(self):
+        self.static_root = tempfile.mkdtemp()
+        self.media_root = tempfile.mkdtemp()
+        for directory in (self.static_root, self.media_root):
+            self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        overrides = self.settings(STATIC_ROOT=self.static_root, MEDIA_ROOT=self.media_root)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def test_collected_static_files_are_hashed_precompressed_and_cached_forever(self):
+        call_command('collectstatic', interactive=False, verbosity=0)
+        url = staticfiles_storage.url('tracker/css/styles.css')
+        self.assertRegex(url, r'/static/tracker/css/styles\.[0-9a-f]{12}\.css$')
+        with open(settings.BASE_DIR / 'tracker/static/tracker/css/styles.css', 'rb') as source:
+            original = source.read()
+
+        response = self.client.get(url, headers={'Accept-Encoding': 'gzip, deflate'})
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), original)
+
+        plain = self.client.get(url, headers={'Accept-Encoding': 'gzip;q=0'})
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertEqual(b''.join(plain.streaming_content), original)
+
+        revalidated = self.client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': response['ETag']})
+        self.assertEqual(revalidated.status_code, 304)
+
+    def write_avatar(self):
+        name = f"avatars/ab/ab{'0' * 62}.webp"
+        os.makedirs(os.path.join(self.media_root, 'avatars/ab'))
+        with open(os.path.join(self.media_root, name), 'wb') as avatar:
+            avatar.write(bytes(range(256)) * 4)
+        return f"{settings.MEDIA_URL}{name}"
+
+    def test_media_supports_conditional_and_range_requests(self):
+        url = self.write_avatar()
+        content = bytes(range(256)) * 4
+
+        response = self.client.get(url)
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assertEqual(b''.join(response.streaming_content), content)
+
+        partial = self.client.get(url, headers={'Range': 'bytes=10-19'})
+        self.assertEqual((partial.status_code, partial['Content-Range']), (206, 'bytes 10-19/1024'))
+        self.assertEqual(b''.join(partial.streaming_content), content[10:20])
+        suffix = self.client.get(url, headers={'Range': 'bytes=-5'})
+        self.assertEqual(b''.join(suffix.streaming_content), content[-5:])
+        stale = self.client.get(url, headers={'Range': 'bytes=0-9', 'If-Range': '"outdated"'})
+        self.assertEqual(stale.status_code, 200)
+        self.assertEqual(self.client.get(url, headers={'Range': 'bytes=4096-'}).status_code, 416)
+
+        self.assertEqual(self.client.get(url, headers={'If-Modified-Since': response['Last-Modified']}).status_code, 304)
+        self.assertEqual(self.client.get(f"{settings.MEDIA_URL}../manage.py").status_code, 404)
+
+    def test_media_can_be_handed_to_the_front_proxy(self):
+        url = self.write_avatar()
+        with self.settings(MEDIA_ACCEL='x-accel-redirect'):
+            response = self.client.get(url)
+        self.assertEqual(response['X-Accel-Redirect'], f"/protected-media/avatars/ab/ab{'0' * 62}.webp")
+        self.assertEqual(response.content, b'')
+
@@ -1,36 +1,109 @@
 from django.contrib import admin
-from .models import Skill, LearningGoal, ProgressUpdate, Profile, Resource
+from .models import (Skill, LearningGoal, ProgressUpdate, Profile, Resource,
+                     CategoryStat, DifficultyStat, LeaderboardEntry, RequestProfile)
+from .services.search import search_filter
+from .services.stats import refresh_stats
 from django.contrib.auth.models import User, Group
 from django.core.exceptions import ValidationError
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django import forms
+from django.conf import settings
+from django.http import FileResponse, Http404
+from django.urls import path, reverse
+from django.utils.html import format_html
+from django.utils import timezone
 
 
+class FullTextSearchMixin:
+    # Admin search goes through the full-text index instead of icontains over search_fields
+    search_kind = None
+
+    def get_search_results(self, request, queryset, search_term):
+        return search_filter(queryset, self.search_kind, search_term), False
+
 # Register your models here.
 @admin.register(Skill)
-class SkillAdmin(admin.ModelAdmin):
+class SkillAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ('name', 'owner', 'category', 'difficulty')
     list_filter = ('category', 'difficulty')
-    search_fields = ('name', 'description')
+    search_fields = ('name', 'description', 'category')
+    search_kind = 'skill'
     ordering = ('name',)
     readonly_fields = ('created_at',)
 
 @admin.register(LearningGoal)
-class GoalAdmin(admin.ModelAdmin):
+class GoalAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ('skill', 'target_date', 'progress')
     list_filter = ('target_date',)
+    search_fields = ('name', 'description')
+    search_kind = 'goal'
     ordering = ('target_date',)
 
+class LinkHealthFilter(admin.SimpleListFilter):
+    title = 'link health'
+    parameter_name = 'link_health'
+
+    def lookups(self, request, model_admin):
+        return Resource.LINK_STATUS_CHOICES + [('unchecked', 'Not checked yet'), ('stale', 'Check is out of date')]
+
+    def queryset(self, request, queryset):
+        if self.value() == 'unchecked':
+            return queryset.filter(link_checked_at__isnull=True)
+        if self.value() == 'stale':
+            cutoff = timezone.now() - timezone.timedelta(seconds=settings.LINK_CHECK_MAX_AGE)
+            return queryset.filter(link_checked_at__lt=cutoff)
+        if self.value():
+            return queryset.filter(link_status=self.value())
+        return queryset
+
+class PendingModerationFilter(admin.SimpleListFilter):
+    title = 'moderation'
+    parameter_name = 'moderation'
+
+    def lookups(self, request, model_admin):
+        return [('pending', 'Pending'), ('done', 'Moderated')]
+
+    def queryset(self, request, queryset):
+        if self.value() == 'pending':
+            return queryset.pending()
+        if self.value() == 'done':
+            return queryset.filter(moderated_at__isnull=False)
+        return queryset
+
+@admin.action(description="Approve selected")
+def approve_selected(modeladmin, request, queryset):
+    # One UPDATE for the whole selection instead of a save per object
+    updated = queryset.moderate(approve=True)
+    modeladmin.message_user(request, f"Approved {updated} item(s).")
+
+@admin.action(description="Reject selected")
+def reject_selected(modeladmin, request, queryset):
+    updated = queryset.moderate(approve=False)
+    modeladmin.message_user(request, f"Rejected {updated} item(s).")
+
 @admin.register(Resource)
-class ResourceAdmin(admin.ModelAdmin):
-    list_display = ('title', 'skill', 'approved', 'added_by')
-    list_filter = ('approved',)
-    readonly_fields = ('added_by',)
-    fields = ('title', 'skill', 'link', 'approved', 'added_by')
+class ResourceAdmin(FullTextSearchMixin, admin.ModelAdmin):
+    list_display = ('title', 'skill', 'approved', 'added_by', 'link_status', 'link_status_code', 'link_checked_at')
+    list_filter = (PendingModerationFilter, 'approved', LinkHealthFilter)
+    list_select_related = ('skill', 'added_by')
+    actions = (approve_selected, reject_selected)
+    search_fields = ('title',)
+    search_kind = 'resource'
+    readonly_fields = ('added_by', 'link_status', 'link_status_code', 'link_final_url', 'link_error', 'link_checked_at')
+    fields = (
+        'title', 'skill', 'link', 'approved', 'added_by',
+        'link_status', 'link_status_code', 'link_final_url', 'link_error', 'link_checked_at',
+    )
 
     def save_model(self, request, obj, form, change):
         if not obj.added_by:
             obj.added_by = request.user
+        if 'approved' in form.changed_data:
+            obj.moderated_at = timezone.now()
+        if 'link' in form.changed_data:
+            # A new link has to be checked again
+            obj.link_status, obj.link_status_code, obj.link_checked_at = '', None, None
+            obj.link_final_url, obj.link_error = '', ''
         super().save_model(request, obj, form, change)
 
     def get_readonly_fields(self, request, obj=None):
@@ -39,9 +112,94 @@ class ResourceAdmin(admin.ModelAdmin):
             return self.readonly_fields + ('added_by',)
         return self.readonly_fields
 
-admin.site.register(Profile)
+@admin.register(Profile)
+class ProfileAdmin(admin.ModelAdmin):
+    list_display = ('user', 'is_approved', 'moderated_at')
+    list_filter = (PendingModerationFilter, 'is_approved')
+    list_select_related = ('user',)
+    search_fields = ('user__username',)
+    readonly_fields = ('moderated_at',)
+    actions = (approve_selected, reject_selected)
+
+    def save_model(self, request, obj, form, change):
+        if 'is_approved' in form.changed_data:
+            obj.moderated_at = timezone.now()
+        super().save_model(request, obj, form, change)
+
 admin.site.register(ProgressUpdate)
 
+@admin.action(description="Refresh all stats snapshots")
+def refresh_snapshots(modeladmin, request, queryset):
+    # Rebuilds every snapshot table, whatever rows are selected
+    counts = refresh_stats()
+    modeladmin.message_user(request, f"Refreshed {sum(counts.values())} snapshot row(s).")
+
+class SnapshotAdmin(admin.ModelAdmin):
+    # Snapshot rows are written by refresh_stats only
+    actions = (refresh_snapshots,)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        if not request.user.is_superuser:
+            actions.pop('refresh_snapshots', None)
+        return actions
+
+@admin.register(CategoryStat)
+class CategoryStatAdmin(SnapshotAdmin):
+    list_display = ('category', 'skill_count', 'learner_count', 'goal_count', 'completed_goal_count', 'refreshed_at')
+    ordering = ('-skill_count', 'category')
+
+@admin.register(DifficultyStat)
+class DifficultyStatAdmin(SnapshotAdmin):
+    list_display = ('difficulty', 'skill_count', 'goal_count', 'completed_goal_count', 'avg_progress', 'refreshed_at')
+    ordering = ('difficulty',)
+
+@admin.register(LeaderboardEntry)
+class LeaderboardEntryAdmin(SnapshotAdmin):
+    list_display = ('rank', 'user', 'completed_goal_count', 'avg_progress', 'refreshed_at')
+    list_select_related = ('user',)
+    ordering = ('rank',)
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    # Written by RequestProfilingMiddleware; the admin lists, downloads and deletes them
+    list_display = ('created_at', 'method', 'path', 'view_name', 'status_code', 'user', 'format', 'duration_ms', 'sample_count', 'download')
+    list_filter = ('format', 'view_name')
+    list_select_related = ('user',)
+    search_fields = ('path', 'view_name', 'user__username')
+    date_hierarchy = 'created_at'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description="File")
+    def download(self, obj):
+        url = reverse('admin:tracker_requestprofile_download', args=[obj.pk])
+        return format_html('<a href="{}">{}</a>', url, obj.file.name)
+
+    def get_urls(self):
+        return [
+            path('<int:pk>/download/', self.admin_site.admin_view(self.download_view), name='tracker_requestprofile_download'),
+        ] + super().get_urls()
+
+    def download_view(self, request, pk):
+        profile = self.get_object(request, str(pk))
+        if profile is None or not self.has_view_permission(request, profile):
+            raise Http404
+        return FileResponse(profile.file.open('rb'), as_attachment=True, filename=profile.file.name)
+
 class CustomUserChangeForm(forms.ModelForm):
     class Meta:
         model = User
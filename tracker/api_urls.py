@@ -0,0 +1,15 @@
+from django.urls import path
+from tracker.views import api_views
+
+app_name = 'api_v1'
+
+urlpatterns = [
+    path('summary/', api_views.SummaryApiView.as_view(), name='summary'),
+    path('skills/', api_views.SkillListApiView.as_view(), name='skills'),
+    path('skills/<int:pk>/', api_views.SkillDetailApiView.as_view(), name='skill-detail'),
+    path('goals/', api_views.GoalListApiView.as_view(), name='goals'),
+    path('goals/<int:pk>/progress/', api_views.GoalProgressApiView.as_view(), name='goal-progress'),
+    path('analytics/daily/', api_views.DailyProgressApiView.as_view(), name='analytics-daily'),
+    path('analytics/weekly/', api_views.WeeklyVelocityApiView.as_view(), name='analytics-weekly'),
+    path('analytics/streak/', api_views.StreakApiView.as_view(), name='analytics-streak'),
+]
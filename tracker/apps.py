@@ -6,4 +6,8 @@ class TrackerConfig(AppConfig):
     name = 'tracker'
 
     def ready(self):
-        import tracker.signals
\ No newline at end of file
+        from django.db.models.signals import post_migrate
+
+        import tracker.signals
+
+        post_migrate.connect(tracker.signals.create_admin_groups, sender=self, dispatch_uid='tracker.create_admin_groups')
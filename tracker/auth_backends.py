@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db import transaction
+
+
+def user_cache_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def evict_cached_user(user_id):
+    # Evicted now and again after commit, so a request running in between cannot keep the old row cached
+    cache.delete(user_cache_key(user_id))
+    transaction.on_commit(lambda: cache.delete(user_cache_key(user_id)))
+
+
+class CachedModelBackend(ModelBackend):
+    # Loads the session user from the cache, so authenticated requests skip the auth_user query
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+        return user
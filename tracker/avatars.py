@@ -0,0 +1,223 @@
+import atexit
+import logging
+import os
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+from django.db import connections
+from django.db.models import Count
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# Pre-sized variants, by the width/height they are displayed at
+AVATAR_SIZES = {
+    'sm': 64,
+    'md': 150,
+    'lg': 300,
+}
+AVATAR_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 85, 'optimize': True, 'progressive': True}),
+}
+ALLOWED_FORMATS = {'JPEG', 'PNG', 'WEBP', 'GIF'}
+AVATAR_DIR = 'avatars'
+VARIANT_DIR = 'avatars/variants'
+# Files younger than this are never garbage-collected, so uploads that are not committed yet survive
+ORPHAN_MIN_AGE = 60 * 60
+
+_executor = None
+
+
+class AvatarSizeLimitHandler(FileUploadHandler):
+    # Stops reading an avatar upload as soon as it passes the size cap, instead of spooling the whole file
+    def __init__(self, request=None, limit=None):
+        super().__init__(request)
+        self.limit = limit or settings.AVATAR_MAX_UPLOAD_SIZE
+        self.received = 0
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > self.limit:
+            self.request.rejected_uploads = getattr(self.request, 'rejected_uploads', set()) | {self.field_name}
+            raise SkipFile()
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
+
+
+def read_image_header(file):
+    # Image.open only parses the header, so this does not decode the pixel data
+    position = file.tell()
+    try:
+        with Image.open(file) as image:
+            return image.format, image.size
+    finally:
+        file.seek(position)
+
+
+def variant_name(original_name, size_key, extension):
+    stem = os.path.splitext(os.path.basename(original_name))[0]
+    return f'{VARIANT_DIR}/{stem}_{size_key}.{extension}'
+
+
+def variant_names(original_name):
+    return [
+        variant_name(original_name, size_key, extension)
+        for size_key in AVATAR_SIZES
+        for extension in AVATAR_FORMATS
+    ]
+
+
+def render_variants(image_file, original_name):
+    # {size key: {format key: (storage name, encoded bytes)}}
+    with Image.open(image_file) as image:
+        # Lets JPEG decode straight at a reduced scale instead of at full resolution
+        largest = max(AVATAR_SIZES.values())
+        image.draft('RGB', (largest * 2, largest * 2))
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+
+        rendered = {}
+        for size_key, size in sorted(AVATAR_SIZES.items(), key=lambda item: -item[1]):
+            variant = ImageOps.fit(image, (size, size), method=Image.Resampling.LANCZOS)
+            rendered[size_key] = {}
+            for format_key, (pil_format, options) in AVATAR_FORMATS.items():
+                output = BytesIO()
+                frame = variant.convert('RGB') if pil_format == 'JPEG' else variant
+                frame.save(output, pil_format, **options)
+                rendered[size_key][format_key] = (variant_name(original_name, size_key, format_key), output.getvalue())
+        return rendered
+
+
+def generate_avatar_variants(profile_id):
+    from tracker.models import Profile
+
+    profile = Profile.objects.filter(pk=profile_id).first()
+    if profile is None or not profile.avatar:
+        return {}
+
+    storage = profile.avatar.storage
+    with profile.avatar.open('rb') as source:
+        rendered = render_variants(source, profile.avatar.name)
+
+    variants = {}
+    for size_key, formats in rendered.items():
+        variants[size_key] = {}
+        for format_key, (name, content) in formats.items():
+            if storage.exists(name):
+                storage.delete(name)
+            variants[size_key][format_key] = storage.save(name, ContentFile(content))
+
+    # Only record the variants if the avatar was not replaced while they were rendered
+    Profile.objects.filter(pk=profile_id, avatar=profile.avatar.name).update(avatar_variants=variants)
+    return variants
+
+
+def generate_avatar_variants_in_worker(profile_id):
+    # Entry point for executor threads; errors reach the caller's future
+    try:
+        return generate_avatar_variants(profile_id)
+    finally:
+        # Worker threads own their database connections
+        connections.close_all()
+
+
+def _run_in_worker(profile_id):
+    try:
+        generate_avatar_variants_in_worker(profile_id)
+    except Exception:
+        logger.exception("Could not generate avatar variants for profile %s", profile_id)
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.AVATAR_WORKERS, thread_name_prefix='avatar')
+        atexit.register(_executor.shutdown, wait=False)
+    return _executor
+
+
+def schedule_avatar_variants(profile_id):
+    if settings.AVATAR_PROCESSING_ASYNC:
+        get_executor().submit(_run_in_worker, profile_id)
+    else:
+        generate_avatar_variants(profile_id)
+
+
+def avatar_reference_counts(names=None):
+    # {stored name: number of profiles using it}, computed with one GROUP BY
+    from tracker.models import Profile
+
+    profiles = Profile.objects.exclude(avatar='').exclude(avatar__isnull=True)
+    if names is not None:
+        profiles = profiles.filter(avatar__in=names)
+    return dict(profiles.order_by().values('avatar').annotate(refs=Count('pk')).values_list('avatar', 'refs'))
+
+
+def release_avatars(*names):
+    # Deletes avatars (and their variants) whose reference count dropped to zero
+    from tracker.models import Profile
+
+    names = [name for name in set(names) if name]
+    if not names:
+        return []
+
+    counts = avatar_reference_counts(names)
+    storage = Profile._meta.get_field('avatar').storage
+    released = []
+    for name in names:
+        if counts.get(name):
+            continue
+        for stored in [name] + variant_names(name):
+            if storage.exists(stored):
+                storage.delete(stored)
+        released.append(name)
+    return released
+
+
+def walk_storage(storage, directory):
+    directories, files = storage.listdir(directory)
+    for filename in files:
+        yield posixpath.join(directory, filename)
+    for subdirectory in directories:
+        yield from walk_storage(storage, posixpath.join(directory, subdirectory))
+
+
+def collect_orphaned_avatars(dry_run=False):
+    # Removes stored avatars and variants no profile refers to any more
+    from tracker.models import Profile
+
+    storage = Profile._meta.get_field('avatar').storage
+    if not storage.exists(AVATAR_DIR):
+        return []
+
+    referenced = set(avatar_reference_counts())
+    referenced_stems = {os.path.splitext(os.path.basename(name))[0] for name in referenced}
+    cutoff = timezone.now() - timezone.timedelta(seconds=ORPHAN_MIN_AGE)
+
+    orphans = []
+    for name in walk_storage(storage, AVATAR_DIR):
+        if name.startswith(f'{VARIANT_DIR}/'):
+            stem = os.path.basename(name).rsplit('_', 1)[0]
+            in_use = stem in referenced_stems
+        else:
+            in_use = name in referenced
+        if in_use or storage.get_modified_time(name) > cutoff:
+            continue
+
+        orphans.append(name)
+        if not dry_run:
+            storage.delete(name)
+    return orphans
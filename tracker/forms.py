@@ -1,8 +1,14 @@
+import codecs
+
 from django import forms
+from django.conf import settings
+from django.template.defaultfilters import filesizeformat
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
 
+from tracker.avatars import ALLOWED_FORMATS, read_image_header
 from tracker.models import Skill, LearningGoal, ProgressUpdate, Profile
+from tracker.services.importer import IMPORT_FORMATS
 
 
 class RegisterForm(UserCreationForm):
@@ -54,8 +60,52 @@ class ProfileForm(forms.ModelForm):
         model = Profile
         fields = ['bio', 'avatar']
 
+    def __init__(self, *args, rejected_uploads=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rejected_uploads = rejected_uploads
+
+    def clean_avatar(self):
+        avatar = self.cleaned_data.get('avatar')
+        max_size = settings.AVATAR_MAX_UPLOAD_SIZE
+
+        if 'avatar' in self.rejected_uploads or (avatar and avatar.size > max_size):
+            raise forms.ValidationError(f"Avatar must be smaller than {filesizeformat(max_size)}.")
+
+        if avatar and 'avatar' in self.changed_data:
+            image_format, (width, height) = read_image_header(avatar)
+            if image_format not in ALLOWED_FORMATS:
+                raise forms.ValidationError("Avatar must be a JPEG, PNG, WebP or GIF image.")
+            if max(width, height) > settings.AVATAR_MAX_DIMENSION:
+                raise forms.ValidationError(
+                    f"Avatar must be at most {settings.AVATAR_MAX_DIMENSION}px wide and high."
+                )
+        return avatar
+
     def clean_bio(self):
         bio = self.cleaned_data.get('bio')
         if len(bio) < 10:
             raise forms.ValidationError("Biography must be at least 10 characters long.")
-        return bio
\ No newline at end of file
+        return bio
+
+class ImportForm(forms.Form):
+    file = forms.FileField()
+    format = forms.ChoiceField(
+        choices=[(value, value.upper()) for value in IMPORT_FORMATS],
+    )
+
+    def clean_file(self):
+        upload = self.cleaned_data.get('file')
+        # Checked chunk by chunk before the import starts, so a bad byte near the end of a large
+        # file does not leave the rows before it imported
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        try:
+            for chunk in upload.chunks():
+                decoder.decode(chunk)
+            decoder.decode(b'', final=True)
+        except UnicodeDecodeError as error:
+            raise forms.ValidationError(
+                f"The file must be UTF-8 encoded (invalid byte at position {error.start}); "
+                "re-save it as UTF-8 and upload it again."
+            )
+        upload.seek(0)
+        return upload
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from tracker.query_plans import analyze_tracker_tables, explain_hot_queries, find_sequential_scans, seed_plan_dataset
+
+
+class RollbackSeed(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN the tracker hot-path queries on a seeded dataset and fail on sequential scans."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200, help="Number of seeded users.")
+        parser.add_argument('--skills-per-user', type=int, default=10)
+        parser.add_argument('--goals-per-skill', type=int, default=5)
+        parser.add_argument('--updates-per-goal', type=int, default=10)
+        parser.add_argument('--verbose-plans', action='store_true', help="Print every plan.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("Query plan checks require PostgreSQL.")
+
+        # The seeded rows only live inside this transaction, so nothing is left behind
+        try:
+            with transaction.atomic():
+                owners = seed_plan_dataset(
+                    users=options['users'],
+                    skills_per_user=options['skills_per_user'],
+                    goals_per_skill=options['goals_per_skill'],
+                    updates_per_goal=options['updates_per_goal'],
+                )
+                analyze_tracker_tables()
+                plans = explain_hot_queries(owners[len(owners) // 2])
+                raise RollbackSeed
+        except RollbackSeed:
+            pass
+
+        for name, plan in plans.items():
+            if options['verbose_plans']:
+                self.stdout.write(f"-- {name}\n{plan}\n")
+
+        seq_scans = find_sequential_scans(plans)
+        if seq_scans:
+            details = ', '.join(f"{name} ({', '.join(tables)})" for name, tables in seq_scans.items())
+            raise CommandError(f"Sequential scans in hot queries: {details}")
+
+        self.stdout.write(self.style.SUCCESS(f"All {len(plans)} hot queries use indexes."))
@@ -0,0 +1,40 @@
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from tracker.services.link_checker import LinkChecker, check_resource_links, resources_due
+
+
+class Command(BaseCommand):
+    help = "Check resource links concurrently and store their status, final URL and check time."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-age',
+            type=int,
+            default=None,
+            help="Skip links checked less than this many seconds ago (default: LINK_CHECK_MAX_AGE, 0 rechecks all).",
+        )
+        parser.add_argument('--concurrency', type=int, default=None, help="Links checked at the same time.")
+        parser.add_argument('--per-host', type=int, default=None, help="Connections open to a single host at a time.")
+        parser.add_argument('--timeout', type=float, default=None, help="Seconds to wait for a host to answer.")
+        parser.add_argument('--approved-only', action='store_true', help="Only check approved resources.")
+
+    def handle(self, *args, **options):
+        resources = resources_due(options['max_age'])
+        if options['approved_only']:
+            resources = resources.filter(approved=True)
+
+        checker = LinkChecker(
+            concurrency=options['concurrency'],
+            per_host=options['per_host'],
+            timeout=options['timeout'],
+        )
+        started = time.monotonic()
+        results = check_resource_links(resources, max_age=options['max_age'], checker=checker)
+        elapsed = time.monotonic() - started
+
+        statuses = Counter(result.status for result in results.values())
+        summary = ', '.join(f"{count} {status}" for status, count in sorted(statuses.items())) or "nothing due"
+        self.stdout.write(self.style.SUCCESS(f"Checked {len(results)} link(s) in {elapsed:.1f}s: {summary}."))
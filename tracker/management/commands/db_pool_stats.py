@@ -0,0 +1,39 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from tracker.services.connections import connection_settings, pool_stats, server_connections
+
+
+class Command(BaseCommand):
+    help = "Show the connection reuse settings, the psycopg pool counters and the connections open on the server."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help="Database alias to inspect.")
+        parser.add_argument('--json', action='store_true', help="Print one JSON object, e.g. for monitoring.")
+
+    def handle(self, *args, **options):
+        using = options['database']
+        report = {
+            'settings': connection_settings(using),
+            'pool': pool_stats(using),
+            'server': server_connections(using),
+        }
+        if options['json']:
+            self.stdout.write(json.dumps(report, sort_keys=True))
+            return
+
+        conn = report['settings']
+        self.stdout.write(f"CONN_MAX_AGE: {conn['conn_max_age']}, CONN_HEALTH_CHECKS: {conn['conn_health_checks']}")
+        if report['pool'] is None:
+            self.stdout.write("Pool: disabled")
+        else:
+            self.stdout.write(f"Pool: {conn['pool']}")
+            for name, value in sorted(report['pool'].items()):
+                self.stdout.write(f"  {name}: {value}")
+        if report['server'] is not None:
+            server = report['server']
+            self.stdout.write(f"Server connections: {server['total']} of max_connections {server['max_connections']}")
+            for state, count in server['states'].items():
+                self.stdout.write(f"  {state}: {count}")
@@ -0,0 +1,58 @@
+import os
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+
+from tracker.avatars import AVATAR_DIR, VARIANT_DIR, collect_orphaned_avatars, walk_storage
+from tracker.models import Profile
+from tracker.storage import CONTENT_NAME_RE, content_name, file_digest
+
+
+class Command(BaseCommand):
+    help = "Move existing avatars to content-addressed names, merge duplicates and delete orphaned files."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Report what would change without touching anything.")
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        storage = Profile._meta.get_field('avatar').storage
+        if not storage.exists(AVATAR_DIR):
+            self.stdout.write("No avatars stored.")
+            return
+
+        # Files saved before content addressing, grouped by the hash of their content
+        groups = defaultdict(list)
+        for name in walk_storage(storage, AVATAR_DIR):
+            if name.startswith(f'{VARIANT_DIR}/') or CONTENT_NAME_RE.match(name):
+                continue
+            with storage.open(name, 'rb') as content:
+                groups[(file_digest(content), os.path.splitext(name)[1].lower())].append(name)
+
+        moved = merged = reclaimed = 0
+        for (digest, extension), names in groups.items():
+            target = content_name(AVATAR_DIR, digest, extension)
+            already_stored = storage.exists(target)
+            reclaimed += storage.size(names[0]) * (len(names) if already_stored else len(names) - 1)
+            moved += 1
+            merged += len(names) - 1
+            if dry_run:
+                continue
+
+            if not already_stored:
+                with storage.open(names[0], 'rb') as content:
+                    target = storage.save(f'{AVATAR_DIR}/{os.path.basename(names[0])}', content)
+            # One UPDATE per group; variants are regenerated under the new name
+            Profile.objects.filter(avatar__in=names).update(avatar=target, avatar_variants={})
+            for name in names:
+                storage.delete(name)
+
+        orphans = collect_orphaned_avatars(dry_run=dry_run)
+
+        prefix = "Would move" if dry_run else "Moved"
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix} {moved} avatar(s) to content-addressed names, merging {merged} duplicate(s) "
+            f"({reclaimed} bytes); {len(orphans)} orphaned file(s) {'found' if dry_run else 'deleted'}."
+        ))
+        if not dry_run and moved:
+            self.stdout.write("Run generate_avatar_variants to rebuild variants for the moved avatars.")
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from tracker.avatars import generate_avatar_variants_in_worker, get_executor
+from tracker.models import Profile
+
+
+class Command(BaseCommand):
+    help = "Generate resized WebP/JPEG avatar variants for existing profiles."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="Regenerate variants that already exist.")
+
+    def handle(self, *args, **options):
+        profiles = Profile.objects.exclude(avatar='').exclude(avatar__isnull=True)
+        if not options['all']:
+            profiles = profiles.filter(avatar_variants={})
+
+        profile_ids = list(profiles.values_list('pk', flat=True))
+        futures = {pk: get_executor().submit(generate_avatar_variants_in_worker, pk) for pk in profile_ids}
+
+        failed = 0
+        for profile_id, future in futures.items():
+            try:
+                future.result()
+            except Exception as error:
+                failed += 1
+                self.stderr.write(f"Profile {profile_id}: {error}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated avatar variants for {len(profile_ids) - failed} profile(s); {failed} failed."
+        ))
@@ -0,0 +1,48 @@
+import gzip
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.services.importer import IMPORT_CHUNK_SIZE, IMPORT_FORMATS, import_tracker_data
+
+
+class Command(BaseCommand):
+    help = "Stream skills, goals and progress updates from a JSONL or CSV file into one user's account."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import; .gz files are decompressed on the fly.")
+        parser.add_argument('--user', required=True, help="Username of the owner of the imported data.")
+        parser.add_argument('--format', choices=IMPORT_FORMATS, help="Defaults to the file extension.")
+        parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE, help="Rows per transaction.")
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f"{path} does not exist.")
+
+        try:
+            owner = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['user']!r} does not exist.")
+
+        suffixes = [suffix.lstrip('.') for suffix in path.suffixes]
+        file_format = options['format'] or next((s for s in reversed(suffixes) if s in IMPORT_FORMATS), None)
+        if file_format is None:
+            raise CommandError("Could not detect the file format, pass --format.")
+
+        opener = gzip.open if path.suffix == '.gz' else open
+        try:
+            with opener(path, 'rt', encoding='utf-8', newline='') as stream:
+                result = import_tracker_data(owner, stream, file_format, chunk_size=options['chunk_size'])
+        except UnicodeDecodeError as error:
+            # Chunks committed before the bad byte stay imported
+            raise CommandError(f"{path} is not valid UTF-8 ({error}); rows before the error were imported.")
+
+        for error in result.errors:
+            self.stderr.write(error)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result.skills} skill(s), {result.goals} goal(s) and {result.updates} progress update(s) "
+            f"in {result.elapsed:.1f}s ({result.rows_per_second:,.0f} rows/s); skipped {result.skipped} row(s)."
+        ))
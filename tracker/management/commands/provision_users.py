@@ -0,0 +1,51 @@
+import gzip
+import os
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.services.provisioning import (
+    PROVISION_BATCH_SIZE, PROVISION_FORMATS, ProvisioningError, provision_users_from_stream,
+)
+
+
+class Command(BaseCommand):
+    help = "Create users with their profiles and admin group memberships in batches from a JSONL or CSV file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to read; .gz files are decompressed on the fly.")
+        parser.add_argument('--format', choices=PROVISION_FORMATS, help="Defaults to the file extension.")
+        parser.add_argument('--batch-size', type=int, default=PROVISION_BATCH_SIZE, help="Users per transaction.")
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Processes that hash passwords (0 hashes in this process).",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f"{path} does not exist.")
+
+        suffixes = [suffix.lstrip('.') for suffix in path.suffixes]
+        file_format = options['format'] or next((s for s in reversed(suffixes) if s in PROVISION_FORMATS), None)
+        if file_format is None:
+            raise CommandError("Could not detect the file format, pass --format.")
+
+        opener = gzip.open if path.suffix == '.gz' else open
+        with opener(path, 'rt', encoding='utf-8', newline='') as stream:
+            try:
+                result = provision_users_from_stream(
+                    stream, file_format, batch_size=options['batch_size'], workers=options['workers'],
+                )
+            except ProvisioningError as error:
+                raise CommandError(str(error))
+
+        for error in result.errors:
+            self.stderr.write(error)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {result.created} user(s) in {result.elapsed:.1f}s ({result.users_per_second:,.0f} users/s); "
+            f"skipped {result.skipped}."
+        ))
@@ -0,0 +1,21 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.services.analytics import rebuild_progress_daily
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily progress rollup behind the analytics endpoints from the progress updates."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help="Only rebuild the rollup of this username.")
+
+    def handle(self, *args, **options):
+        user_ids = None
+        if options['user']:
+            user_ids = list(User.objects.filter(username=options['user']).values_list('pk', flat=True))
+            if not user_ids:
+                raise CommandError(f"User {options['user']!r} does not exist.")
+
+        written = rebuild_progress_daily(user_ids=user_ids)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} daily rollup row(s)."))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tracker.models import LearningGoal
+from tracker.services.dashboard import bump_skill_versions, invalidate_dashboard
+
+
+class Command(BaseCommand):
+    help = "Fix drift between LearningGoal.progress and the sum of its progress updates."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Only report how many goals have drifted.",
+        )
+
+    def handle(self, *args, **options):
+        drifted = LearningGoal.objects.drifted()
+
+        if options['dry_run']:
+            self.stdout.write(f"{drifted.count()} goal(s) have drifted.")
+            return
+
+        with transaction.atomic():
+            # Bulk updates bypass the model signals, so affected dashboards are invalidated here
+            affected = list(drifted.values_list('skill_id', 'skill__owner_id').distinct())
+            fixed = LearningGoal.objects.reconcile_progress()
+            invalidate_dashboard(*(owner_id for _, owner_id in affected))
+            bump_skill_versions(*(skill_id for skill_id, _ in affected))
+
+        self.stdout.write(self.style.SUCCESS(f"Reconciled progress for {fixed} goal(s)."))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import pluralize
+
+from tracker.services.stats import refresh_stats, refresh_stats_if_stale
+
+
+class Command(BaseCommand):
+    help = "Rebuild the category, difficulty and leaderboard snapshots behind the stats page."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--if-stale', action='store_true',
+            help="Only rebuild when the snapshot is older than STATS_MAX_AGE (or --max-age).",
+        )
+        parser.add_argument('--max-age', type=int, help="Staleness bound in seconds for --if-stale.")
+
+    def handle(self, *args, **options):
+        if options['if_stale']:
+            counts = refresh_stats_if_stale(max_age=options['max_age'])
+            if counts is None:
+                self.stdout.write("Stats snapshot is fresh, nothing to do.")
+                return
+        else:
+            counts = refresh_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f"Refreshed stats: {counts['categories']} categor{pluralize(counts['categories'], 'y,ies')}, "
+            f"{counts['difficulties']} difficulty level{pluralize(counts['difficulties'])}, "
+            f"{counts['leaderboard']} leaderboard entr{pluralize(counts['leaderboard'], 'y,ies')}."
+        ))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from tracker.permissions import sync_group_permissions
+
+
+class Command(BaseCommand):
+    help = "Create the admin groups and grant the permissions of tracker.permissions.GROUP_PERMISSIONS."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help="Database alias to sync.")
+        parser.add_argument(
+            '--prune', action='store_true',
+            help="Also remove permissions the spec does not list, including ones granted by hand.",
+        )
+
+    def handle(self, *args, **options):
+        added, removed = sync_group_permissions(using=options['database'], prune=options['prune'])
+        self.stdout.write(self.style.SUCCESS(f"Added {added} and removed {removed} group permission(s)."))
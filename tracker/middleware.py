@@ -0,0 +1,153 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from tracker.profiling import PROFILERS, save_profile
+
+logger = logging.getLogger('tracker.queries')
+slow_logger = logging.getLogger('tracker.queries.slow')
+
+# IN lists of different lengths are the same query shape
+IN_LIST_RE = re.compile(r'IN \((?:%s, )*%s\)')
+
+
+def query_shape(sql):
+    return IN_LIST_RE.sub('IN (...)', sql)
+
+
+class QueryRecorder:
+    # execute_wrapper that counts and times every query; per query it only adds to counters,
+    # shapes and logging are worked out once per request
+    def __init__(self, slow_seconds):
+        self.slow_seconds = slow_seconds
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+        self.slow = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.count += 1
+            self.duration += duration
+            self.statements[sql] += 1
+            if duration >= self.slow_seconds:
+                self.slow.append((context['connection'].alias, sql, duration))
+
+    def duplicate_shapes(self, threshold):
+        shapes = Counter()
+        for sql, count in self.statements.items():
+            shapes[query_shape(sql)] += count
+        return [(shape, count) for shape, count in shapes.most_common() if count >= threshold]
+
+
+class QueryInstrumentationMiddleware:
+    # Opt-in (QUERY_INSTRUMENTATION=True): Server-Timing header, N+1 warnings and a slow-query log per request
+    def __init__(self, get_response):
+        if not settings.QUERY_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_seconds = settings.QUERY_SLOW_MS / 1000
+        self.duplicate_threshold = settings.QUERY_DUPLICATE_THRESHOLD
+
+    def __call__(self, request):
+        recorder = QueryRecorder(self.slow_seconds)
+        request._query_recorder = recorder
+        request._render_seconds = 0.0
+        started = time.perf_counter()
+        with self.recording(recorder):
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+
+        # Headers go out before a streamed body, so Server-Timing covers the view only; the queries
+        # run while the body is produced are still recorded and logged once it has been sent
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={recorder.duration * 1000:.1f};desc="{recorder.count} queries"',
+            f'render;dur={request._render_seconds * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ])
+        if response.streaming and not response.is_async:
+            response.streaming_content = self.record_stream(request, recorder, response.streaming_content)
+        else:
+            self.log(request, recorder)
+        return response
+
+    @staticmethod
+    def recording(recorder):
+        stack = ExitStack()
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+        return stack
+
+    def record_stream(self, request, recorder, content):
+        try:
+            with self.recording(recorder):
+                yield from content
+        finally:
+            self.log(request, recorder)
+
+    def process_template_response(self, request, response):
+        # Template rendering runs after the view; its wall time minus the queries it ran is "render"
+        recorder = request._query_recorder
+        started, db_before = time.perf_counter(), recorder.duration
+
+        def rendered(response):
+            request._render_seconds += time.perf_counter() - started - (recorder.duration - db_before)
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    def log(self, request, recorder):
+        for shape, count in recorder.duplicate_shapes(self.duplicate_threshold):
+            logger.warning(
+                "Possible N+1: %s %s ran the same query %d times: %s",
+                request.method, request.path, count, shape,
+            )
+        for alias, sql, duration in recorder.slow:
+            slow_logger.warning(json.dumps({
+                'method': request.method,
+                'path': request.path,
+                'database': alias,
+                'duration_ms': round(duration * 1000, 1),
+                'sql': sql,
+            }))
+
+
+class RequestProfilingMiddleware:
+    # Profiles a single request of a staff user who asks for it with ?__profile=<format> or an
+    # X-Profile: <format> header ("1" picks PROFILING_DEFAULT_FORMAT); the view itself is not touched
+    query_flag = '__profile'
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def requested_format(self, request):
+        flag = request.GET.get(self.query_flag) or request.headers.get('X-Profile')
+        if not flag or not request.user.is_staff:
+            return None
+        return flag if flag in PROFILERS else settings.PROFILING_DEFAULT_FORMAT
+
+    def __call__(self, request):
+        profile_format = self.requested_format(request)
+        if profile_format is None:
+            return self.get_response(request)
+
+        started = time.perf_counter()
+        with PROFILERS[profile_format]() as profiler:
+            response = self.get_response(request)
+        record = save_profile(request, response, profiler, time.perf_counter() - started)
+        response['X-Profile-Id'] = str(record.pk)
+        return response
+
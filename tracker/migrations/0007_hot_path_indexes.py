@@ -0,0 +1,52 @@
+# Generated by Django 5.2.3 on 2026-10-18 18:56
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0006_remove_profile_created_add_skill_created_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # Composite indexes are created before the single-column FK indexes they replace are dropped
+        migrations.AddIndex(
+            model_name='learninggoal',
+            index=models.Index(fields=['skill', 'target_date'], name='goal_skill_target_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='progressupdate',
+            index=models.Index(fields=['goal', 'date', 'id'], name='progress_goal_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resource',
+            index=models.Index(condition=models.Q(('approved', True)), fields=['skill'], name='resource_approved_skill_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['owner', 'created_at', 'id'], name='skill_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['owner', 'name', 'id'], name='skill_owner_name_idx'),
+        ),
+        migrations.AlterField(
+            model_name='learninggoal',
+            name='skill',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='tracker.skill'),
+        ),
+        migrations.AlterField(
+            model_name='progressupdate',
+            name='goal',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='tracker.learninggoal'),
+        ),
+        migrations.AlterField(
+            model_name='skill',
+            name='owner',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.3 on 2026-10-18 18:59
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0007_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='progressupdate',
+            name='date',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
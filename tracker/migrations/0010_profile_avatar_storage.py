@@ -0,0 +1,19 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:08
+
+import tracker.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0009_profile_avatar_variants'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='profile',
+            name='avatar',
+            field=models.ImageField(blank=True, null=True, storage=tracker.storage.get_avatar_storage, upload_to='avatars/'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0010_profile_avatar_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resource',
+            name='link_checked_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='resource',
+            name='link_error',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='resource',
+            name='link_final_url',
+            field=models.URLField(blank=True, editable=False, max_length=2000),
+        ),
+        migrations.AddField(
+            model_name='resource',
+            name='link_status',
+            field=models.CharField(blank=True, choices=[('ok', 'OK'), ('redirected', 'Redirected'), ('broken', 'Broken'), ('unreachable', 'Unreachable')], editable=False, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='resource',
+            name='link_status_code',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:12
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def mark_approved_as_moderated(apps, schema_editor):
+    # Objects approved before the queue existed should not show up in it
+    now = timezone.now()
+    apps.get_model('tracker', 'Profile').objects.filter(is_approved=True).update(moderated_at=now)
+    apps.get_model('tracker', 'Resource').objects.filter(approved=True).update(moderated_at=now)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0011_resource_link_check'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='moderated_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='resource',
+            name='moderated_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(mark_approved_as_moderated, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(condition=models.Q(('moderated_at__isnull', True)), fields=['id'], name='profile_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resource',
+            index=models.Index(condition=models.Q(('moderated_at__isnull', True)), fields=['id'], name='resource_pending_idx'),
+        ),
+    ]
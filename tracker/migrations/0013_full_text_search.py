@@ -0,0 +1,137 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:21
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Searchable columns per table, with their tsvector weight on PostgreSQL. Words are indexed
+# unstemmed ('simple' config, no porter tokenizer) so prefix queries match what users type.
+SEARCH_COLUMNS = {
+    'tracker_skill': [('name', 'A'), ('category', 'B'), ('description', 'C')],
+    'tracker_learninggoal': [('name', 'A'), ('description', 'C')],
+    'tracker_resource': [('title', 'A')],
+}
+
+
+def vector_sql(columns, prefix=''):
+    return ' || '.join(
+        f"setweight(to_tsvector('simple', coalesce({prefix}{column}, '')), '{weight}')"
+        for column, weight in columns
+    )
+
+
+def postgresql_forwards(schema_editor):
+    for table, columns in SEARCH_COLUMNS.items():
+        column_list = ', '.join(column for column, _ in columns)
+        schema_editor.execute(f"""
+            CREATE FUNCTION {table}_search_vector() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := {vector_sql(columns, 'NEW.')};
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+        """)
+        # Only writes that touch a searchable column recompute the vector
+        schema_editor.execute(
+            f"CREATE TRIGGER {table}_search_vector BEFORE INSERT OR UPDATE OF {column_list} ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION {table}_search_vector()"
+        )
+        schema_editor.execute(f"UPDATE {table} SET search_vector = {vector_sql(columns)}")
+        schema_editor.execute(f"CREATE INDEX {table}_search_idx ON {table} USING gin (search_vector)")
+
+
+def postgresql_backwards(schema_editor):
+    for table in SEARCH_COLUMNS:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {table}_search_idx")
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_search_vector ON {table}")
+        schema_editor.execute(f"DROP FUNCTION IF EXISTS {table}_search_vector()")
+
+
+# SQLite keeps one FTS5 table for all three models. The rowid encodes the source row
+# (id * 4 + kind number), so the sync triggers update it by primary key.
+SQLITE_SOURCES = {
+    'tracker_skill': (1, 'skill', 'new.id', 'new.owner_id', 'new.id', 'new.name', "new.category || ' ' || new.description"),
+    'tracker_learninggoal': (
+        2, 'goal', 'new.id', '(SELECT owner_id FROM tracker_skill WHERE id = new.skill_id)', 'new.skill_id',
+        'new.name', 'new.description',
+    ),
+    'tracker_resource': (
+        3, 'resource', 'new.id', '(SELECT owner_id FROM tracker_skill WHERE id = new.skill_id)', 'new.skill_id',
+        'new.title', "''",
+    ),
+}
+
+
+def sqlite_insert(table, row_prefix='new'):
+    number, kind, object_id, owner_id, skill_id, title, body = SQLITE_SOURCES[table]
+    values = [f'{object_id} * 4 + {number}', f"'{kind}'", object_id, owner_id, skill_id, title, body]
+    return (
+        "INSERT INTO tracker_search (rowid, kind, object_id, owner_id, skill_id, title, body) "
+        f"SELECT {', '.join(value.replace('new.', f'{row_prefix}.') for value in values)}"
+    )
+
+
+def sqlite_forwards(schema_editor):
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE tracker_search USING fts5("
+        "kind UNINDEXED, object_id UNINDEXED, owner_id UNINDEXED, skill_id UNINDEXED, title, body, "
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    for table, (number, *_) in SQLITE_SOURCES.items():
+        delete = f"DELETE FROM tracker_search WHERE rowid = old.id * 4 + {number}"
+        schema_editor.execute(
+            f"CREATE TRIGGER {table}_search_insert AFTER INSERT ON {table} BEGIN {sqlite_insert(table)}; END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {table}_search_update AFTER UPDATE ON {table} BEGIN {delete}; {sqlite_insert(table)}; END"
+        )
+        schema_editor.execute(f"CREATE TRIGGER {table}_search_delete AFTER DELETE ON {table} BEGIN {delete}; END")
+        schema_editor.execute(f"{sqlite_insert(table, 'source')} FROM {table} AS source")
+
+
+def sqlite_backwards(schema_editor):
+    for table in SQLITE_SOURCES:
+        for action in ('insert', 'update', 'delete'):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_search_{action}")
+    schema_editor.execute("DROP TABLE IF EXISTS tracker_search")
+
+
+def install_search(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        postgresql_forwards(schema_editor)
+    elif vendor == 'sqlite':
+        sqlite_forwards(schema_editor)
+
+
+def remove_search(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        postgresql_backwards(schema_editor)
+    elif vendor == 'sqlite':
+        sqlite_backwards(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0012_moderation_queue'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='learninggoal',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='resource',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='skill',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(install_search, remove_search),
+    ]
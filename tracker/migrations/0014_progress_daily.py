@@ -0,0 +1,58 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def build_rollup(apps, schema_editor):
+    # Existing history is rolled up once, grouped in the database
+    ProgressUpdate = apps.get_model('tracker', 'ProgressUpdate')
+    ProgressDaily = apps.get_model('tracker', 'ProgressDaily')
+    rows = ProgressUpdate.objects.annotate(day=TruncDate('date')).values(
+        'goal_id', 'goal__skill_id', 'goal__skill__owner_id', 'day',
+    ).annotate(update_count=Count('id'), progress_total=Sum('progress')).order_by()
+    ProgressDaily.objects.bulk_create(
+        (
+            ProgressDaily(
+                user_id=row['goal__skill__owner_id'],
+                skill_id=row['goal__skill_id'],
+                goal_id=row['goal_id'],
+                day=row['day'],
+                update_count=row['update_count'],
+                progress_total=row['progress_total'],
+            )
+            for row in rows.iterator(chunk_size=2000)
+        ),
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0013_full_text_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProgressDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('update_count', models.PositiveIntegerField(default=0)),
+                ('progress_total', models.IntegerField(default=0)),
+                ('goal', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='tracker.learninggoal')),
+                ('skill', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='tracker.skill')),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'day'], name='progress_daily_user_day_idx'), models.Index(fields=['skill', 'day'], name='progress_daily_skill_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'skill', 'goal', 'day'), name='progress_daily_key')],
+            },
+        ),
+        migrations.RunPython(build_rollup, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0014_progress_daily'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DifficultyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('difficulty', models.CharField(max_length=10, unique=True)),
+                ('skill_count', models.PositiveIntegerField(default=0)),
+                ('goal_count', models.PositiveIntegerField(default=0)),
+                ('completed_goal_count', models.PositiveIntegerField(default=0)),
+                ('avg_progress', models.FloatField(default=0)),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CategoryStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(max_length=50, unique=True)),
+                ('skill_count', models.PositiveIntegerField(default=0)),
+                ('learner_count', models.PositiveIntegerField(default=0)),
+                ('goal_count', models.PositiveIntegerField(default=0)),
+                ('completed_goal_count', models.PositiveIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-skill_count', 'category'], name='category_stat_popular_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveIntegerField(unique=True)),
+                ('completed_goal_count', models.PositiveIntegerField(default=0)),
+                ('avg_progress', models.FloatField(default=0)),
+                ('refreshed_at', models.DateTimeField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'leaderboard entries',
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:40
+
+import django.db.models.deletion
+import tracker.storage
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0015_stats_snapshots'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('method', models.CharField(max_length=10)),
+                ('path', models.CharField(max_length=2000)),
+                ('view_name', models.CharField(blank=True, max_length=200)),
+                ('status_code', models.PositiveIntegerField()),
+                ('format', models.CharField(choices=[('collapsed', 'Collapsed stacks (sampled)'), ('pstats', 'pstats (cProfile)')], max_length=10)),
+                ('file', models.FileField(storage=tracker.storage.get_profile_storage, upload_to='')),
+                ('duration_ms', models.FloatField()),
+                ('sample_count', models.PositiveIntegerField(null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:58
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def create_marker(apps, schema_editor):
+    # Carries over the age of a snapshot built before the marker existed
+    DifficultyStat = apps.get_model('tracker', 'DifficultyStat')
+    StatsSnapshot = apps.get_model('tracker', 'StatsSnapshot')
+    refreshed_at = DifficultyStat.objects.aggregate(refreshed_at=Max('refreshed_at'))['refreshed_at']
+    StatsSnapshot.objects.update_or_create(pk=1, defaults={'refreshed_at': refreshed_at})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0016_request_profile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatsSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('refreshed_at', models.DateTimeField(null=True)),
+            ],
+        ),
+        migrations.RunPython(create_marker, migrations.RunPython.noop),
+    ]
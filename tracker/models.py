@@ -1,5 +1,27 @@
 from django.db import models
+from django.db.models import Avg, Case, Count, F, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce, Least
 from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchVectorField
+from django.utils import timezone
+
+from tracker.storage import get_avatar_storage, get_profile_storage
+
+class ModerationQuerySet(models.QuerySet):
+    # Shared by every model that goes through the moderation queue; `approval_field` names its boolean flag
+    approval_field = None
+
+    def pending(self):
+        return self.filter(moderated_at__isnull=True)
+
+    def moderate(self, approve):
+        # A single UPDATE for the whole selection
+        return self.update(**{self.approval_field: approve, 'moderated_at': timezone.now()})
+
+
+class ProfileQuerySet(ModerationQuerySet):
+    approval_field = 'is_approved'
+
 
 # Create your models here.
 class Profile(models.Model):
@@ -17,15 +39,61 @@ class Profile(models.Model):
         null=True,
         blank=True,
         upload_to='avatars/',
+        # Stored under the hash of its content, so identical uploads share one file
+        storage=get_avatar_storage,
+    )
+
+    # Resized copies of the avatar by size and format, filled in by tracker.avatars
+    avatar_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
     )
 
     is_approved = models.BooleanField(
         default=False,
     )
 
+    # Set when a moderator approves or rejects the profile; empty while it waits in the queue
+    moderated_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+    )
+
+    objects = ProfileQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Moderation queue: WHERE moderated_at IS NULL ORDER BY id
+            models.Index(fields=['id'], condition=models.Q(moderated_at__isnull=True), name='profile_pending_idx'),
+        ]
+
     def __str__(self):
         return self.user.username
 
+class SkillQuerySet(models.QuerySet):
+    def with_progress_stats(self):
+        # Goal statistics are computed in SQL so templates never hit the database per skill
+        return self.annotate(
+            goal_count=Count('learninggoal'),
+            completed_goal_count=Count('learninggoal', filter=Q(learninggoal__progress__gte=100)),
+            avg_progress=Avg('learninggoal__progress', output_field=models.FloatField()),
+        ).annotate(
+            is_complete=Case(
+                When(goal_count__gt=0, goal_count=F('completed_goal_count'), then=Value(True)),
+                default=Value(False),
+                output_field=models.BooleanField(),
+            ),
+        )
+
+    def complete(self):
+        return self.with_progress_stats().filter(is_complete=True)
+
+    def incomplete(self):
+        return self.with_progress_stats().filter(is_complete=False)
+
+
 class Skill(models.Model):
     name = models.CharField(
         max_length=100,
@@ -44,24 +112,79 @@ class Skill(models.Model):
     owner = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
+        db_index=False,  # Covered by the (owner, created_at, id) index
     )
 
     created_at = models.DateTimeField(
         auto_now_add=True
     )
 
+    # Kept current by a database trigger on PostgreSQL (see migration 0013); unused on SQLite
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+    )
+
+    objects = SkillQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Skill list / dashboard: WHERE owner_id = ? ORDER BY created_at, id (both directions)
+            models.Index(fields=['owner', 'created_at', 'id'], name='skill_owner_created_idx'),
+            # Skill list sorted by name
+            models.Index(fields=['owner', 'name', 'id'], name='skill_owner_name_idx'),
+        ]
+
     @property
     def is_complete(self):
+        # Set by SkillQuerySet.with_progress_stats()
+        if hasattr(self, '_is_complete'):
+            return self._is_complete
+
         goals = self.learninggoal_set.all()
-        return goals.exists() and all(goal.is_complete for goal in goals)
+        if 'learninggoal_set' in getattr(self, '_prefetched_objects_cache', {}):
+            return bool(goals) and all(goal.is_complete for goal in goals)
+
+        return goals.exists() and not goals.filter(progress__lt=100).exists()
+
+    @is_complete.setter
+    def is_complete(self, value):
+        self._is_complete = value
 
     def __str__(self):
             return self.name
 
+class LearningGoalQuerySet(models.QuerySet):
+    def add_progress(self, amount):
+        # Atomic in-database increment capped at 100, so concurrent updates never overwrite each other
+        return self.update(progress=Least(F('progress') + amount, 100))
+
+    @staticmethod
+    def expected_progress():
+        # Sum of all progress updates for the outer goal, capped at 100
+        total = ProgressUpdate.objects.filter(goal=OuterRef('pk')).order_by().values('goal').annotate(
+            total=Sum('progress'),
+        ).values('total')
+        return Least(Coalesce(Subquery(total), 0), 100)
+
+    def drifted(self):
+        # Goals whose stored progress no longer matches their updates
+        return self.annotate(expected_progress=self.expected_progress()).exclude(
+            progress=F('expected_progress'),
+        )
+
+    def reconcile_progress(self):
+        # Single set-based UPDATE over every drifted goal
+        return self.model.objects.filter(pk__in=self.drifted().values('pk')).update(
+            progress=self.expected_progress(),
+        )
+
+
 class LearningGoal(models.Model):
     skill = models.ForeignKey(
         Skill,
         on_delete=models.CASCADE,
+        db_index=False,  # Covered by the (skill, target_date) index
     )
 
     name = models.CharField(
@@ -78,6 +201,20 @@ class LearningGoal(models.Model):
         default=0
     )
 
+    # Kept current by a database trigger on PostgreSQL (see migration 0013); unused on SQLite
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+    )
+
+    objects = LearningGoalQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Dashboard and profile prefetch: WHERE skill_id IN (...) ORDER BY target_date
+            models.Index(fields=['skill', 'target_date'], name='goal_skill_target_idx'),
+        ]
+
     @property
     def is_complete(self):
         return self.progress >= 100
@@ -89,6 +226,7 @@ class ProgressUpdate(models.Model):
     goal = models.ForeignKey(
         LearningGoal,
         on_delete=models.CASCADE,
+        db_index=False,  # Covered by the (goal, date, id) index
     )
 
     progress = models.IntegerField(
@@ -97,13 +235,68 @@ class ProgressUpdate(models.Model):
 
     update_text = models.TextField()
 
+    # A default instead of auto_now_add, so bulk imports can keep historical dates
     date = models.DateTimeField(
-        auto_now_add=True
+        default=timezone.now,
+        editable=False,
     )
 
+    class Meta:
+        indexes = [
+            # Progress history and the per-goal window on the profile: WHERE goal_id = ? ORDER BY date DESC, id DESC
+            models.Index(fields=['goal', 'date', 'id'], name='progress_goal_date_idx'),
+        ]
+
     def __str__(self):
         return f"Update for {self.goal.skill.name} on {self.date}"
 
+class ProgressDaily(models.Model):
+    # Per goal and day totals of ProgressUpdate rows, maintained by tracker.services.analytics
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        db_index=False,  # Covered by the unique (user, skill, goal, day) index
+    )
+
+    skill = models.ForeignKey(
+        Skill,
+        on_delete=models.CASCADE,
+        db_index=False,  # Covered by the (skill, day) index
+    )
+
+    goal = models.ForeignKey(
+        LearningGoal,
+        on_delete=models.CASCADE,
+    )
+
+    day = models.DateField()
+
+    update_count = models.PositiveIntegerField(
+        default=0
+    )
+
+    progress_total = models.IntegerField(
+        default=0
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'skill', 'goal', 'day'], name='progress_daily_key'),
+        ]
+        indexes = [
+            # Per-user series and streaks: WHERE user_id = ? AND day >= ?
+            models.Index(fields=['user', 'day'], name='progress_daily_user_day_idx'),
+            # Per-skill series: WHERE skill_id = ? AND day >= ?
+            models.Index(fields=['skill', 'day'], name='progress_daily_skill_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.goal_id} on {self.day}: {self.update_count} update(s)"
+
+class ResourceQuerySet(ModerationQuerySet):
+    approval_field = 'approved'
+
+
 class Resource(models.Model):
     title = models.CharField(
         max_length=100
@@ -127,5 +320,234 @@ class Resource(models.Model):
         blank=True,
     )
 
+    # Result of the last link check, filled in by tracker.services.link_checker
+    LINK_OK = 'ok'
+    LINK_REDIRECTED = 'redirected'
+    LINK_BROKEN = 'broken'
+    LINK_UNREACHABLE = 'unreachable'
+    LINK_STATUS_CHOICES = [
+        (LINK_OK, 'OK'),
+        (LINK_REDIRECTED, 'Redirected'),
+        (LINK_BROKEN, 'Broken'),
+        (LINK_UNREACHABLE, 'Unreachable'),
+    ]
+
+    link_status = models.CharField(
+        max_length=20,
+        choices=LINK_STATUS_CHOICES,
+        blank=True,
+        editable=False,
+    )
+
+    link_status_code = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+    )
+
+    link_final_url = models.URLField(
+        max_length=2000,
+        blank=True,
+        editable=False,
+    )
+
+    link_error = models.CharField(
+        max_length=255,
+        blank=True,
+        editable=False,
+    )
+
+    link_checked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+    )
+
+    # Set when a moderator approves or rejects the resource; empty while it waits in the queue
+    moderated_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+    )
+
+    # Kept current by a database trigger on PostgreSQL (see migration 0013); unused on SQLite
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+    )
+
+    objects = ResourceQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Profile page: WHERE skill_id IN (...) AND approved
+            models.Index(fields=['skill'], condition=models.Q(approved=True), name='resource_approved_skill_idx'),
+            # Moderation queue: WHERE moderated_at IS NULL ORDER BY id
+            models.Index(fields=['id'], condition=models.Q(moderated_at__isnull=True), name='resource_pending_idx'),
+        ]
+
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
+
+
+# Snapshot tables behind the stats page, rewritten by tracker.services.stats.refresh_stats
+class StatsSnapshot(models.Model):
+    # Single row: when the snapshot was last rebuilt (also when it is empty), and the row that
+    # refreshes lock so that overlapping runs from different processes do not both rebuild
+    SINGLETON_ID = 1
+
+    refreshed_at = models.DateTimeField(
+        null=True,
+    )
+
+    def __str__(self):
+        return f"Stats refreshed at {self.refreshed_at}"
+
+
+class CategoryStat(models.Model):
+    category = models.CharField(
+        max_length=50,
+        unique=True,
+    )
+
+    skill_count = models.PositiveIntegerField(
+        default=0
+    )
+
+    learner_count = models.PositiveIntegerField(
+        default=0
+    )
+
+    goal_count = models.PositiveIntegerField(
+        default=0
+    )
+
+    completed_goal_count = models.PositiveIntegerField(
+        default=0
+    )
+
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            # Stats page: ORDER BY skill_count DESC LIMIT n
+            models.Index(fields=['-skill_count', 'category'], name='category_stat_popular_idx'),
+        ]
+
+    def __str__(self):
+        return self.category
+
+
+class DifficultyStat(models.Model):
+    difficulty = models.CharField(
+        max_length=10,
+        unique=True,
+    )
+
+    skill_count = models.PositiveIntegerField(
+        default=0
+    )
+
+    goal_count = models.PositiveIntegerField(
+        default=0
+    )
+
+    completed_goal_count = models.PositiveIntegerField(
+        default=0
+    )
+
+    avg_progress = models.FloatField(
+        default=0
+    )
+
+    refreshed_at = models.DateTimeField()
+
+    @property
+    def completion_rate(self):
+        return 100 * self.completed_goal_count / self.goal_count if self.goal_count else 0
+
+    def __str__(self):
+        return self.difficulty
+
+
+class LeaderboardEntry(models.Model):
+    rank = models.PositiveIntegerField(
+        unique=True,
+    )
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+    )
+
+    completed_goal_count = models.PositiveIntegerField(
+        default=0
+    )
+
+    avg_progress = models.FloatField(
+        default=0
+    )
+
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name_plural = 'leaderboard entries'
+
+    def __str__(self):
+        return f"#{self.rank} {self.user_id}"
+
+
+# One profiled request, recorded by tracker.middleware.RequestProfilingMiddleware
+class RequestProfile(models.Model):
+    FORMAT_COLLAPSED = 'collapsed'
+    FORMAT_PSTATS = 'pstats'
+    FORMAT_CHOICES = [
+        (FORMAT_COLLAPSED, 'Collapsed stacks (sampled)'),
+        (FORMAT_PSTATS, 'pstats (cProfile)'),
+    ]
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+    )
+
+    method = models.CharField(
+        max_length=10,
+    )
+
+    path = models.CharField(
+        max_length=2000,
+    )
+
+    view_name = models.CharField(
+        max_length=200,
+        blank=True,
+    )
+
+    status_code = models.PositiveIntegerField()
+
+    format = models.CharField(
+        max_length=10,
+        choices=FORMAT_CHOICES,
+    )
+
+    file = models.FileField(
+        storage=get_profile_storage,
+    )
+
+    duration_ms = models.FloatField()
+
+    # Stack samples taken; empty for pstats profiles
+    sample_count = models.PositiveIntegerField(
+        null=True,
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        db_index=True,
+    )
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.created_at:%Y-%m-%d %H:%M:%S})"
+
@@ -0,0 +1,114 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+def encode_cursor(values):
+    payload = json.dumps([value.isoformat() if hasattr(value, 'isoformat') else value for value in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        return None
+    return values if isinstance(values, list) else None
+
+
+class KeysetPage:
+    def __init__(self, object_list, has_next, has_previous, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+# Cursor pagination over a unique ordering such as ('-created_at', '-id').
+# Every page is a range scan that starts at the cursor, so deep pages cost the same as the first one.
+class KeysetPaginator:
+    def __init__(self, queryset, ordering, per_page):
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.per_page = per_page
+        self.fields = [name.lstrip('-') for name in self.ordering]
+
+    def page(self, after=None, before=None):
+        after_values = self._cursor_values(after)
+        before_values = self._cursor_values(before) if after_values is None else None
+
+        if before_values is not None:
+            # Walk backwards from the cursor and flip the rows back into display order
+            ordering = [self._flip(name) for name in self.ordering]
+            queryset = self.queryset.filter(self._seek(ordering, before_values)).order_by(*ordering)
+            rows = list(queryset[:self.per_page + 1])
+            has_previous = len(rows) > self.per_page
+            rows = rows[:self.per_page][::-1]
+            has_next = True
+        else:
+            queryset = self.queryset.order_by(*self.ordering)
+            if after_values is not None:
+                queryset = queryset.filter(self._seek(self.ordering, after_values))
+            rows = list(queryset[:self.per_page + 1])
+            has_next = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            has_previous = after_values is not None
+
+        return KeysetPage(
+            rows,
+            has_next=has_next and bool(rows),
+            has_previous=has_previous and bool(rows),
+            next_cursor=self.cursor_for(rows[-1]) if rows else None,
+            previous_cursor=self.cursor_for(rows[0]) if rows else None,
+        )
+
+    def cursor_for(self, obj):
+        if isinstance(obj, dict):
+            return encode_cursor([obj[field] for field in self.fields])
+        return encode_cursor([getattr(obj, field) for field in self.fields])
+
+    def _cursor_values(self, token):
+        if not token:
+            return None
+        values = decode_cursor(token)
+        if values is None or len(values) != len(self.fields):
+            return None
+        try:
+            values = [
+                self.queryset.model._meta.get_field(field).to_python(value)
+                for field, value in zip(self.fields, values)
+            ]
+        except (ValidationError, TypeError, ValueError):
+            return None
+        # Tampered cursors fall back to the first page; NULL cannot be compared against
+        return None if any(value is None for value in values) else values
+
+    @staticmethod
+    def _flip(name):
+        return name[1:] if name.startswith('-') else f'-{name}'
+
+    @staticmethod
+    def _seek(ordering, values):
+        # (a, b) > (x, y) expanded to a >= x AND (a > x OR (a = x AND b > y));
+        # the leading bound lets the database start an index range scan at the cursor
+        condition = Q()
+        equal = Q()
+        for name, value in zip(ordering, values):
+            field = name.lstrip('-')
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{field}__{lookup}': value})
+            equal &= Q(**{field: value})
+
+        first = ordering[0]
+        first_lookup = 'lte' if first.startswith('-') else 'gte'
+        return Q(**{f'{first.lstrip("-")}__{first_lookup}': values[0]}) & condition
@@ -0,0 +1,77 @@
+from django.contrib.auth.models import Group, Permission
+from django.db import DEFAULT_DB_ALIAS
+
+ALL_PERMISSIONS = '__all__'
+
+# Group name -> permissions it holds, as {'app_label.model': actions} or ALL_PERMISSIONS.
+# Syncing adds what the spec lists; permissions missing from it are only removed with prune=True
+# (manage.py sync_admin_groups --prune), so grants made by hand in the admin survive a migrate.
+GROUP_PERMISSIONS = {
+    'SuperAdmin': ALL_PERMISSIONS,
+    # StaffAdmin can add, view and change skills, goals and progress updates, but cannot delete or manage users
+    'StaffAdmin': {
+        'tracker.skill': ('add', 'change', 'view'),
+        'tracker.learninggoal': ('add', 'change', 'view'),
+        'tracker.progressupdate': ('add', 'change', 'view'),
+        'tracker.categorystat': ('view',),
+        'tracker.difficultystat': ('view',),
+        'tracker.leaderboardentry': ('view',),
+    },
+}
+
+
+def resolve_permissions(spec, using=DEFAULT_DB_ALIAS):
+    # {group name: set of permission ids}, from a single query over all permissions
+    all_ids = set()
+    by_codename = {}
+    rows = Permission.objects.using(using).values_list('pk', 'content_type__app_label', 'content_type__model', 'codename')
+    for pk, app_label, model, codename in rows:
+        all_ids.add(pk)
+        by_codename[f'{app_label}.{model}', codename] = pk
+
+    resolved = {}
+    for group_name, permissions in spec.items():
+        if permissions == ALL_PERMISSIONS:
+            resolved[group_name] = set(all_ids)
+            continue
+        resolved[group_name] = {
+            by_codename[model, f'{action}_{model.split(".")[1]}']
+            for model, actions in permissions.items()
+            for action in actions
+            # Permissions of models that do not exist (yet) are skipped
+            if (model, f'{action}_{model.split(".")[1]}') in by_codename
+        }
+    return resolved
+
+
+def sync_group_permissions(spec=GROUP_PERMISSIONS, using=DEFAULT_DB_ALIAS, prune=False):
+    # Creates missing groups and adds the memberships missing from the spec; with prune, also removes the
+    # ones the spec does not list. Returns (added, removed)
+    groups = dict(Group.objects.using(using).filter(name__in=spec).values_list('name', 'pk'))
+    missing = [name for name in spec if name not in groups]
+    if missing:
+        Group.objects.using(using).bulk_create([Group(name=name) for name in missing], ignore_conflicts=True)
+        groups.update(Group.objects.using(using).filter(name__in=missing).values_list('name', 'pk'))
+
+    wanted = resolve_permissions(spec, using)
+    desired = {(groups[name], permission_id) for name, permission_ids in wanted.items() for permission_id in permission_ids}
+
+    through = Group.permissions.through
+    existing = {
+        (group_id, permission_id): pk
+        for pk, group_id, permission_id in through.objects.using(using).filter(
+            group_id__in=groups.values(),
+        ).values_list('pk', 'group_id', 'permission_id')
+    }
+
+    to_add = desired.difference(existing)
+    to_remove = [pk for membership, pk in existing.items() if membership not in desired] if prune else []
+    if to_add:
+        through.objects.using(using).bulk_create(
+            [through(group_id=group_id, permission_id=permission_id) for group_id, permission_id in to_add],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+    if to_remove:
+        through.objects.using(using).filter(pk__in=to_remove).delete()
+    return len(to_add), len(to_remove)
@@ -0,0 +1,118 @@
+import cProfile
+import datetime
+import marshal
+import os
+import sys
+import threading
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+from tracker.models import RequestProfile
+
+PROFILE_EXTENSIONS = {
+    RequestProfile.FORMAT_COLLAPSED: 'collapsed.txt',
+    RequestProfile.FORMAT_PSTATS: 'prof',
+}
+
+
+def frame_label(frame):
+    code = frame.f_code
+    return f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+
+
+class StackSampler:
+    # Samples the profiled thread's stack from a helper thread; the request itself runs untraced,
+    # so the overhead is one stack walk per interval
+    format = RequestProfile.FORMAT_COLLAPSED
+
+    def __init__(self, interval=None):
+        self.interval = interval or settings.PROFILING_SAMPLE_INTERVAL
+        self.stacks = Counter()
+        self._stop = threading.Event()
+
+    def __enter__(self):
+        self.thread_id = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(frame_label(frame))
+                frame = frame.f_back
+            if labels:
+                self.stacks[';'.join(reversed(labels))] += 1
+
+    @property
+    def sample_count(self):
+        return sum(self.stacks.values())
+
+    def dump(self):
+        # One "frame;frame;frame count" line per stack, the input of flamegraph.pl and speedscope
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common()).encode()
+
+
+class DeterministicProfiler:
+    # cProfile of the request thread; exact call counts at a higher overhead than sampling
+    format = RequestProfile.FORMAT_PSTATS
+    sample_count = None
+
+    def __enter__(self):
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profile.disable()
+
+    def dump(self):
+        # Same bytes as Profile.dump_stats(), readable with pstats.Stats(path)
+        self.profile.create_stats()
+        return marshal.dumps(self.profile.stats)
+
+
+PROFILERS = {
+    RequestProfile.FORMAT_COLLAPSED: StackSampler,
+    RequestProfile.FORMAT_PSTATS: DeterministicProfiler,
+}
+
+
+def save_profile(request, response, profiler, duration):
+    match = request.resolver_match
+    record = RequestProfile(
+        user=request.user if request.user.is_authenticated else None,
+        method=request.method,
+        path=request.get_full_path()[:2000],
+        view_name=match.view_name if match else '',
+        status_code=response.status_code,
+        format=profiler.format,
+        duration_ms=round(duration * 1000, 2),
+        sample_count=profiler.sample_count,
+    )
+    name = f'{timezone.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}.{PROFILE_EXTENSIONS[profiler.format]}'
+    record.file.save(name, ContentFile(profiler.dump()), save=False)
+    record.save()
+    prune_profiles()
+    return record
+
+
+def prune_profiles(max_records=None, max_age=None):
+    # Keeps the newest max_records profiles younger than max_age seconds; returns how many were removed
+    max_records = settings.PROFILING_MAX_RECORDS if max_records is None else max_records
+    max_age = settings.PROFILING_MAX_AGE if max_age is None else max_age
+    cutoff = timezone.now() - datetime.timedelta(seconds=max_age)
+    keep = RequestProfile.objects.filter(created_at__gte=cutoff).order_by('-created_at', '-id')[:max_records]
+    # Files go with the rows (see tracker.signals.delete_request_profile_file)
+    deleted, _ = RequestProfile.objects.exclude(pk__in=keep.values('pk')).delete()
+    return deleted
@@ -0,0 +1,100 @@
+import datetime
+import re
+
+from django.contrib.auth.models import User
+from django.db import connection
+
+from tracker.models import Skill, LearningGoal, ProgressUpdate, Resource
+from tracker.services.profile import PROFILE_UPDATES_PER_GOAL, recent_updates_queryset
+
+SEQ_SCAN_RE = re.compile(r'Seq Scan on (tracker_\w+)')
+SEED_PREFIX = 'plancheck'
+
+
+def hot_queries(user):
+    # The queries behind the dashboard, skill list, profile and progress history pages
+    skill_ids = list(Skill.objects.filter(owner=user).values_list('id', flat=True))
+    goal = LearningGoal.objects.filter(skill__owner=user).order_by('id').first()
+
+    return {
+        'skill_list': Skill.objects.filter(owner=user).with_progress_stats().order_by('-created_at', '-id')[:13],
+        'skill_list_by_name': Skill.objects.filter(owner=user).order_by('name', 'id')[:13],
+        'skill_goals': LearningGoal.objects.filter(skill_id__in=skill_ids).order_by('target_date'),
+        'progress_history': ProgressUpdate.objects.filter(goal=goal).order_by('-date', '-id')[:21],
+        'profile_recent_updates': recent_updates_queryset(user, PROFILE_UPDATES_PER_GOAL + 1),
+        'progress_count': ProgressUpdate.objects.filter(goal__skill__owner=user).values('id'),
+        'approved_resources': Resource.objects.filter(skill_id__in=skill_ids, approved=True),
+    }
+
+
+def explain(queryset):
+    # QuerySet.explain() double-prefixes queries that filter on a window function, so EXPLAIN the SQL directly
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN {sql}', params)
+        return '\n'.join(row[0] for row in cursor.fetchall())
+
+
+def explain_hot_queries(user):
+    return {name: explain(queryset) for name, queryset in hot_queries(user).items()}
+
+
+def find_sequential_scans(plans):
+    # {query name: [tracker tables read with a sequential scan]}
+    found = {}
+    for name, plan in plans.items():
+        tables = SEQ_SCAN_RE.findall(plan)
+        if tables:
+            found[name] = sorted(set(tables))
+    return found
+
+
+def analyze_tracker_tables():
+    tables = [model._meta.db_table for model in (Skill, LearningGoal, ProgressUpdate, Resource)]
+    with connection.cursor() as cursor:
+        for table in tables + [User._meta.db_table]:
+            cursor.execute(f'ANALYZE {connection.ops.quote_name(table)}')
+
+
+def seed_plan_dataset(users=200, skills_per_user=10, goals_per_skill=5, updates_per_goal=10, resources_per_skill=2):
+    # Bulk-inserts a realistic spread of data so the planner has table statistics to work with
+    owners = User.objects.bulk_create(
+        User(username=f'{SEED_PREFIX}-{index}', email=f'{SEED_PREFIX}-{index}@example.com')
+        for index in range(users)
+    )
+    skills = Skill.objects.bulk_create(
+        Skill(
+            name=f'Skill {index}',
+            description='Seeded for query plan checks',
+            category=f'Category {index % 12}',
+            difficulty=('Easy', 'Medium', 'Hard')[index % 3],
+            owner=owner,
+        )
+        for owner in owners
+        for index in range(skills_per_user)
+    )
+    goals = LearningGoal.objects.bulk_create(
+        LearningGoal(
+            skill=skill,
+            name=f'Goal {index}',
+            description='Seeded goal',
+            target_date=datetime.date.today() + datetime.timedelta(days=index),
+            progress=min(index * 25, 100),
+        )
+        for skill in skills
+        for index in range(goals_per_skill)
+    )
+    ProgressUpdate.objects.bulk_create(
+        (
+            ProgressUpdate(goal=goal, progress=1, update_text='Seeded update')
+            for goal in goals
+            for _ in range(updates_per_goal)
+        ),
+        batch_size=5000,
+    )
+    Resource.objects.bulk_create(
+        Resource(title=f'Resource {index}', link='https://example.com', skill=skill, approved=bool(index % 2))
+        for skill in skills
+        for index in range(resources_per_skill)
+    )
+    return owners
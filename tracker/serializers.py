@@ -0,0 +1,70 @@
+from django.db.models import BooleanField, Case, Value, When
+
+
+class SerializerError(ValueError):
+    pass
+
+
+# Serializers work on .values() querysets: rows come out of the database as plain dicts that are
+# handed to the JSON encoder as they are, with no model instances in between.
+class ValuesSerializer:
+    fields = ()
+    default_fields = ()
+
+    def __init__(self, fields_param=None):
+        if fields_param:
+            requested = [name.strip() for name in fields_param.split(',') if name.strip()]
+            unknown = [name for name in requested if name not in self.fields]
+            if unknown:
+                raise SerializerError(f"Unknown field(s): {', '.join(unknown)}.")
+        else:
+            requested = self.default_fields or self.fields
+        self.selected = tuple(dict.fromkeys(requested))
+        self.hidden = ()
+
+    def annotate(self, queryset):
+        # Hook for fields computed in SQL
+        return queryset
+
+    def values(self, queryset, extra=()):
+        # `extra` fields (e.g. pagination keys) are fetched but stripped from the output
+        self.hidden = tuple(name for name in extra if name not in self.selected)
+        return self.annotate(queryset).values(*self.selected, *self.hidden)
+
+    def serialize(self, rows):
+        if self.hidden:
+            for row in rows:
+                for name in self.hidden:
+                    del row[name]
+        return rows
+
+
+class SkillSerializer(ValuesSerializer):
+    fields = (
+        'id', 'name', 'description', 'category', 'difficulty', 'created_at',
+        'goal_count', 'completed_goal_count', 'avg_progress', 'is_complete',
+    )
+    default_fields = ('id', 'name', 'category', 'difficulty', 'created_at', 'is_complete')
+    stat_fields = {'goal_count', 'completed_goal_count', 'avg_progress', 'is_complete'}
+
+    def annotate(self, queryset):
+        if self.stat_fields.intersection(self.selected):
+            return queryset.with_progress_stats()
+        return queryset
+
+
+class GoalSerializer(ValuesSerializer):
+    fields = ('id', 'skill_id', 'name', 'description', 'target_date', 'progress', 'is_complete')
+
+    def annotate(self, queryset):
+        if 'is_complete' in self.selected:
+            return queryset.annotate(is_complete=Case(
+                When(progress__gte=100, then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            ))
+        return queryset
+
+
+class ProgressUpdateSerializer(ValuesSerializer):
+    fields = ('id', 'goal_id', 'progress', 'update_text', 'date')
@@ -0,0 +1,131 @@
+import datetime
+
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate, TruncWeek
+from django.utils import timezone
+
+from tracker.models import ProgressDaily, ProgressUpdate
+
+ROLLUP_BATCH_SIZE = 2000
+MAX_SERIES_DAYS = 366
+MAX_VELOCITY_WEEKS = 104
+
+
+def record_progress(user_id, skill_id, goal_id, day, progress, count=1):
+    # Adds one write to the rollup with a single upsert; concurrent writers add up instead of overwriting
+    table = connection.ops.quote_name(ProgressDaily._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (user_id, skill_id, goal_id, day, update_count, progress_total) "
+            "VALUES (%s, %s, %s, %s, %s, %s) "
+            "ON CONFLICT (user_id, skill_id, goal_id, day) DO UPDATE SET "
+            f"update_count = {table}.update_count + excluded.update_count, "
+            f"progress_total = {table}.progress_total + excluded.progress_total",
+            [user_id, skill_id, goal_id, day, count, progress],
+        )
+
+
+def rollup_rows(updates):
+    # Groups progress updates per goal and day in the database
+    return updates.annotate(day=TruncDate('date')).values(
+        'goal_id', 'goal__skill_id', 'goal__skill__owner_id', 'day',
+    ).annotate(update_count=Count('id'), progress_total=Sum('progress')).order_by()
+
+
+def rebuild_progress_daily(goal_ids=None, user_ids=None, batch_size=ROLLUP_BATCH_SIZE):
+    # Recomputes the rollup from ProgressUpdate, for everything or for some goals/users; returns rows written
+    updates = ProgressUpdate.objects.all()
+    daily = ProgressDaily.objects.all()
+    if goal_ids is not None:
+        updates = updates.filter(goal_id__in=goal_ids)
+        daily = daily.filter(goal_id__in=goal_ids)
+    if user_ids is not None:
+        updates = updates.filter(goal__skill__owner_id__in=user_ids)
+        daily = daily.filter(user_id__in=user_ids)
+
+    written = 0
+    with transaction.atomic():
+        daily.delete()
+        batch = []
+        for row in rollup_rows(updates).iterator(chunk_size=batch_size):
+            batch.append(ProgressDaily(
+                user_id=row['goal__skill__owner_id'],
+                skill_id=row['goal__skill_id'],
+                goal_id=row['goal_id'],
+                day=row['day'],
+                update_count=row['update_count'],
+                progress_total=row['progress_total'],
+            ))
+            if len(batch) >= batch_size:
+                written += len(ProgressDaily.objects.bulk_create(batch))
+                batch = []
+        written += len(ProgressDaily.objects.bulk_create(batch))
+    return written
+
+
+def refresh_goal_day(goal_id, day):
+    # Exact recount of one goal and day, for edits and deletes that cannot be applied as a delta
+    start = timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+    updates = ProgressUpdate.objects.filter(goal_id=goal_id, date__gte=start, date__lt=start + datetime.timedelta(days=1))
+    with transaction.atomic():
+        ProgressDaily.objects.filter(goal_id=goal_id, day=day).delete()
+        ProgressDaily.objects.bulk_create(
+            ProgressDaily(
+                user_id=row['goal__skill__owner_id'],
+                skill_id=row['goal__skill_id'],
+                goal_id=goal_id,
+                day=row['day'],
+                update_count=row['update_count'],
+                progress_total=row['progress_total'],
+            )
+            for row in rollup_rows(updates)
+        )
+
+
+def _scoped(user, skill_id=None):
+    daily = ProgressDaily.objects.filter(user=user)
+    if skill_id is not None:
+        daily = daily.filter(skill_id=skill_id)
+    return daily
+
+
+def daily_series(user, skill_id=None, days=30, today=None):
+    # [{'day', 'updates', 'progress'}] for days with activity in the last `days` days
+    today = today or timezone.localdate()
+    start = today - datetime.timedelta(days=min(days, MAX_SERIES_DAYS) - 1)
+    return list(
+        _scoped(user, skill_id).filter(day__gte=start, day__lte=today).values('day').annotate(
+            updates=Sum('update_count'),
+            progress=Sum('progress_total'),
+        ).order_by('day')
+    )
+
+
+def weekly_velocity(user, skill_id=None, weeks=12, today=None):
+    # Progress points logged per ISO week (weeks start on Monday)
+    today = today or timezone.localdate()
+    start = today - datetime.timedelta(days=today.weekday(), weeks=min(weeks, MAX_VELOCITY_WEEKS) - 1)
+    return list(_scoped(user, skill_id).filter(day__gte=start, day__lte=today).annotate(
+        week=TruncWeek('day'),
+    ).values('week').annotate(
+        updates=Sum('update_count'),
+        progress=Sum('progress_total'),
+    ).order_by('week'))
+
+
+def streaks(user, skill_id=None, today=None):
+    # Reads one row per active day, so the cost follows the number of days, not of updates
+    today = today or timezone.localdate()
+    days = _scoped(user, skill_id).filter(day__lte=today).values_list('day', flat=True).distinct().order_by('day')
+
+    longest = run = 0
+    previous = None
+    for day in days.iterator():
+        run = run + 1 if previous is not None and day - previous == datetime.timedelta(days=1) else 1
+        longest = max(longest, run)
+        previous = day
+
+    # Today without an update yet does not break a streak that ran until yesterday
+    current = run if previous is not None and (today - previous).days <= 1 else 0
+    return {'current': current, 'longest': longest, 'last_active': previous}
@@ -0,0 +1,33 @@
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def connection_settings(using=DEFAULT_DB_ALIAS):
+    settings_dict = connections[using].settings_dict
+    return {
+        'conn_max_age': settings_dict['CONN_MAX_AGE'],
+        'conn_health_checks': settings_dict['CONN_HEALTH_CHECKS'],
+        'pool': settings_dict['OPTIONS'].get('pool') or None,
+    }
+
+
+def pool_stats(using=DEFAULT_DB_ALIAS):
+    # psycopg pool counters (pool_size, pool_available, requests_waiting, ...) of this process,
+    # or None when the connection is not pooled
+    pool = getattr(connections[using], 'pool', None)
+    return pool.get_stats() if pool is not None else None
+
+
+def server_connections(using=DEFAULT_DB_ALIAS):
+    # Connections the server holds to this database, from all processes, by state; plus its limit
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT coalesce(state, 'unknown'), count(*) FROM pg_stat_activity "
+            "WHERE datname = current_database() GROUP BY 1 ORDER BY 1"
+        )
+        states = dict(cursor.fetchall())
+        cursor.execute("SHOW max_connections")
+        max_connections = int(cursor.fetchone()[0])
+    return {'states': states, 'total': sum(states.values()), 'max_connections': max_connections}
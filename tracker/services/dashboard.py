@@ -0,0 +1,90 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Prefetch
+
+from tracker.models import Skill, LearningGoal, ProgressUpdate
+
+DASHBOARD_CACHE_TIMEOUT = 60 * 15
+DASHBOARD_KEY = 'tracker:dashboard:{user_id}'
+STATS_KEY = 'tracker:dashboard:stats:{name}'
+SKILL_VERSION_KEY = 'tracker:skill-version:{skill_id}'
+# Rendered skill cards are keyed on their version, so old fragments are never read again and simply expire
+SKILL_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def dashboard_cache_key(user_id):
+    return DASHBOARD_KEY.format(user_id=user_id)
+
+
+def build_dashboard_summary(user):
+    skills = list(
+        Skill.objects.filter(owner=user).with_progress_stats().prefetch_related(
+            Prefetch('learninggoal_set', queryset=LearningGoal.objects.all().order_by('target_date'))
+        )
+    )
+
+    return {
+        'skills': skills,
+        'skill_count': len(skills),
+        'goal_count': sum(skill.goal_count for skill in skills),
+        'progress_count': ProgressUpdate.objects.filter(goal__skill__owner=user).count(),
+    }
+
+
+def get_dashboard_summary(user):
+    # Summary counters and the skill/goal tree are cached per user until one of their objects changes
+    key = dashboard_cache_key(user.pk)
+    summary = cache.get(key)
+    if summary is not None:
+        _record('hits')
+        return summary
+
+    _record('misses')
+    summary = build_dashboard_summary(user)
+    cache.set(key, summary, DASHBOARD_CACHE_TIMEOUT)
+    return summary
+
+
+def invalidate_dashboard(*user_ids):
+    keys = [dashboard_cache_key(user_id) for user_id in set(user_ids) if user_id is not None]
+    if keys:
+        # Deleting after commit stops a concurrent request from caching the pre-commit state
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def skill_version_key(skill_id):
+    return SKILL_VERSION_KEY.format(skill_id=skill_id)
+
+
+def skill_versions(skill_ids):
+    # {skill id: version stamp}, read with one cache round trip; skills without a stamp get a new one
+    keys = {skill_version_key(skill_id): skill_id for skill_id in skill_ids}
+    stored = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in stored}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        stored.update(missing)
+    return {skill_id: stored[key] for key, skill_id in keys.items()}
+
+
+def bump_skill_versions(*skill_ids):
+    # A new stamp makes the next render miss the cached card of each skill
+    keys = [skill_version_key(skill_id) for skill_id in set(skill_ids) if skill_id is not None]
+    if keys:
+        transaction.on_commit(lambda: cache.set_many({key: time.time_ns() for key in keys}, timeout=None))
+
+
+def dashboard_cache_stats():
+    names = ('hits', 'misses')
+    values = cache.get_many([STATS_KEY.format(name=name) for name in names])
+    return {name: values.get(STATS_KEY.format(name=name), 0) for name in names}
+
+
+def _record(name):
+    key = STATS_KEY.format(name=name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
@@ -0,0 +1,98 @@
+import os
+import zipfile
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from tracker.models import Skill, LearningGoal, ProgressUpdate, Resource, Profile
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FLUSH_BYTES = 64 * 1024
+
+
+class StreamBuffer:
+    # Write-only file object for zipfile; the generator drains it after every few rows
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+        self.offset = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.size += len(data)
+        self.offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.offset
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        self.size = 0
+        return data
+
+
+def export_tables(user):
+    # (archive name, rows) pairs; every queryset is read through a server-side cursor
+    return (
+        ('skills.jsonl', Skill.objects.filter(owner=user).order_by('id').values(
+            'id', 'name', 'description', 'category', 'difficulty', 'created_at',
+        )),
+        ('goals.jsonl', LearningGoal.objects.filter(skill__owner=user).order_by('id').values(
+            'id', 'skill_id', 'name', 'description', 'target_date', 'progress',
+        )),
+        ('progress_updates.jsonl', ProgressUpdate.objects.filter(goal__skill__owner=user).order_by('id').values(
+            'id', 'goal_id', 'progress', 'update_text', 'date',
+        )),
+        ('resources.jsonl', Resource.objects.filter(skill__owner=user).order_by('id').values(
+            'id', 'skill_id', 'title', 'link', 'approved',
+        )),
+    )
+
+
+def stream_export(user, chunk_size=EXPORT_CHUNK_SIZE):
+    # Yields a ZIP archive piece by piece, so memory use does not depend on the size of the account
+    buffer = StreamBuffer()
+    encoder = DjangoJSONEncoder()
+    profile = Profile.objects.filter(user=user).first()
+
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('profile.json', encoder.encode({
+            'username': user.username,
+            'email': user.email,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'date_joined': user.date_joined,
+            'bio': profile.bio if profile else None,
+            'is_approved': profile.is_approved if profile else False,
+            'avatar': profile.avatar.name if profile and profile.avatar else None,
+        }))
+        yield buffer.drain()
+
+        for name, rows in export_tables(user):
+            with archive.open(name, 'w', force_zip64=True) as entry:
+                for row in rows.iterator(chunk_size=chunk_size):
+                    entry.write(encoder.encode(row).encode() + b'\n')
+                    if buffer.size >= EXPORT_FLUSH_BYTES:
+                        yield buffer.drain()
+            yield buffer.drain()
+
+        if profile and profile.avatar:
+            avatar_name = f'avatar/{os.path.basename(profile.avatar.name)}'
+            try:
+                with profile.avatar.open('rb') as avatar:
+                    with archive.open(avatar_name, 'w', force_zip64=True) as entry:
+                        for chunk in avatar.chunks():
+                            entry.write(chunk)
+                            yield buffer.drain()
+            except FileNotFoundError:
+                archive.writestr('avatar/MISSING.txt', f'{profile.avatar.name} is no longer in storage.\n')
+
+    yield buffer.drain()
+
+
+def export_filename(user):
+    return f'skillhub-export-{user.username}.zip'
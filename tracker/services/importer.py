@@ -0,0 +1,229 @@
+import csv
+import json
+import time
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from tracker.models import Skill, LearningGoal, ProgressUpdate
+from tracker.services.analytics import rebuild_progress_daily
+from tracker.services.dashboard import invalidate_dashboard
+
+IMPORT_CHUNK_SIZE = 2000
+IMPORT_FORMATS = ('jsonl', 'csv')
+MAX_REPORTED_ERRORS = 20
+
+
+class ImportResult:
+    def __init__(self):
+        self.skills = 0
+        self.goals = 0
+        self.updates = 0
+        self.skipped = 0
+        self.errors = []
+        self.elapsed = 0.0
+
+    @property
+    def rows(self):
+        return self.skills + self.goals + self.updates
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def add_error(self, line, message):
+        self.skipped += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"Line {line}: {message}")
+
+
+def read_jsonl(stream):
+    # Lines are decoded by the importer so a malformed line is reported instead of aborting the import
+    for line in stream:
+        line = line.strip()
+        yield line or None
+
+
+def read_csv(stream):
+    # CSV rows use a single "parent" column for the skill of a goal and the goal of a progress entry
+    for row in csv.DictReader(stream):
+        record = {key: value for key, value in row.items() if key and value not in (None, '')}
+        parent = record.pop('parent', None)
+        if record.get('type') == 'goal':
+            record['skill'] = parent
+        elif record.get('type') == 'progress':
+            record['goal'] = parent
+        yield record
+
+
+# Streams skill, goal and progress records into the database for one owner.
+# Records are written with bulk_create in chunks, each chunk in its own transaction. Goals point at
+# skills and progress entries at goals through the "ref" of an earlier record; only those ref -> id
+# maps stay in memory, so the length of the progress history does not affect memory use.
+class TrackerImporter:
+    def __init__(self, owner, chunk_size=IMPORT_CHUNK_SIZE):
+        self.owner = owner
+        self.chunk_size = chunk_size
+        self.result = ImportResult()
+        self.skill_ids = {}
+        self.goal_ids = {}
+        self.pending_refs = {'skill': set(), 'goal': set()}
+        self.pending_skills = []
+        self.pending_goals = []
+        self.pending_updates = []
+
+    def run(self, records):
+        started = time.perf_counter()
+
+        for line, record in enumerate(records, start=1):
+            if record is None:
+                continue
+            try:
+                self.add(record)
+            except (ValidationError, ValueError, TypeError, KeyError) as error:
+                self.result.add_error(line, self.describe(error))
+                continue
+
+            if self.pending_count >= self.chunk_size:
+                self.flush()
+
+        self.flush()
+        self.finish()
+        self.result.elapsed = time.perf_counter() - started
+        return self.result
+
+    @property
+    def pending_count(self):
+        return len(self.pending_skills) + len(self.pending_goals) + len(self.pending_updates)
+
+    def add(self, record):
+        if isinstance(record, str):
+            record = json.loads(record)
+        if not isinstance(record, dict):
+            raise ValueError("Expected a JSON object.")
+
+        kind = record.get('type')
+        if kind == 'skill':
+            self.add_skill(record)
+        elif kind == 'goal':
+            self.add_goal(record)
+        elif kind == 'progress':
+            self.add_update(record)
+        else:
+            raise ValueError(f"Unknown record type {kind!r}.")
+
+    def add_skill(self, record):
+        ref = self.require_new_ref(record, 'skill', self.skill_ids)
+        skill = Skill(
+            name=record.get('name', ''),
+            description=record.get('description', ''),
+            category=record.get('category', ''),
+            difficulty=record.get('difficulty', ''),
+            owner=self.owner,
+        )
+        skill.full_clean(exclude=['owner'], validate_unique=False, validate_constraints=False)
+        self.pending_skills.append((ref, skill))
+        self.pending_refs['skill'].add(ref)
+
+    def add_goal(self, record):
+        ref = self.require_new_ref(record, 'goal', self.goal_ids)
+        skill_ref = self.require_known_ref(record, 'skill', self.skill_ids)
+        goal = LearningGoal(
+            name=record.get('name', ''),
+            description=record.get('description', ''),
+            target_date=parse_date(str(record.get('target_date', ''))),
+        )
+        goal.full_clean(exclude=['skill'], validate_unique=False, validate_constraints=False)
+        self.pending_goals.append((ref, skill_ref, goal))
+        self.pending_refs['goal'].add(ref)
+
+    def add_update(self, record):
+        goal_ref = self.require_known_ref(record, 'goal', self.goal_ids)
+        date = parse_datetime(str(record['date'])) if record.get('date') else timezone.now()
+        if date is None:
+            raise ValueError(f"Invalid date {record['date']!r}.")
+        if timezone.is_naive(date):
+            date = timezone.make_aware(date)
+
+        update = ProgressUpdate(
+            progress=int(record.get('progress', 0)),
+            update_text=record.get('update_text', ''),
+            date=date,
+        )
+        update.full_clean(exclude=['goal'], validate_unique=False, validate_constraints=False)
+        self.pending_updates.append((goal_ref, update))
+
+    def require_new_ref(self, record, kind, known):
+        ref = str(record.get('ref') or '')
+        if not ref:
+            raise ValueError("Missing ref.")
+        if ref in known or ref in self.pending_refs[kind]:
+            raise ValueError(f"Duplicate {kind} ref {ref!r}.")
+        return ref
+
+    def require_known_ref(self, record, kind, known):
+        ref = str(record.get(kind) or '')
+        if ref not in known and ref not in self.pending_refs[kind]:
+            raise ValueError(f"Unknown {kind} ref {ref!r}.")
+        return ref
+
+    def flush(self):
+        if not self.pending_count:
+            return
+
+        # Parents are written first so children of the same chunk can resolve their ids
+        with transaction.atomic():
+            if self.pending_skills:
+                skills = Skill.objects.bulk_create([skill for _, skill in self.pending_skills])
+                for (ref, _), skill in zip(self.pending_skills, skills):
+                    self.skill_ids[ref] = skill.pk
+                self.result.skills += len(skills)
+
+            if self.pending_goals:
+                for _, skill_ref, goal in self.pending_goals:
+                    goal.skill_id = self.skill_ids[skill_ref]
+                goals = LearningGoal.objects.bulk_create([goal for _, _, goal in self.pending_goals])
+                for (ref, _, _), goal in zip(self.pending_goals, goals):
+                    self.goal_ids[ref] = goal.pk
+                self.result.goals += len(goals)
+
+            if self.pending_updates:
+                for goal_ref, update in self.pending_updates:
+                    update.goal_id = self.goal_ids[goal_ref]
+                ProgressUpdate.objects.bulk_create([update for _, update in self.pending_updates])
+                self.result.updates += len(self.pending_updates)
+
+        self.pending_skills = []
+        self.pending_goals = []
+        self.pending_updates = []
+        self.pending_refs = {'skill': set(), 'goal': set()}
+
+    def finish(self):
+        # Goal progress is computed once per imported goal instead of once per progress entry
+        goal_ids = list(self.goal_ids.values())
+        for start in range(0, len(goal_ids), self.chunk_size):
+            LearningGoal.objects.filter(pk__in=goal_ids[start:start + self.chunk_size]).reconcile_progress()
+
+        # bulk_create sends no model signals
+        invalidate_dashboard(self.owner.pk)
+        for start in range(0, len(goal_ids), self.chunk_size):
+            rebuild_progress_daily(goal_ids=goal_ids[start:start + self.chunk_size])
+
+    @staticmethod
+    def describe(error):
+        if isinstance(error, ValidationError):
+            return '; '.join(
+                f"{field}: {' '.join(messages)}" for field, messages in error.message_dict.items()
+            ) if hasattr(error, 'error_dict') else ' '.join(error.messages)
+        if isinstance(error, KeyError):
+            return f"Missing field {error.args[0]!r}."
+        return str(error)
+
+
+def import_tracker_data(owner, stream, file_format='jsonl', chunk_size=IMPORT_CHUNK_SIZE):
+    if file_format not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported format {file_format!r}.")
+    records = read_jsonl(stream) if file_format == 'jsonl' else read_csv(stream)
+    return TrackerImporter(owner, chunk_size=chunk_size).run(records)
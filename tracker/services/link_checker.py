@@ -0,0 +1,239 @@
+import asyncio
+import hashlib
+import ssl
+from collections import defaultdict
+from urllib.parse import quote, urljoin, urlsplit
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from tracker.models import Resource
+
+USER_AGENT = 'SkillHub-LinkChecker/1.0'
+MAX_REDIRECTS = 5
+MAX_HEADER_LINES = 100
+MAX_RETRY_AFTER = 30
+RETRY_STATUSES = {429, 502, 503, 504}
+# Servers that do not implement HEAD are asked again with GET; only the headers are read
+HEAD_UNSUPPORTED_STATUSES = {405, 501}
+
+
+class LinkCheckError(Exception):
+    pass
+
+
+class LinkResult:
+    def __init__(self, url, status_code=None, final_url='', error=''):
+        self.url = url
+        self.status_code = status_code
+        self.final_url = final_url or url
+        self.error = error
+
+    @property
+    def status(self):
+        if self.status_code is None:
+            return Resource.LINK_UNREACHABLE
+        if self.status_code >= 400:
+            return Resource.LINK_BROKEN
+        if self.final_url != self.url:
+            return Resource.LINK_REDIRECTED
+        return Resource.LINK_OK
+
+    def as_fields(self):
+        return {
+            'link_status': self.status,
+            'link_status_code': self.status_code,
+            'link_final_url': self.final_url[:2000],
+            'link_error': self.error[:255],
+        }
+
+    @classmethod
+    def from_fields(cls, url, fields):
+        return cls(url, fields['link_status_code'], fields['link_final_url'], fields['link_error'])
+
+
+def host_key(url):
+    parts = urlsplit(url)
+    return parts.scheme, parts.hostname, parts.port
+
+
+# Characters that keep their meaning in a path or query; '%' so already-encoded URLs stay as they are
+URL_SAFE_CHARACTERS = "/?:@!$&'()*+,;=-._~%"
+
+
+def request_target(parts):
+    # Non-ASCII characters in the path and query are sent UTF-8 percent-encoded
+    target = quote(parts.path or '/', safe=URL_SAFE_CHARACTERS)
+    if parts.query:
+        target = f"{target}?{quote(parts.query, safe=URL_SAFE_CHARACTERS)}"
+    return target
+
+
+def ascii_hostname(parts):
+    # Internationalised domain names are looked up and sent in their IDNA (xn--) form
+    return parts.hostname.encode('idna').decode('ascii')
+
+
+def host_header(parts):
+    host = ascii_hostname(parts)
+    return host if parts.port is None else f'{host}:{parts.port}'
+
+
+async def send_request(url, method, timeout):
+    # Minimal HTTP/1.1 client: sends one request and returns the status code and headers
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        raise LinkCheckError(f"Unsupported URL: {url}")
+
+    secure = parts.scheme == 'https'
+    port = parts.port or (443 if secure else 80)
+    hostname = ascii_hostname(parts)
+    context = ssl.create_default_context() if secure else None
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(hostname, port, ssl=context, server_hostname=hostname if secure else None),
+        timeout,
+    )
+    try:
+        writer.write(
+            f'{method} {request_target(parts)} HTTP/1.1\r\n'
+            f'Host: {host_header(parts)}\r\n'
+            f'User-Agent: {USER_AGENT}\r\n'
+            'Accept: */*\r\n'
+            'Connection: close\r\n\r\n'.encode('latin-1')
+        )
+        await writer.drain()
+
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+        try:
+            status_code = int(status_line.split()[1])
+        except (IndexError, ValueError):
+            raise LinkCheckError(f"Invalid response: {status_line[:80]!r}")
+
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await asyncio.wait_for(reader.readline(), timeout)
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        return status_code, headers
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except (OSError, ssl.SSLError):
+            pass
+
+
+def retry_delay(attempt, headers=None):
+    retry_after = (headers or {}).get('retry-after', '')
+    if retry_after.isdigit():
+        return min(int(retry_after), MAX_RETRY_AFTER)
+    return settings.LINK_CHECK_BACKOFF * 2 ** attempt
+
+
+class LinkChecker:
+    # Probes links concurrently, with a global limit and a smaller limit per host. A request takes its
+    # host's slot before a global one, so links queued behind a busy host do not hold global slots
+    # that links to other hosts could use
+    def __init__(self, concurrency=None, per_host=None, timeout=None, retries=None):
+        self.concurrency = concurrency or settings.LINK_CHECK_CONCURRENCY
+        self.per_host = per_host or settings.LINK_CHECK_PER_HOST
+        self.timeout = timeout or settings.LINK_CHECK_TIMEOUT
+        self.retries = settings.LINK_CHECK_RETRIES if retries is None else retries
+
+    async def fetch(self, url):
+        # Follows redirects and returns (status code, final URL)
+        method = 'HEAD'
+        for _ in range(MAX_REDIRECTS + 1):
+            async with self.host_limits[host_key(url)], self.limit:
+                status_code, headers = await self.request_with_retries(url, method)
+            if method == 'HEAD' and status_code in HEAD_UNSUPPORTED_STATUSES:
+                method = 'GET'
+                continue
+            if 300 <= status_code < 400 and headers.get('location'):
+                url = urljoin(url, headers['location'])
+                continue
+            return status_code, url
+        raise LinkCheckError("Too many redirects.")
+
+    async def request_with_retries(self, url, method):
+        for attempt in range(self.retries + 1):
+            try:
+                status_code, headers = await send_request(url, method, self.timeout)
+            except (OSError, asyncio.TimeoutError, ssl.SSLError):
+                if attempt == self.retries:
+                    raise
+                await asyncio.sleep(retry_delay(attempt))
+                continue
+            if status_code in RETRY_STATUSES and attempt < self.retries:
+                await asyncio.sleep(retry_delay(attempt, headers))
+                continue
+            return status_code, headers
+
+    async def check(self, url):
+        try:
+            status_code, final_url = await self.fetch(url)
+        except asyncio.TimeoutError:
+            return LinkResult(url, error="Timed out.")
+        except (OSError, ssl.SSLError, LinkCheckError) as error:
+            return LinkResult(url, error=str(error) or type(error).__name__)
+        except (UnicodeError, ValueError) as error:
+            # Malformed URLs (bad port, host that is not valid IDNA) fail this link only
+            return LinkResult(url, error=f"Invalid URL: {error}")
+        return LinkResult(url, status_code, final_url)
+
+    async def check_all(self, urls):
+        self.limit = asyncio.Semaphore(self.concurrency)
+        self.host_limits = defaultdict(lambda: asyncio.Semaphore(self.per_host))
+        return await asyncio.gather(*(self.check(url) for url in urls))
+
+    def run(self, urls):
+        return asyncio.run(self.check_all(urls))
+
+
+def link_cache_key(url):
+    return f'tracker:link:{hashlib.sha256(url.encode()).hexdigest()}'
+
+
+def resources_due(max_age=None):
+    # Links that were never checked or were checked longer ago than `max_age` seconds
+    max_age = settings.LINK_CHECK_MAX_AGE if max_age is None else max_age
+    cutoff = timezone.now() - timezone.timedelta(seconds=max_age)
+    return Resource.objects.filter(Q(link_checked_at__isnull=True) | Q(link_checked_at__lt=cutoff))
+
+
+def check_resource_links(resources=None, max_age=None, checker=None):
+    # Checks each distinct link once and saves the result on every resource that uses it
+    max_age = settings.LINK_CHECK_MAX_AGE if max_age is None else max_age
+    resources = list((resources_due(max_age) if resources is None else resources).only('id', 'link'))
+    if not resources:
+        return {}
+
+    urls = {resource.link for resource in resources}
+    results = {}
+    if max_age:
+        # Another resource with the same link may have been checked recently
+        cached = cache.get_many([link_cache_key(url) for url in urls])
+        for url in urls:
+            if link_cache_key(url) in cached:
+                results[url] = LinkResult.from_fields(url, cached[link_cache_key(url)])
+
+    checked = (checker or LinkChecker()).run(sorted(urls - set(results)))
+    if max_age:
+        cache.set_many({link_cache_key(result.url): result.as_fields() for result in checked}, timeout=max_age)
+    results.update((result.url, result) for result in checked)
+
+    now = timezone.now()
+    for resource in resources:
+        for field, value in results[resource.link].as_fields().items():
+            setattr(resource, field, value)
+        resource.link_checked_at = now
+    Resource.objects.bulk_update(
+        resources,
+        ['link_status', 'link_status_code', 'link_final_url', 'link_error', 'link_checked_at'],
+        batch_size=500,
+    )
+    return results
@@ -0,0 +1,57 @@
+from django.db.models import F, Prefetch, Window
+from django.db.models.functions import RowNumber
+
+from tracker.models import Skill, LearningGoal, ProgressUpdate, Resource
+
+PROFILE_UPDATES_PER_GOAL = 5
+
+
+def recent_updates_queryset(user, limit):
+    # Newest `limit` updates of every goal of the user in one query
+    return ProgressUpdate.objects.filter(goal__skill__owner=user).annotate(
+        row_number=Window(
+            RowNumber(),
+            partition_by=F('goal_id'),
+            order_by=(F('date').desc(), F('id').desc()),
+        ),
+    ).filter(row_number__lte=limit).only('id', 'goal_id', 'progress', 'update_text', 'date').order_by(
+        'goal_id', '-date', '-id',
+    )
+
+
+def recent_updates_by_goal(user, limit):
+    # One extra row per goal tells us whether there is more history to load
+    updates = recent_updates_queryset(user, limit + 1)
+
+    grouped = {}
+    for update in updates:
+        grouped.setdefault(update.goal_id, []).append(update)
+    return grouped
+
+
+def build_profile_context(user, updates_per_goal=PROFILE_UPDATES_PER_GOAL):
+    # Four queries regardless of how many skills, goals or updates the user has
+    skills = list(
+        Skill.objects.filter(owner=user).with_progress_stats().prefetch_related(
+            Prefetch('learninggoal_set', queryset=LearningGoal.objects.order_by('target_date'), to_attr='goals'),
+            Prefetch('resource_set', queryset=Resource.objects.filter(approved=True), to_attr='approved_resources'),
+        )
+    )
+    updates = recent_updates_by_goal(user, updates_per_goal)
+
+    goals = []
+    for skill in skills:
+        skill.has_updates = False
+        for goal in skill.goals:
+            recent = updates.get(goal.id, [])
+            goal.recent_updates = recent[:updates_per_goal]
+            goal.has_more_updates = len(recent) > updates_per_goal
+            skill.has_updates = skill.has_updates or bool(recent)
+            goals.append(goal)
+
+    return {
+        'skills': skills,
+        'goals': goals,
+        'skills_with_updates': [skill for skill in skills if skill.has_updates],
+        'skills_with_resources': [skill for skill in skills if skill.approved_resources],
+    }
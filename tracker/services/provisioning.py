@@ -0,0 +1,190 @@
+import csv
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, User
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from tracker.models import Profile
+from tracker.services.importer import read_jsonl
+
+PROVISION_BATCH_SIZE = 1000
+PROVISION_FORMATS = ('jsonl', 'csv')
+MAX_REPORTED_ERRORS = 20
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'on'}
+
+
+class ProvisioningError(Exception):
+    pass
+
+
+class ProvisionResult:
+    def __init__(self):
+        self.created = 0
+        self.skipped = 0
+        self.errors = []
+        self.elapsed = 0.0
+
+    @property
+    def users_per_second(self):
+        return self.created / self.elapsed if self.elapsed else 0.0
+
+    def add_error(self, line, message):
+        self.skipped += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"Line {line}: {message}")
+
+
+def read_user_csv(stream):
+    for row in csv.DictReader(stream):
+        yield {key: value for key, value in row.items() if key and value not in (None, '')}
+
+
+def _init_hasher():
+    # Worker processes may be spawned rather than forked, so settings and apps are loaded here
+    django.setup()
+
+
+def hash_passwords(passwords):
+    # Users without a password get an unusable one, as create_user(password=None) does
+    return [make_password(password) for password in passwords]
+
+
+def as_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in TRUE_VALUES
+
+
+def admin_group_name(user):
+    # Same rule as the assign_admin_group signal handler
+    if user.is_superuser:
+        return 'SuperAdmin'
+    if user.is_staff:
+        return 'StaffAdmin'
+    return None
+
+
+# Creates users with their Profile rows and admin group memberships using bulk_create, so the
+# per-user post_save handlers (and their queries) do not run; the end state is the same as theirs.
+# Password hashing is CPU bound and runs in a process pool, one batch ahead of the database writes.
+class UserProvisioner:
+    def __init__(self, batch_size=PROVISION_BATCH_SIZE, workers=None):
+        self.batch_size = batch_size
+        self.workers = workers
+        self.result = ProvisionResult()
+        self.seen_usernames = set()
+        self.groups = dict(Group.objects.filter(name__in=('SuperAdmin', 'StaffAdmin')).values_list('name', 'pk'))
+
+    def build_user(self, line, record):
+        if record is None:
+            return None
+        if isinstance(record, str):
+            try:
+                record = json.loads(record)
+            except json.JSONDecodeError as error:
+                self.result.add_error(line, f"Invalid JSON ({error.msg}).")
+                return None
+        if not isinstance(record, dict):
+            self.result.add_error(line, "Expected an object.")
+            return None
+
+        username = User.normalize_username(str(record.get('username') or '').strip())
+        if username in self.seen_usernames:
+            self.result.add_error(line, f"Duplicate username {username!r}.")
+            return None
+
+        user = User(
+            username=username,
+            email=User.objects.normalize_email(record.get('email') or ''),
+            first_name=record.get('first_name') or '',
+            last_name=record.get('last_name') or '',
+            is_staff=as_bool(record.get('is_staff', False)),
+            is_superuser=as_bool(record.get('is_superuser', False)),
+        )
+        try:
+            user.full_clean(exclude=['password'], validate_unique=False)
+        except ValidationError as error:
+            self.result.add_error(line, ' '.join(
+                f"{field}: {' '.join(messages)}" for field, messages in error.message_dict.items()
+            ))
+            return None
+
+        group_name = admin_group_name(user)
+        if group_name and group_name not in self.groups:
+            raise ProvisioningError(f"Group {group_name!r} does not exist; run migrate first.")
+
+        self.seen_usernames.add(username)
+        return user, record.get('password')
+
+    def batches(self, records):
+        batch = []
+        for line, record in enumerate(records, start=1):
+            built = self.build_user(line, record)
+            if built is None:
+                continue
+            batch.append(built)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def write(self, batch, hashed):
+        users = []
+        for (user, _), password in zip(batch, hashed):
+            user.password = password
+            users.append(user)
+
+        with transaction.atomic():
+            existing = set(User.objects.filter(username__in=[user.username for user in users]).values_list('username', flat=True))
+            users = [user for user in users if user.username not in existing]
+            self.result.skipped += len(existing)
+
+            User.objects.bulk_create(users)
+            Profile.objects.bulk_create([Profile(user=user) for user in users])
+            membership = User.groups.through
+            membership.objects.bulk_create([
+                membership(user_id=user.pk, group_id=self.groups[admin_group_name(user)])
+                for user in users
+                if admin_group_name(user)
+            ])
+        self.result.created += len(users)
+
+    def run(self, records):
+        started = time.monotonic()
+        if not self.workers:
+            for batch in self.batches(records):
+                self.write(batch, hash_passwords([password for _, password in batch]))
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_hasher) as executor:
+                # Keeps a few batches hashing while the oldest one is written
+                pending = deque()
+                for batch in self.batches(records):
+                    pending.append((batch, executor.submit(hash_passwords, [password for _, password in batch])))
+                    if len(pending) > self.workers:
+                        batch, future = pending.popleft()
+                        self.write(batch, future.result())
+                while pending:
+                    batch, future = pending.popleft()
+                    self.write(batch, future.result())
+
+        self.result.elapsed = time.monotonic() - started
+        return self.result
+
+
+def provision_users(records, batch_size=PROVISION_BATCH_SIZE, workers=None):
+    # `records` is an iterable of dicts (username, email, password, first_name, last_name, is_staff, is_superuser)
+    return UserProvisioner(batch_size=batch_size, workers=workers).run(records)
+
+
+def provision_users_from_stream(stream, file_format='jsonl', batch_size=PROVISION_BATCH_SIZE, workers=None):
+    if file_format not in PROVISION_FORMATS:
+        raise ValueError(f"Unsupported format {file_format!r}.")
+    records = read_jsonl(stream) if file_format == 'jsonl' else read_user_csv(stream)
+    return provision_users(records, batch_size=batch_size, workers=workers)
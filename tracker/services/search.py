@@ -0,0 +1,104 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import CharField, F, Value
+
+from tracker.models import Skill, LearningGoal, Resource
+
+SEARCH_RESULTS_LIMIT = 30
+SEARCH_KINDS = ('skill', 'goal', 'resource')
+TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+
+class SearchHit:
+    def __init__(self, kind, object_id, title, skill_id, rank):
+        self.kind = kind
+        self.object_id = object_id
+        self.title = title
+        self.skill_id = skill_id
+        self.rank = rank
+
+
+def search_terms(query):
+    # Only word characters reach the database, so user input never changes the query syntax
+    return TERM_RE.findall(query or '')[:10]
+
+
+def prefix_query(terms):
+    # Every term has to match, as a word prefix ("pyth" finds "python")
+    return SearchQuery(
+        ' & '.join(f'{term}:*' for term in terms),
+        search_type='raw',
+        config='simple',
+    )
+
+
+def fts5_query(terms):
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def _owned(kind, user):
+    if kind == 'skill':
+        return Skill.objects.filter(owner=user)
+    if kind == 'goal':
+        return LearningGoal.objects.filter(skill__owner=user)
+    return Resource.objects.filter(skill__owner=user)
+
+
+def _postgresql_search(user, terms, limit):
+    query = prefix_query(terms)
+    columns = {
+        'skill': (F('name'), F('id')),
+        'goal': (F('name'), F('skill_id')),
+        'resource': (F('title'), F('skill_id')),
+    }
+    rows = None
+    for kind in SEARCH_KINDS:
+        title, skill_id = columns[kind]
+        matches = _owned(kind, user).filter(search_vector=query).annotate(
+            kind=Value(kind, output_field=CharField()),
+            hit_title=title,
+            hit_skill_id=skill_id,
+            rank=SearchRank(F('search_vector'), query),
+        ).values_list('kind', 'id', 'hit_title', 'hit_skill_id', 'rank').order_by()
+        rows = matches if rows is None else rows.union(matches, all=True)
+    # One UNION ALL query over the three GIN-indexed tables
+    return [SearchHit(*row) for row in rows.order_by('-rank', 'kind', 'id')[:limit]]
+
+
+def _sqlite_search(user, terms, limit):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT kind, object_id, title, skill_id, -bm25(tracker_search, 0, 0, 0, 0, 10.0, 1.0) AS rank "
+            "FROM tracker_search WHERE tracker_search MATCH %s AND owner_id = %s "
+            "ORDER BY rank DESC, kind, object_id LIMIT %s",
+            [fts5_query(terms), user.pk, limit],
+        )
+        return [SearchHit(*row) for row in cursor.fetchall()]
+
+
+def search(user, query, limit=SEARCH_RESULTS_LIMIT):
+    # Ranked full-text search over the user's skills, goals and resources
+    terms = search_terms(query)
+    if not terms:
+        return []
+    if connection.vendor == 'postgresql':
+        return _postgresql_search(user, terms, limit)
+    return _sqlite_search(user, terms, limit)
+
+
+def search_filter(queryset, kind, query):
+    # Narrows an existing queryset (e.g. in the admin) to rows matching `query`
+    terms = search_terms(query)
+    if not terms:
+        return queryset
+    if connection.vendor == 'postgresql':
+        return queryset.filter(search_vector=prefix_query(terms))
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT object_id FROM tracker_search WHERE tracker_search MATCH %s AND kind = %s",
+            [fts5_query(terms), kind],
+        )
+        return queryset.filter(pk__in=[row[0] for row in cursor.fetchall()])
@@ -0,0 +1,122 @@
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Count, Q
+from django.utils import timezone
+
+from tracker.models import Skill, LearningGoal, CategoryStat, DifficultyStat, LeaderboardEntry, StatsSnapshot
+
+LEADERBOARD_SIZE = 50
+
+COMPLETED = Q(progress__gte=100)
+
+
+def category_stats(now):
+    skills = Skill.objects.values('category').annotate(
+        skill_count=Count('id'),
+        learner_count=Count('owner', distinct=True),
+    ).order_by()
+    goals = {
+        row['skill__category']: row
+        for row in LearningGoal.objects.values('skill__category').annotate(
+            goal_count=Count('id'),
+            completed_goal_count=Count('id', filter=COMPLETED),
+        ).order_by()
+    }
+    return [
+        CategoryStat(
+            category=row['category'],
+            skill_count=row['skill_count'],
+            learner_count=row['learner_count'],
+            goal_count=goals.get(row['category'], {}).get('goal_count', 0),
+            completed_goal_count=goals.get(row['category'], {}).get('completed_goal_count', 0),
+            refreshed_at=now,
+        )
+        for row in skills
+    ]
+
+
+def difficulty_stats(now):
+    skills = Skill.objects.values('difficulty').annotate(skill_count=Count('id')).order_by()
+    goals = {
+        row['skill__difficulty']: row
+        for row in LearningGoal.objects.values('skill__difficulty').annotate(
+            goal_count=Count('id'),
+            completed_goal_count=Count('id', filter=COMPLETED),
+            avg_progress=Avg('progress'),
+        ).order_by()
+    }
+    return [
+        DifficultyStat(
+            difficulty=row['difficulty'],
+            skill_count=row['skill_count'],
+            goal_count=goals.get(row['difficulty'], {}).get('goal_count', 0),
+            completed_goal_count=goals.get(row['difficulty'], {}).get('completed_goal_count', 0),
+            avg_progress=goals.get(row['difficulty'], {}).get('avg_progress') or 0,
+            refreshed_at=now,
+        )
+        for row in skills
+    ]
+
+
+def leaderboard(now, size=LEADERBOARD_SIZE):
+    # Most completed goals first, then highest average progress; ties go to the older account
+    rows = LearningGoal.objects.values('skill__owner').annotate(
+        completed_goal_count=Count('id', filter=COMPLETED),
+        avg_progress=Avg('progress'),
+    ).filter(completed_goal_count__gt=0).order_by('-completed_goal_count', '-avg_progress', 'skill__owner')[:size]
+    return [
+        LeaderboardEntry(
+            rank=rank,
+            user_id=row['skill__owner'],
+            completed_goal_count=row['completed_goal_count'],
+            avg_progress=row['avg_progress'] or 0,
+            refreshed_at=now,
+        )
+        for rank, row in enumerate(rows, start=1)
+    ]
+
+
+def locked_marker(skip_locked=False):
+    # Row lock on the marker, held until the surrounding transaction ends; with skip_locked,
+    # None means another process holds it. A no-op on SQLite, which serialises writers anyway.
+    StatsSnapshot.objects.get_or_create(pk=StatsSnapshot.SINGLETON_ID)
+    return StatsSnapshot.objects.select_for_update(skip_locked=skip_locked).filter(pk=StatsSnapshot.SINGLETON_ID).first()
+
+
+def rebuild_snapshot(marker, now=None):
+    now = now or timezone.now()
+    categories, difficulties, entries = category_stats(now), difficulty_stats(now), leaderboard(now)
+    for model, rows in ((CategoryStat, categories), (DifficultyStat, difficulties), (LeaderboardEntry, entries)):
+        model.objects.all().delete()
+        model.objects.bulk_create(rows)
+    marker.refreshed_at = now
+    marker.save(update_fields=['refreshed_at'])
+    return {'categories': len(categories), 'difficulties': len(difficulties), 'leaderboard': len(entries)}
+
+
+def refresh_stats(now=None):
+    # Recomputes every snapshot with a handful of GROUP BY queries and swaps them in atomically,
+    # so readers see either the previous snapshot or the new one, never a mix
+    with transaction.atomic():
+        return rebuild_snapshot(locked_marker(), now)
+
+
+def stats_refreshed_at():
+    return StatsSnapshot.objects.filter(pk=StatsSnapshot.SINGLETON_ID).values_list('refreshed_at', flat=True).first()
+
+
+def stats_are_stale(refreshed_at, now=None, max_age=None):
+    max_age = settings.STATS_MAX_AGE if max_age is None else max_age
+    return refreshed_at is None or (now or timezone.now()) - refreshed_at > datetime.timedelta(seconds=max_age)
+
+
+def refresh_stats_if_stale(max_age=None):
+    # Skips the rebuild while the snapshot is fresh or another process is already rebuilding it;
+    # the lock is a database row lock, so it holds across processes and hosts
+    with transaction.atomic():
+        marker = locked_marker(skip_locked=True)
+        if marker is None or not stats_are_stale(marker.refreshed_at, max_age=max_age):
+            return None
+        return rebuild_snapshot(marker)
@@ -1,42 +1,29 @@
-from django.apps import apps
-from django.contrib.auth.models import Group, Permission
-from django.db.models.signals import post_migrate
+from django.contrib.auth.models import Group
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete
 from django.dispatch import receiver
-from django.contrib.contenttypes.models import ContentType
-
-@receiver(post_migrate)
-def create_admin_groups(sender, **kwargs):
-    # Defining groups and permissions that need to be assigned
-    superadmin_group, _ = Group.objects.get_or_create(name='SuperAdmin')
-    staffadmin_group, _ = Group.objects.get_or_create(name='StaffAdmin')
-
-    # Provide each SuperAdmin user all permissions to all models
-    for model in apps.get_models():
-        ct = ContentType.objects.get_for_model(model)
-        perms = Permission.objects.filter(content_type=ct)
-        superadmin_group.permissions.add(*perms)
-
-    # Provide each StaffAdmin with limited permissions
-    # They can add, view and change Skill, LearningGoal and ProgressUpdate, but can not delete or manage users
-    allowed_models = ['skill', 'learninggoal', 'progressupdate']
-    allowed_actions = ['add', 'change', 'view']
-
-    for model_name in allowed_models:
-        model = apps.get_model('tracker', model_name)
-        ct = ContentType.objects.get_for_model(model)
-        for action in allowed_actions:
-            try:
-                perm = Permission.objects.get(content_type=ct, codename=f'{action}_{model_name}')
-                staffadmin_group.permissions.add(perm)
-            except Permission.DoesNotExist:
-                pass
+
+from tracker.auth_backends import evict_cached_user
+from tracker.permissions import sync_group_permissions
+
+def create_admin_groups(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    # Connected for the tracker app only (see TrackerConfig.ready), so this runs once per migrate,
+    # after the permissions of the contrib apps listed before it have been created. Only adds, so
+    # permissions granted by hand are kept
+    sync_group_permissions(using=using)
 
 
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, pre_save
 
 User = get_user_model()
 
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def evict_user(sender, instance, **kwargs):
+    evict_cached_user(instance.pk)
+
 @receiver(post_save, sender=User)
 def assign_admin_group(sender, instance, created, **kwargs):
     if created:
@@ -46,3 +33,111 @@ def assign_admin_group(sender, instance, created, **kwargs):
         elif instance.is_staff:
             group = Group.objects.get(name='StaffAdmin')
             instance.groups.add(group)
+
+
+from django.db import transaction
+from django.utils import timezone
+
+from tracker.avatars import release_avatars
+from tracker.models import Skill, LearningGoal, ProgressUpdate, Resource, Profile, RequestProfile
+from tracker.services.analytics import record_progress, refresh_goal_day
+from tracker.services.dashboard import bump_skill_versions, invalidate_dashboard
+
+
+def _is_cascade(sender, origin):
+    # Cascaded deletes are already invalidated by the handler of the model that started them
+    if origin is None:
+        return False
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return origin_model is not sender
+
+
+def _skill_owner_id(skill_id):
+    return Skill.objects.filter(pk=skill_id).values_list('owner_id', flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=Skill)
+def invalidate_skill_dashboard(sender, instance, origin=None, **kwargs):
+    invalidate_dashboard(instance.owner_id)
+    bump_skill_versions(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=LearningGoal)
+def invalidate_goal_dashboard(sender, instance, origin=None, **kwargs):
+    if _is_cascade(sender, origin):
+        return
+    if LearningGoal.skill.is_cached(instance):
+        invalidate_dashboard(instance.skill.owner_id)
+    else:
+        invalidate_dashboard(_skill_owner_id(instance.skill_id))
+    bump_skill_versions(instance.skill_id)
+
+
+@receiver(pre_save, sender=ProgressUpdate)
+def remember_progress_origin(sender, instance, raw=False, update_fields=None, **kwargs):
+    # The goal and date the row had before an edit, so moving it (e.g. in the admin) also
+    # recounts the goal and day it left
+    instance._rollup_origin = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    if update_fields is not None and not {'goal', 'goal_id', 'date'} & set(update_fields):
+        return
+    instance._rollup_origin = ProgressUpdate.objects.filter(pk=instance.pk).values_list('goal_id', 'date').first()
+
+
+@receiver([post_save, post_delete], sender=ProgressUpdate)
+def invalidate_progress_dashboard(sender, instance, origin=None, created=False, **kwargs):
+    if _is_cascade(sender, origin):
+        return
+    if ProgressUpdate.goal.is_cached(instance) and LearningGoal.skill.is_cached(instance.goal):
+        skill_id, owner_id = instance.goal.skill_id, instance.goal.skill.owner_id
+    else:
+        skill = Skill.objects.filter(learninggoal=instance.goal_id).values_list('pk', 'owner_id').first()
+        if skill is None:
+            return
+        skill_id, owner_id = skill
+    invalidate_dashboard(owner_id)
+    bump_skill_versions(skill_id)
+
+    # New updates are added to the daily rollup as a delta; edits and deletes recount their day
+    day = timezone.localdate(instance.date)
+    if created:
+        record_progress(owner_id, skill_id, instance.goal_id, day, instance.progress)
+        return
+    refresh_goal_day(instance.goal_id, day)
+
+    previous = getattr(instance, '_rollup_origin', None)
+    instance._rollup_origin = None
+    if previous is None:
+        return
+    previous_goal_id, previous_date = previous
+    previous_day = timezone.localdate(previous_date)
+    if (previous_goal_id, previous_day) != (instance.goal_id, day):
+        refresh_goal_day(previous_goal_id, previous_day)
+    if previous_goal_id != instance.goal_id:
+        previous_skill = Skill.objects.filter(learninggoal=previous_goal_id).values_list('pk', 'owner_id').first()
+        if previous_skill is not None:
+            invalidate_dashboard(previous_skill[1])
+            bump_skill_versions(previous_skill[0])
+
+
+@receiver([post_save, post_delete], sender=Resource)
+def invalidate_resource_dashboard(sender, instance, origin=None, **kwargs):
+    if _is_cascade(sender, origin):
+        return
+    invalidate_dashboard(_skill_owner_id(instance.skill_id))
+
+
+@receiver(post_delete, sender=Profile)
+def release_profile_avatar(sender, instance, **kwargs):
+    if instance.avatar:
+        name = instance.avatar.name
+        transaction.on_commit(lambda: release_avatars(name))
+
+
+@receiver(post_delete, sender=RequestProfile)
+def delete_request_profile_file(sender, instance, **kwargs):
+    if instance.file:
+        storage, name = instance.file.storage, instance.file.name
+        transaction.on_commit(lambda: storage.delete(name))
+
@@ -0,0 +1,128 @@
+import gzip
+import hashlib
+import os
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.storage import FileSystemStorage
+
+try:
+    import brotli
+except ImportError:  # Optional: without it only .gz variants are written
+    brotli = None
+
+HASH_CHUNK_SIZE = 64 * 1024
+CONTENT_NAME_RE = re.compile(r'^(?P<dir>.+/)?[0-9a-f]{2}/(?P<digest>[0-9a-f]{64})(?P<ext>\.\w+)?$')
+
+
+class _AlreadyStored(Exception):
+    pass
+
+
+def file_digest(content):
+    digest = hashlib.sha256()
+    for chunk in content.chunks(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_name(directory, digest, extension):
+    # avatars/3f/3f9c...e1.jpg - the two-character fan-out keeps directories small
+    return os.path.join(directory, digest[:2], f'{digest}{extension.lower()}').replace(os.sep, '/')
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    # Files are stored under the SHA-256 of their content, so saving the same upload twice
+    # writes it once and both names point at the same file. Names under `derived_prefixes`
+    # (e.g. resized variants named after their source hash) are kept as given and overwritten.
+    derived_prefixes = ('avatars/variants/',)
+
+    def is_derived(self, name):
+        return name.replace(os.sep, '/').startswith(self.derived_prefixes)
+
+    def _save(self, name, content):
+        if self.is_derived(name):
+            if self.exists(name):
+                self.delete(name)
+            return super()._save(name, content)
+
+        directory, filename = os.path.split(name)
+        name = content_name(directory, file_digest(content), os.path.splitext(filename)[1])
+        if self.exists(name):
+            return name
+
+        try:
+            return super()._save(name, content)
+        except _AlreadyStored:
+            # Another request stored the same content first
+            return name
+
+    def get_available_name(self, name, max_length=None):
+        if CONTENT_NAME_RE.match(name.replace(os.sep, '/')) and self.exists(name):
+            raise _AlreadyStored(name)
+        return super().get_available_name(name, max_length)
+
+
+def get_avatar_storage():
+    return ContentAddressedStorage()
+
+
+class ProfileStorage(FileSystemStorage):
+    # Request profiles stay outside MEDIA_ROOT, staff download them through the admin.
+    # PROFILING_DIR is read on use, so it follows settings overrides.
+    @property
+    def base_location(self):
+        return settings.PROFILING_DIR
+
+    @property
+    def location(self):
+        return os.path.abspath(self.base_location)
+
+
+def get_profile_storage():
+    return ProfileStorage()
+
+
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.mjs', '.map', '.json', '.svg', '.txt', '.html', '.xml', '.ico'}
+
+
+class PrecompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    # collectstatic writes content-hashed copies (cacheable forever) and, next to every text
+    # asset, .gz and .br variants that the static view or the front proxy serve as they are
+    min_compress_size = 256
+
+    def post_process(self, paths, dry_run=False, **options):
+        names = set()
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if processed and not isinstance(processed, Exception):
+                names.update((name, hashed_name))
+            yield name, hashed_name, processed
+        if not dry_run:
+            for name in sorted(names):
+                self.compress(name)
+
+    def compress(self, name):
+        if os.path.splitext(name)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+            return
+        path = self.path(name)
+        with open(path, 'rb') as source:
+            data = source.read()
+        if len(data) < self.min_compress_size:
+            return
+        variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants['.br'] = brotli.compress(data, quality=11)
+        for suffix, compressed in variants.items():
+            # Only kept when it actually saves bytes
+            if len(compressed) < len(data):
+                with open(path + suffix, 'wb') as target:
+                    target.write(compressed)
+
+    def stored_name(self, name):
+        # Before the first collectstatic (tests, fresh checkouts) there is no manifest: fall back to
+        # the plain name instead of failing every page. Once a manifest exists, entries are strict.
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
@@ -0,0 +1,42 @@
+from django import template
+from django.utils.html import format_html
+
+from tracker.avatars import AVATAR_SIZES
+
+register = template.Library()
+
+
+def _retina_size(size):
+    # Smallest variant that is at least twice as large, for 2x displays
+    larger = [key for key, pixels in AVATAR_SIZES.items() if pixels >= AVATAR_SIZES[size] * 2]
+    return min(larger, key=AVATAR_SIZES.get) if larger else None
+
+
+@register.simple_tag
+def avatar(profile, size='md', css_class='img-thumbnail'):
+    if not profile or not profile.avatar:
+        return ''
+
+    pixels = AVATAR_SIZES[size]
+    variants = profile.avatar_variants or {}
+    storage = profile.avatar.storage
+
+    if size not in variants:
+        # Variants are still being generated; fall back to the original scaled in the browser
+        return format_html(
+            '<img src="{}" alt="Avatar" class="{}" style="max-width: {}px;" loading="lazy">',
+            profile.avatar.url, css_class, pixels,
+        )
+
+    def srcset(format_key):
+        urls = [f'{storage.url(variants[size][format_key])} 1x']
+        retina = _retina_size(size)
+        if retina in variants:
+            urls.append(f'{storage.url(variants[retina][format_key])} 2x')
+        return ', '.join(urls)
+
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}">'
+        '<img src="{}" srcset="{}" width="{}" height="{}" alt="Avatar" class="{}" loading="lazy"></picture>',
+        srcset('webp'), storage.url(variants[size]['jpeg']), srcset('jpeg'), pixels, pixels, css_class,
+    )
@@ -1,5 +1,5 @@
 from django.urls import path
-from tracker.views import public_views, auth_views, private_views
+from tracker.views import public_views, auth_views, private_views, moderation_views
 from tracker.views.private_views import (ProgressCreateView,
                                          SkillUpdateView,
                                          SkillDeleteView,
@@ -23,10 +23,16 @@ urlpatterns = [
     path('progress/add/', ProgressCreateView.as_view(), name='progress-form'),
     path('skill/<int:pk>/delete/', SkillDeleteView.as_view(), name='skill-delete'),
     path('profile/', private_views.ProfileView.as_view(), name='profile'),
+    path('profile/goal/<int:pk>/updates/', private_views.GoalProgressHistoryView.as_view(), name='goal-updates'),
     path('goal/add/<int:skill_id>/', private_views.GoalCreateView.as_view(), name='goal-add'),
     path('goal/edit/<int:pk>/', private_views.GoalUpdateView.as_view(), name='goal-edit'),
     path('resources/add/', ResourceCreateView.as_view(), name='resource-add'),
     path('profile/edit/', UserProfileEditView.as_view(), name='edit-profile'),
     path('goal/<int:pk>/delete/', private_views.GoalDeleteView.as_view(), name='goal-delete'),
+    path('import/', private_views.ImportView.as_view(), name='import'),
+    path('export/', private_views.ExportView.as_view(), name='export'),
+    path('search/', private_views.SearchView.as_view(), name='search'),
+    path('stats/', private_views.StatsView.as_view(), name='stats'),
+    path('moderation/<str:kind>/', moderation_views.ModerationQueueView.as_view(), name='moderation-queue'),
 
 ]
\ No newline at end of file
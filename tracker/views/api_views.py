@@ -0,0 +1,153 @@
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import Http404, JsonResponse
+from django.views.generic import View
+
+from tracker.models import Skill, LearningGoal, ProgressUpdate
+from tracker.pagination import KeysetPaginator
+from tracker.serializers import SerializerError, SkillSerializer, GoalSerializer, ProgressUpdateSerializer
+from tracker.services.analytics import daily_series, streaks, weekly_velocity
+from tracker.services.dashboard import get_dashboard_summary
+
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 200
+
+
+def api_error(message, status):
+    return JsonResponse({'error': message}, status=status)
+
+
+class ApiView(LoginRequiredMixin, View):
+    def handle_no_permission(self):
+        # API clients get a JSON 401 instead of a redirect to the login page
+        return api_error("Authentication required.", status=401)
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except SerializerError as error:
+            return api_error(str(error), status=400)
+        except Http404:
+            return api_error("Not found.", status=404)
+
+    def page_size(self):
+        try:
+            limit = int(self.request.GET.get('limit', API_PAGE_SIZE))
+        except ValueError:
+            raise SerializerError("limit must be an integer.")
+        return max(1, min(limit, API_MAX_PAGE_SIZE))
+
+
+class ApiListView(ApiView):
+    serializer_class = None
+    ordering = ('-id',)
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.serializer_class(request.GET.get('fields'))
+        paginator = KeysetPaginator(
+            serializer.values(self.get_queryset(), extra=[name.lstrip('-') for name in self.ordering]),
+            ordering=self.ordering,
+            per_page=self.page_size(),
+        )
+        page = paginator.page(after=request.GET.get('after'), before=request.GET.get('before'))
+
+        return JsonResponse({
+            'results': serializer.serialize(page.object_list),
+            'next': page.next_cursor if page.has_next else None,
+            'previous': page.previous_cursor if page.has_previous else None,
+        })
+
+
+class SummaryApiView(ApiView):
+    def get(self, request, *args, **kwargs):
+        summary = get_dashboard_summary(request.user)
+        return JsonResponse({
+            'skill_count': summary['skill_count'],
+            'complete_skill_count': sum(1 for skill in summary['skills'] if skill.is_complete),
+            'goal_count': summary['goal_count'],
+            'completed_goal_count': sum(skill.completed_goal_count for skill in summary['skills']),
+            'progress_count': summary['progress_count'],
+        })
+
+
+class SkillListApiView(ApiListView):
+    serializer_class = SkillSerializer
+    ordering = ('-created_at', '-id')
+
+    def get_queryset(self):
+        skills = Skill.objects.filter(owner=self.request.user)
+        for field in ('category', 'difficulty'):
+            if self.request.GET.get(field):
+                skills = skills.filter(**{field: self.request.GET[field]})
+        return skills
+
+
+class SkillDetailApiView(ApiView):
+    def get(self, request, pk, *args, **kwargs):
+        serializer = SkillSerializer(request.GET.get('fields'))
+        row = serializer.values(Skill.objects.filter(owner=request.user, pk=pk)).first()
+        if row is None:
+            raise Http404
+        return JsonResponse(row)
+
+
+class GoalListApiView(ApiListView):
+    serializer_class = GoalSerializer
+    ordering = ('target_date', 'id')
+
+    def get_queryset(self):
+        goals = LearningGoal.objects.filter(skill__owner=self.request.user)
+        skill_id = self.request.GET.get('skill')
+        if skill_id:
+            if not skill_id.isdigit():
+                raise SerializerError("skill must be an id.")
+            goals = goals.filter(skill_id=skill_id)
+        return goals
+
+
+class GoalProgressApiView(ApiListView):
+    serializer_class = ProgressUpdateSerializer
+    ordering = ('-date', '-id')
+
+    def get_queryset(self):
+        if not LearningGoal.objects.filter(pk=self.kwargs['pk'], skill__owner=self.request.user).exists():
+            raise Http404
+        return ProgressUpdate.objects.filter(goal_id=self.kwargs['pk'])
+
+
+class AnalyticsApiView(ApiView):
+    # Reads the daily rollup; ?skill= narrows the numbers to one of the user's skills
+    def skill_id(self):
+        skill_id = self.request.GET.get('skill')
+        if not skill_id:
+            return None
+        if not skill_id.isdigit():
+            raise SerializerError("skill must be an id.")
+        return int(skill_id)
+
+    def int_param(self, name, default):
+        try:
+            return max(1, int(self.request.GET.get(name, default)))
+        except ValueError:
+            raise SerializerError(f"{name} must be an integer.")
+
+
+class DailyProgressApiView(AnalyticsApiView):
+    def get(self, request, *args, **kwargs):
+        return JsonResponse({
+            'results': daily_series(request.user, self.skill_id(), days=self.int_param('days', 30)),
+        })
+
+
+class WeeklyVelocityApiView(AnalyticsApiView):
+    def get(self, request, *args, **kwargs):
+        return JsonResponse({
+            'results': weekly_velocity(request.user, self.skill_id(), weeks=self.int_param('weeks', 12)),
+        })
+
+
+class StreakApiView(AnalyticsApiView):
+    def get(self, request, *args, **kwargs):
+        return JsonResponse(streaks(request.user, self.skill_id()))
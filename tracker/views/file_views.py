@@ -0,0 +1,169 @@
+import mimetypes
+import os
+import posixpath
+import re
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+from tracker.storage import CONTENT_NAME_RE
+
+FILE_CHUNK_SIZE = 64 * 1024
+IMMUTABLE = 'public, max-age=31536000, immutable'
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+# ManifestStaticFilesStorage inserts a 12-character content hash before the extension
+HASHED_STATIC_RE = re.compile(r'\.[0-9a-f]{12}\.\w+$')
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def resolve_file(root, path):
+    path = posixpath.normpath(path).lstrip('/')
+    try:
+        full_path = safe_join(root, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+    return path, full_path
+
+
+def is_not_modified(request, etag, mtime):
+    # If-None-Match wins over If-Modified-Since (RFC 9110, 13.2.2)
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match is not None:
+        return if_none_match.strip() == '*' or etag in parse_etags(if_none_match)
+    since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    return since is not None and int(mtime) <= since
+
+
+def requested_range(request, size, etag):
+    # (start, end) of a single byte range, or None to send the whole file. Multiple ranges and
+    # malformed headers are answered with the whole file, which RFC 9110 allows.
+    header = request.headers.get('Range')
+    if not header or request.headers.get('If-Range', etag) != etag:
+        return None
+    match = RANGE_RE.match(header.strip())
+    if match is None or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first == '':
+        if int(last) == 0:
+            raise RangeNotSatisfiable
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+def read_range(path, start, length):
+    with open(path, 'rb') as handle:
+        handle.seek(start)
+        while length > 0:
+            chunk = handle.read(min(FILE_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def serve_file(request, full_path, content_type, cache_control, encoding=None, vary=False, accel_path=None):
+    stat = os.stat(full_path)
+    etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(stat.st_mtime),
+        'Cache-Control': cache_control,
+        'Accept-Ranges': 'bytes',
+    }
+    if vary:
+        headers['Vary'] = 'Accept-Encoding'
+
+    if is_not_modified(request, etag, stat.st_mtime):
+        response = HttpResponseNotModified()
+    elif accel_path is not None:
+        # The front proxy sends the bytes (and answers Range itself); the worker is free at once
+        response = HttpResponse(content_type=content_type)
+        if settings.MEDIA_ACCEL == 'x-accel-redirect':
+            response['X-Accel-Redirect'] = accel_path
+        else:
+            response['X-Sendfile'] = full_path
+    else:
+        try:
+            byte_range = requested_range(request, stat.st_size, etag)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+            return response
+        if byte_range is None:
+            # FileResponse hands the open file to wsgi.file_wrapper (sendfile) where the server has one
+            response = FileResponse(open(full_path, 'rb'), content_type=content_type)
+            # Not a download, and the on-disk name may be the .gz/.br variant
+            del response['Content-Disposition']
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                read_range(full_path, start, end - start + 1), status=206, content_type=content_type,
+            )
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+            response['Content-Length'] = str(end - start + 1)
+        if encoding is not None:
+            response['Content-Encoding'] = encoding
+
+    for name, value in headers.items():
+        response[name] = value
+    return response
+
+
+def accepted_encodings(header):
+    # Content codings the client accepts; "gzip;q=0" opts out
+    accepted = set()
+    for part in header.split(','):
+        coding, _, params = part.partition(';')
+        quality = params.strip().removeprefix('q=') if params.strip().startswith('q=') else '1'
+        try:
+            if float(quality) > 0:
+                accepted.add(coding.strip().lower())
+        except ValueError:
+            pass
+    return accepted
+
+
+def guess_type(path):
+    content_type, _ = mimetypes.guess_type(path)
+    return content_type or 'application/octet-stream'
+
+
+@require_safe
+def serve_static(request, path):
+    # Collected files from STATIC_ROOT, precompressed variant first; hashed names are cached forever
+    path, full_path = resolve_file(settings.STATIC_ROOT, path)
+    accepted = accepted_encodings(request.headers.get('Accept-Encoding', ''))
+    variants = [(name, full_path + suffix) for name, suffix in ENCODINGS if os.path.isfile(full_path + suffix)]
+    encoding, served_path = next(
+        ((name, variant) for name, variant in variants if name in accepted),
+        (None, full_path),
+    )
+    cache_control = IMMUTABLE if HASHED_STATIC_RE.search(path) else f'public, max-age={settings.STATIC_MAX_AGE}'
+    return serve_file(request, served_path, guess_type(path), cache_control, encoding, vary=bool(variants))
+
+
+@require_safe
+def serve_media(request, path):
+    # Uploaded files; content-addressed avatars never change under their name, so they are cached forever
+    path, full_path = resolve_file(settings.MEDIA_ROOT, path)
+    cache_control = IMMUTABLE if CONTENT_NAME_RE.match(path) else f'public, max-age={settings.MEDIA_MAX_AGE}'
+    accel_path = None
+    if settings.MEDIA_ACCEL:
+        accel_path = settings.MEDIA_ACCEL_PREFIX.rstrip('/') + '/' + path
+    return serve_file(request, full_path, guess_type(path), cache_control, accel_path=accel_path)
@@ -0,0 +1,74 @@
+from django.contrib.auth.mixins import UserPassesTestMixin
+from django.http import Http404, HttpResponseBadRequest, HttpResponseRedirect
+from django.views.generic.base import TemplateView
+
+from tracker.models import Resource, Profile
+from tracker.pagination import KeysetPaginator
+
+MODERATION_PAGE_SIZE = 50
+MODERATION_MAX_PAGE_SIZE = 500
+
+# Queue name -> model and the relations every row displays
+MODERATION_QUEUES = {
+    'resources': {
+        'model': Resource,
+        'select_related': ('skill', 'added_by'),
+        'title': 'Resources',
+    },
+    'profiles': {
+        'model': Profile,
+        'select_related': ('user',),
+        'title': 'Profiles',
+    },
+}
+
+
+class ModerationQueueView(UserPassesTestMixin, TemplateView):
+    # Pending items are paged by id and decided in bulk, one UPDATE per submitted page
+    template_name = 'tracker/moderation_queue.html'
+
+    def dispatch(self, request, *args, **kwargs):
+        self.queue = MODERATION_QUEUES.get(kwargs['kind'])
+        if self.queue is None:
+            raise Http404
+        return super().dispatch(request, *args, **kwargs)
+
+    def test_func(self):
+        user = self.request.user
+        model = self.queue['model']
+        return user.is_staff and user.has_perm(f'{model._meta.app_label}.change_{model._meta.model_name}')
+
+    def page_size(self):
+        try:
+            return max(1, min(int(self.request.GET.get('per_page', MODERATION_PAGE_SIZE)), MODERATION_MAX_PAGE_SIZE))
+        except ValueError:
+            return MODERATION_PAGE_SIZE
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        pending = self.queue['model'].objects.pending().select_related(*self.queue['select_related'])
+        paginator = KeysetPaginator(pending, ordering=('id',), per_page=self.page_size())
+
+        context['kind'] = self.kwargs['kind']
+        context['queue_title'] = self.queue['title']
+        context['pending_counts'] = {
+            kind: queue['model'].objects.pending().count()
+            for kind, queue in MODERATION_QUEUES.items()
+        }
+        context['page'] = paginator.page(
+            after=self.request.GET.get('after'),
+            before=self.request.GET.get('before'),
+        )
+        return context
+
+    def post(self, request, *args, **kwargs):
+        action = request.POST.get('action')
+        ids = [value for value in request.POST.getlist('ids') if value.isdigit()]
+        if action not in ('approve', 'reject'):
+            return HttpResponseBadRequest("Unknown moderation action.")
+
+        if ids:
+            # Only still-pending rows are touched, so two moderators cannot overwrite each other
+            self.queue['model'].objects.filter(pk__in=ids).pending().moderate(approve=action == 'approve')
+        # Decided rows drop out of the queue, so the same cursor shows the next undecided items
+        return HttpResponseRedirect(request.get_full_path())
@@ -1,16 +1,29 @@
+import io
+
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.views.generic import ListView
+from django.http import StreamingHttpResponse
+from django.views.generic import ListView, View
 from django.views.generic.base import TemplateView
 from django.views.generic.detail import DetailView
-from django.views.generic.edit import CreateView, UpdateView, DeleteView
+from django.views.generic.edit import CreateView, UpdateView, DeleteView, FormView
 from django.urls import reverse_lazy
-from django.db import models
-from django.db.models import Prefetch
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
 from django import forms
-from collections import defaultdict
 
-from tracker.forms import ProgressForm, ProfileForm
-from tracker.models import Skill, LearningGoal, ProgressUpdate, Resource, Profile
+from tracker.avatars import AvatarSizeLimitHandler, release_avatars, schedule_avatar_variants
+from tracker.forms import ProgressForm, ProfileForm, ImportForm
+from tracker.models import (Skill, LearningGoal, ProgressUpdate, Resource, Profile,
+                            CategoryStat, DifficultyStat, LeaderboardEntry)
+from tracker.pagination import KeysetPaginator
+from tracker.services.dashboard import SKILL_CARD_CACHE_TIMEOUT, get_dashboard_summary, skill_versions
+from tracker.services.exporter import export_filename, stream_export
+from tracker.services.importer import import_tracker_data
+from tracker.services.profile import build_profile_context
+from tracker.services.search import search
+from tracker.services.stats import stats_are_stale, stats_refreshed_at
 
 
 class DashboardView(LoginRequiredMixin, TemplateView):
@@ -20,13 +33,12 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         context = super().get_context_data(**kwargs)
         user = self.request.user
 
-        skills = Skill.objects.filter(owner=user).prefetch_related(
-            Prefetch('learninggoal_set', queryset=LearningGoal.objects.all().order_by('target_date'))
-        )
-        context['skills'] = skills
-        context['skill_count'] = skills.count()
-        context['goal_count'] = LearningGoal.objects.filter(skill__owner=user).count()
-        context['progress_count'] = ProgressUpdate.objects.filter(goal__skill__owner=user).count()
+        context.update(get_dashboard_summary(user))
+        # Each skill card is a cached fragment keyed on the skill's version stamp
+        versions = skill_versions([skill.pk for skill in context['skills']])
+        for skill in context['skills']:
+            skill.card_version = versions[skill.pk]
+        context['card_cache_timeout'] = SKILL_CARD_CACHE_TIMEOUT
 
         return context
 
@@ -91,12 +103,11 @@ class ProgressCreateView(LoginRequiredMixin, CreateView):
             return self.form_invalid(form)
 
         # The form is assigning after the goal
-        response = super().form_valid(form)
+        with transaction.atomic():
+            response = super().form_valid(form)
 
-        # Total progress is recalculated for the goal
-        total_progress = goal.progressupdate_set.aggregate(total=models.Sum('progress'))['total'] or 0
-        goal.progress = min(total_progress, 100)
-        goal.save()
+            # Goal progress is incremented in the database instead of re-aggregating the whole history
+            LearningGoal.objects.filter(pk=goal.pk).add_progress(form.instance.progress)
 
         return response
 
@@ -104,9 +115,51 @@ class SkillListView(LoginRequiredMixin, ListView):
     model = Skill
     template_name = 'tracker/skill_list.html'
     context_object_name = 'skills'
+    paginate_by = 12
+    sort_options = {
+        'newest': ('-created_at', '-id'),
+        'oldest': ('created_at', 'id'),
+        'name': ('name', 'id'),
+    }
+
+    def get_sort(self):
+        sort = self.request.GET.get('sort')
+        return sort if sort in self.sort_options else 'newest'
 
     def get_queryset(self):
-        return Skill.objects.filter(owner=self.request.user)
+        skills = Skill.objects.filter(owner=self.request.user).with_progress_stats()
+
+        for field in ('category', 'difficulty'):
+            value = self.request.GET.get(field)
+            if value:
+                skills = skills.filter(**{field: value})
+
+        # Optional ?status=complete|in_progress filter, evaluated in SQL
+        status = self.request.GET.get('status')
+        if status == 'complete':
+            skills = skills.filter(is_complete=True)
+        elif status == 'in_progress':
+            skills = skills.filter(is_complete=False)
+        return skills
+
+    def paginate_queryset(self, queryset, page_size):
+        # Keyset pagination on the sort columns instead of OFFSET, so deep pages cost the same as the first
+        paginator = KeysetPaginator(queryset, self.sort_options[self.get_sort()], page_size)
+        page = paginator.page(after=self.request.GET.get('after'), before=self.request.GET.get('before'))
+        return paginator, page, page.object_list, page.has_next or page.has_previous
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        owned = Skill.objects.filter(owner=self.request.user).order_by()
+        context.update({
+            'status': self.request.GET.get('status', ''),
+            'sort': self.get_sort(),
+            'category': self.request.GET.get('category', ''),
+            'difficulty': self.request.GET.get('difficulty', ''),
+            'categories': owned.values_list('category', flat=True).distinct().order_by('category'),
+            'difficulties': owned.values_list('difficulty', flat=True).distinct().order_by('difficulty'),
+        })
+        return context
 
 class SkillUpdateView(LoginRequiredMixin, UpdateView):
     model = Skill
@@ -135,43 +188,33 @@ class ProfileView(LoginRequiredMixin, TemplateView):
         context = super().get_context_data(**kwargs)
         user = self.request.user
 
-        skills = Skill.objects.filter(owner=user)
-        goals = LearningGoal.objects.filter(skill__in=skills)
-        updates = ProgressUpdate.objects.filter(goal__in=goals).select_related('goal', 'goal__skill')
-
-        temp_grouped = defaultdict(lambda: defaultdict(list))
-        for update in updates:
-            temp_grouped[update.goal.skill.id][update.goal.id].append(update)
-
-        # Convert to regular dict of dicts
-        grouped_updates = {
-            skill_id: dict(goals)
-            for skill_id, goals in temp_grouped.items()
-        }
-
-        resource_groups = defaultdict(list)
-        skill_map = {}
-        for skill in skills:
-            skill_map[skill.id] = skill
-
-            resources = Resource.objects.filter(skill=skill, approved=True)
-            if resources.exists():
-                resource_groups[skill.id] = list(resources)
+        context['profile'] = user.profile
+        context.update(build_profile_context(user))
 
+        return context
 
-        resource_groups = dict(resource_groups)
+class GoalProgressHistoryView(LoginRequiredMixin, TemplateView):
+    template_name = 'tracker/goal_progress_history.html'
+    paginate_by = 20
 
-        context.update({
-            'profile': user.profile,
-            'skills': skills,
-            'goals': goals,
-            'updates': updates,
-            'grouped_updates': grouped_updates,
-            'goal_map': {goal.id: goal for goal in goals},
-            'resources': resource_groups,
-            'skill_map': skill_map,
-        })
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        goal = get_object_or_404(
+            LearningGoal.objects.select_related('skill'),
+            pk=self.kwargs['pk'],
+            skill__owner=self.request.user,
+        )
 
+        paginator = KeysetPaginator(
+            ProgressUpdate.objects.filter(goal=goal),
+            ordering=('-date', '-id'),
+            per_page=self.paginate_by,
+        )
+        context['goal'] = goal
+        context['page'] = paginator.page(
+            after=self.request.GET.get('after'),
+            before=self.request.GET.get('before'),
+        )
         return context
 
 class GoalUpdateView(LoginRequiredMixin, UpdateView):
@@ -202,15 +245,88 @@ class ResourceCreateView(LoginRequiredMixin, CreateView):
         return form
 
 
+@method_decorator(csrf_exempt, name='dispatch')
 class UserProfileEditView(LoginRequiredMixin, UpdateView):
     model = Profile
     form_class = ProfileForm
     template_name = 'tracker/edit_profile.html'
     success_url = reverse_lazy('profile')
 
+    def dispatch(self, request, *args, **kwargs):
+        # The size limit handler has to be installed before the body is parsed, so CSRF is checked afterwards
+        request.upload_handlers.insert(0, AvatarSizeLimitHandler(request))
+        return csrf_protect(super().dispatch)(request, *args, **kwargs)
+
     def get_object(self):
         return self.request.user.profile
 
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs['rejected_uploads'] = getattr(self.request, 'rejected_uploads', set())
+        return kwargs
+
     def form_valid(self, form):
+        # Every edit sends the profile back to the moderation queue
         form.instance.is_approved = False
-        return super().form_valid(form)
\ No newline at end of file
+        form.instance.moderated_at = None
+        avatar_changed = 'avatar' in form.changed_data
+        previous_avatar = form.initial.get('avatar')
+        if avatar_changed:
+            form.instance.avatar_variants = {}
+
+        response = super().form_valid(form)
+
+        if avatar_changed and form.instance.avatar:
+            profile_id = form.instance.pk
+            transaction.on_commit(lambda: schedule_avatar_variants(profile_id))
+        if avatar_changed and previous_avatar and previous_avatar.name != form.instance.avatar.name:
+            # The old file is only removed once no other profile points at the same content
+            old_name = previous_avatar.name
+            transaction.on_commit(lambda: release_avatars(old_name))
+        return response
+
+class ImportView(LoginRequiredMixin, FormView):
+    form_class = ImportForm
+    template_name = 'tracker/import_form.html'
+
+    def form_valid(self, form):
+        upload = form.cleaned_data['file']
+        # Large uploads are spooled to a temporary file by Django and read back line by line
+        stream = io.TextIOWrapper(upload.file, encoding='utf-8', newline='')
+        result = import_tracker_data(self.request.user, stream, form.cleaned_data['format'])
+        return self.render_to_response(self.get_context_data(form=self.form_class(), result=result))
+
+class ExportView(LoginRequiredMixin, View):
+    def get(self, request, *args, **kwargs):
+        # The archive is written to the response while rows are read, so large accounts start downloading at once
+        response = StreamingHttpResponse(stream_export(request.user), content_type='application/zip')
+        response['Content-Disposition'] = f'attachment; filename="{export_filename(request.user)}"'
+        return response
+
+class SearchView(LoginRequiredMixin, TemplateView):
+    template_name = 'tracker/search.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.get('q', '').strip()
+        context['query'] = query
+        context['hits'] = search(self.request.user, query) if query else []
+        return context
+
+
+class StatsView(LoginRequiredMixin, TemplateView):
+    # Reads the precomputed snapshots only; refresh_stats rebuilds them out of band
+    template_name = 'tracker/stats.html'
+    category_limit = 20
+    leaderboard_limit = 20
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        refreshed_at = stats_refreshed_at()
+        context['categories'] = CategoryStat.objects.order_by('-skill_count', 'category')[:self.category_limit]
+        context['difficulties'] = DifficultyStat.objects.order_by('difficulty')
+        context['leaderboard'] = LeaderboardEntry.objects.select_related('user').order_by('rank')[:self.leaderboard_limit]
+        context['refreshed_at'] = refreshed_at
+        context['is_stale'] = stats_are_stale(refreshed_at)
+        return context
+